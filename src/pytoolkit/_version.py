@@ -1,3 +1,3 @@
 """Version."""
 
-__version__: str = "0.0.15"
+__version__: str = "0.0.16"
@@ -0,0 +1,518 @@
+# pylint: disable=logging-fstring-interpolation
+"""Airport Database Index."""
+
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from pytoolkit.files import set_homedir
+from pytoolkit.static import ENCODING, NO_AIRPORTDATA
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+AIRPORT_FIELDS = tuple(NO_AIRPORTDATA)
+CODE_FIELDS = ("iata", "icao")
+FLOAT_FIELDS = ("elevation", "lat", "lon")
+CACHE_PATH = ".cache/pytoolkit"
+# bump when the cached column layout changes
+INDEX_FORMAT = 1
+EARTH_RADIUS_KM = 6371.0088
+# float64 distance matrix size per chunk of the brute force search
+BRUTE_FORCE_BYTES = 64 * 1024 * 1024
+
+airports_log = logging.getLogger(__name__)
+_INDEX: Optional["AirportIndex"] = None
+_AIRPORTDATA: Optional[dict[str, dict[str, Any]]] = None
+_LOCK = threading.Lock()
+
+
+class AirportIndex:
+    """
+    Airport table stored column-wise and sorted by `IATA` code.
+
+    Codes are unicode columns searched with `np.searchsorted`; the other text
+    columns are UTF-8 bytes and coordinates are float64, so the whole table takes
+    a few megabytes and loads from its `.npz` cache without unpickling anything.
+
+    Usage:
+        >>> index = get_index()
+        >>> index.get("jfk")["name"]
+        'John F Kennedy International Airport'
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]) -> None:
+        """
+        Wrap prebuilt columns.
+
+        :param columns: One array per `AIRPORT_FIELDS` entry, sorted by `iata`.
+        :type columns: dict[str, np.ndarray]
+        """
+        self.columns = columns
+        self._icao: Optional[tuple[np.ndarray, np.ndarray]] = None
+        self._xyz: Optional[np.ndarray] = None
+        self._tree: Any = None
+
+    def __len__(self) -> int:
+        return len(self.columns["iata"])
+
+    @classmethod
+    def build(cls) -> "AirportIndex":
+        """
+        Build the index from the `airportsdata` package.
+
+        :return: Airport index.
+        :rtype: AirportIndex
+        """
+        import airportsdata  # pylint: disable=import-outside-toplevel
+
+        data = airportsdata.load(code_type="IATA")
+        codes = sorted(data)
+        columns: dict[str, np.ndarray] = {}
+        for name in AIRPORT_FIELDS:
+            values = [data[code][name] for code in codes]
+            if name in FLOAT_FIELDS:
+                columns[name] = np.array(values, dtype=np.float64)
+            elif name in CODE_FIELDS:
+                columns[name] = np.array(values, dtype=str)
+            else:
+                columns[name] = np.char.encode(np.array(values, dtype=str), ENCODING)
+        return cls(columns)
+
+    @classmethod
+    def load(cls, cache_dir: Union[str, Path, None] = None) -> "AirportIndex":
+        """
+        Load the index from its cache file, building and caching it on first use.
+
+        :param cache_dir: Directory holding the cache file, defaults to `~/.cache/pytoolkit`
+        :type cache_dir: str|Path, optional
+        :return: Airport index.
+        :rtype: AirportIndex
+        """
+        try:
+            path = _cache_file(cache_dir)
+        except OSError:
+            return cls.build()
+        try:
+            with np.load(path, allow_pickle=False) as cached:
+                return cls({name: cached[name] for name in AIRPORT_FIELDS})
+        except FileNotFoundError:
+            pass
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # empty or truncated after a crash (EOFError, BadZipFile, ...); rebuilt below
+            airports_log.warning(f'msg="Rebuilding unreadable airport index cache"|{path=}, {err=}')
+        index = cls.build()
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as fil:
+                np.savez(fil, **index.columns)
+                fil.flush()
+                os.fsync(fil.fileno())
+            os.replace(tmp, path)
+        except OSError as err:
+            tmp.unlink(missing_ok=True)
+            airports_log.warning(f'msg="Unable to cache airport index"|{path=}, {err=}')
+        return index
+
+    def find(self, code: str, code_type: str = "IATA") -> int:
+        """
+        Row of an airport code.
+
+        :param code: Airport code; case insensitive.
+        :type code: str
+        :param code_type: `IATA` or `ICAO`, defaults to "IATA"
+        :type code_type: str, optional
+        :return: Row number or -1 when not found.
+        :rtype: int
+        """
+        code = code.upper()
+        keys, order = self._keys(code_type)
+        pos = int(np.searchsorted(keys, code))
+        if pos < len(keys) and keys[pos] == code:
+            return int(order[pos]) if order is not None else pos
+        return -1
+
+    def get(self, code: str, code_type: str = "IATA") -> Optional[dict[str, Any]]:
+        """
+        Airport information of a code.
+
+        :param code: Airport code; case insensitive.
+        :type code: str
+        :param code_type: `IATA` or `ICAO`, defaults to "IATA"
+        :type code_type: str, optional
+        :return: Airport information in the `airportsdata` layout or None when not found.
+        :rtype: dict[str, Any], optional
+        """
+        row = self.find(code, code_type)
+        return self.record(row) if row >= 0 else None
+
+    def record(self, row: int) -> dict[str, Any]:
+        """
+        Airport information of a row.
+
+        :param row: Row number.
+        :type row: int
+        :return: Airport information in the `airportsdata` layout.
+        :rtype: dict[str, Any]
+        """
+        info: dict[str, Any] = {}
+        for name in AIRPORT_FIELDS:
+            value = self.columns[name][row]
+            if name in FLOAT_FIELDS:
+                info[name] = float(value)
+            elif name in CODE_FIELDS:
+                info[name] = str(value)
+            else:
+                info[name] = value.decode(ENCODING)
+        return info
+
+    def to_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        Every airport keyed by `IATA` code, like `airportsdata.load("IATA")`.
+
+        :return: Airport information per code.
+        :rtype: dict[str, dict[str, Any]]
+        """
+        return {str(code): self.record(row) for row, code in enumerate(self.columns["iata"])}
+
+    def rows(self, codes: Any, code_type: str = "IATA") -> np.ndarray:
+        """
+        Rows of many airport codes; each distinct code is normalized and searched once.
+
+        :param codes: Airport codes; a list, NumPy array or pandas Series. Case insensitive.
+        :type codes: ArrayLike
+        :param code_type: `IATA` or `ICAO`, defaults to "IATA"
+        :type code_type: str, optional
+        :return: Row per code, -1 when not found or not a string.
+        :rtype: np.ndarray
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        labels, uniques = pd.factorize(np.asarray(codes, dtype=object).reshape(-1))
+        return self._unique_rows(uniques, code_type)[labels]
+
+    def enrich(
+        self,
+        codes: Any,
+        fields: Optional[list[str]] = None,
+        code_type: str = "IATA",
+        frame: bool = True,
+    ) -> Any:
+        """
+        Airport fields for many codes, joined column-wise.
+
+        :param codes: Airport codes; a list, NumPy array or pandas Series. Case insensitive.
+        :type codes: ArrayLike
+        :param fields: Fields to return, defaults to every `AIRPORT_FIELDS` entry
+        :type fields: list[str], optional
+        :param code_type: `IATA` or `ICAO`, defaults to "IATA"
+        :type code_type: str, optional
+        :param frame: Return a DataFrame (indexed like a Series input) instead of arrays, defaults to True
+        :type frame: bool, optional
+        :raises ValueError: Unknown field.
+        :return: One column per field; misses hold the `NO_AIRPORTDATA` default (NaN in float columns).
+        :rtype: pd.DataFrame|dict[str, np.ndarray]
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        fields = list(fields) if fields else list(AIRPORT_FIELDS)
+        invalid = [name for name in fields if name not in AIRPORT_FIELDS]
+        if invalid:
+            raise ValueError(f"Invalid fields {invalid} must be in {AIRPORT_FIELDS}")
+        labels, uniques = pd.factorize(np.asarray(codes, dtype=object).reshape(-1))
+        rows = self._unique_rows(uniques, code_type)
+        found = rows >= 0
+        columns: dict[str, np.ndarray] = {}
+        for name in fields:
+            # values per distinct code plus the miss default in the last slot, taken by label (-1)
+            if name in FLOAT_FIELDS:
+                values = np.full(len(rows) + 1, np.nan)
+            else:
+                values = np.full(len(rows) + 1, NO_AIRPORTDATA[name], dtype=object)
+            column = self.columns[name][rows[found]]
+            if column.dtype.kind == "S":
+                column = np.char.decode(column, ENCODING)
+            values[:-1][found] = column
+            columns[name] = values[labels]
+        if not frame:
+            return columns
+        index = codes.index if isinstance(codes, pd.Series) else None
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _unique_rows(self, uniques: np.ndarray, code_type: str) -> np.ndarray:
+        """Rows of distinct codes; -1 for misses."""
+        keys, order = self._keys(code_type)
+        rows = np.full(len(uniques), -1, dtype=np.intp)
+        valid = np.fromiter((isinstance(code, str) for code in uniques), bool, len(uniques))
+        if not valid.any():
+            return rows
+        needles = np.char.upper(uniques[valid].astype(str))
+        pos = np.minimum(np.searchsorted(keys, needles), len(keys) - 1)
+        hit = keys[pos] == needles
+        matched = pos[hit] if order is None else order[pos[hit]]
+        rows[np.flatnonzero(valid)[hit]] = matched
+        return rows
+
+    def nearest(
+        self, lat: Any, lon: Any, k: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest airports to each point; uses a KD-tree when scipy is installed and a
+         chunked brute force search otherwise.
+
+        :param lat: Latitudes in degrees; a number, list, NumPy array or pandas Series.
+        :type lat: ArrayLike
+        :param lon: Longitudes in degrees, same length as `lat`.
+        :type lon: ArrayLike
+        :param k: Airports per point, defaults to 1
+        :type k: int, optional
+        :return: `IATA` codes and great circle distances in km, shaped `(n,)` for k=1
+         or `(n, k)` ordered nearest first. Points with a missing coordinate get an
+         empty code and NaN distance.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        if not 1 <= k <= len(self):
+            raise ValueError(f"Invalid k {k} must be between 1 and {len(self)}")
+        points, valid = _unit_vectors(lat, lon)
+        rows = np.zeros((len(points), k), dtype=np.intp)
+        if valid.any():
+            rows[valid] = self._nearest_rows(points[valid], k)
+        codes = self.columns["iata"][rows]
+        distances = haversine(
+            np.asarray(lat, dtype=np.float64).reshape(-1, 1),
+            np.asarray(lon, dtype=np.float64).reshape(-1, 1),
+            self.columns["lat"][rows],
+            self.columns["lon"][rows],
+        )
+        codes[~valid] = ""
+        distances[~valid] = np.nan
+        if k == 1:
+            return codes[:, 0], distances[:, 0]
+        return codes, distances
+
+    def within(
+        self, lat: Any, lon: Any, radius_km: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Airports within `radius_km` of each point.
+
+        :param lat: Latitudes in degrees; a number, list, NumPy array or pandas Series.
+        :type lat: ArrayLike
+        :param lon: Longitudes in degrees, same length as `lat`.
+        :type lon: ArrayLike
+        :param radius_km: Search radius in km.
+        :type radius_km: float
+        :return: Point positions, `IATA` codes and distances in km of every match,
+         ordered by point then distance.
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        points, valid = _unit_vectors(lat, lon)
+        positions = np.flatnonzero(valid)
+        point_idx, rows = self._rows_within(points[valid], radius_km)
+        point_idx = positions[point_idx]
+        lat = np.asarray(lat, dtype=np.float64).reshape(-1)
+        lon = np.asarray(lon, dtype=np.float64).reshape(-1)
+        distances = haversine(
+            lat[point_idx], lon[point_idx], self.columns["lat"][rows], self.columns["lon"][rows]
+        )
+        # chord and arc order can disagree in the last digits; keep exact matches only
+        keep = distances <= radius_km
+        point_idx, rows, distances = point_idx[keep], rows[keep], distances[keep]
+        order = np.lexsort((distances, point_idx))
+        return point_idx[order], self.columns["iata"][rows[order]], distances[order]
+
+    def _airport_vectors(self) -> np.ndarray:
+        if self._xyz is None:
+            self._xyz, _ = _unit_vectors(self.columns["lat"], self.columns["lon"])
+        return self._xyz
+
+    def _nearest_rows(self, points: np.ndarray, k: int) -> np.ndarray:
+        """Rows of the `k` nearest airports per unit vector, nearest first."""
+        airports = self._airport_vectors()
+        if cKDTree is not None:
+            if self._tree is None:
+                self._tree = cKDTree(airports)
+            _, rows = self._tree.query(points, k=k)
+            return rows.reshape(len(points), k)
+        rows = np.empty((len(points), k), dtype=np.intp)
+        for start, stop in _chunks(len(points), len(airports)):
+            # the largest dot product is the smallest angle
+            dots = points[start:stop] @ airports.T
+            if k == 1:
+                rows[start:stop, 0] = np.argmax(dots, axis=1)
+                continue
+            top = np.argpartition(dots, len(airports) - k, axis=1)[:, -k:]
+            order = np.argsort(-np.take_along_axis(dots, top, axis=1), axis=1)
+            rows[start:stop] = np.take_along_axis(top, order, axis=1)
+        return rows
+
+    def _rows_within(self, points: np.ndarray, radius_km: float) -> tuple[np.ndarray, np.ndarray]:
+        """Point positions and airport rows within `radius_km`, in no particular order."""
+        airports = self._airport_vectors()
+        angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+        if cKDTree is not None:
+            if self._tree is None:
+                self._tree = cKDTree(airports)
+            # small slack so float error never drops a match; distances are filtered exactly later
+            matches = self._tree.query_ball_point(points, r=2 * np.sin(angle / 2) + 1e-9)
+            counts = np.fromiter((len(match) for match in matches), np.intp, len(matches))
+            rows = np.fromiter(
+                (row for match in matches for row in match), np.intp, int(counts.sum())
+            )
+            return np.repeat(np.arange(len(points)), counts), rows
+        point_parts, row_parts = [], []
+        min_dot = np.cos(angle) - 1e-9
+        for start, stop in _chunks(len(points), len(airports)):
+            point_idx, rows = np.nonzero(points[start:stop] @ airports.T >= min_dot)
+            point_parts.append(point_idx + start)
+            row_parts.append(rows)
+        if not point_parts:
+            return np.empty(0, np.intp), np.empty(0, np.intp)
+        return np.concatenate(point_parts), np.concatenate(row_parts)
+
+    def _keys(self, code_type: str) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """Sorted search keys and their rows (None when already in row order)."""
+        code_type = code_type.upper()
+        if code_type == "IATA":
+            return self.columns["iata"], None
+        if code_type != "ICAO":
+            raise ValueError(f"Invalid code_type {code_type} must be IATA or ICAO")
+        if self._icao is None:
+            order = np.argsort(self.columns["icao"], kind="stable")
+            self._icao = (self.columns["icao"][order], order)
+        return self._icao
+
+
+def get_index() -> AirportIndex:
+    """
+    Shared airport index; loaded on first use.
+
+    :return: Airport index.
+    :rtype: AirportIndex
+    """
+    global _INDEX  # pylint: disable=global-statement
+    if _INDEX is None:
+        with _LOCK:
+            if _INDEX is None:
+                _INDEX = AirportIndex.load()
+    return _INDEX
+
+
+def nearest_airports(lat: Any, lon: Any, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest airports to each point; see `AirportIndex.nearest`.
+
+    :param lat: Latitudes in degrees.
+    :type lat: ArrayLike
+    :param lon: Longitudes in degrees.
+    :type lon: ArrayLike
+    :param k: Airports per point, defaults to 1
+    :type k: int, optional
+    :return: `IATA` codes and distances in km.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    return get_index().nearest(lat, lon, k)
+
+
+def airports_within(
+    lat: Any, lon: Any, radius_km: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Airports within `radius_km` of each point; see `AirportIndex.within`.
+
+    :param lat: Latitudes in degrees.
+    :type lat: ArrayLike
+    :param lon: Longitudes in degrees.
+    :type lon: ArrayLike
+    :param radius_km: Search radius in km.
+    :type radius_km: float
+    :return: Point positions, `IATA` codes and distances in km.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+    """
+    return get_index().within(lat, lon, radius_km)
+
+
+def enrich_airports(
+    codes: Any,
+    fields: Optional[list[str]] = None,
+    code_type: str = "IATA",
+    frame: bool = True,
+) -> Any:
+    """
+    Airport fields for many codes; see `AirportIndex.enrich`.
+
+    Usage:
+        >>> enrich_airports(flows["site"], fields=["city", "lat", "lon"])
+
+    :param codes: Airport codes; a list, NumPy array or pandas Series.
+    :type codes: ArrayLike
+    :param fields: Fields to return, defaults to all
+    :type fields: list[str], optional
+    :param code_type: `IATA` or `ICAO`, defaults to "IATA"
+    :type code_type: str, optional
+    :param frame: Return a DataFrame instead of arrays, defaults to True
+    :type frame: bool, optional
+    :return: One column per field.
+    :rtype: pd.DataFrame|dict[str, np.ndarray]
+    """
+    return get_index().enrich(codes, fields, code_type, frame)
+
+
+def haversine(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """
+    Great circle distance in km between coordinates in degrees; broadcasts like NumPy.
+
+    :return: Distances in km.
+    :rtype: np.ndarray
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    hav = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0)))
+
+
+def airport_data() -> dict[str, dict[str, Any]]:
+    """
+    Every airport keyed by `IATA` code; built once from the index for `utils.AIRPORTDATA`.
+
+    :return: Airport information per code.
+    :rtype: dict[str, dict[str, Any]]
+    """
+    global _AIRPORTDATA  # pylint: disable=global-statement
+    if _AIRPORTDATA is None:
+        _AIRPORTDATA = get_index().to_dict()
+    return _AIRPORTDATA
+
+
+def _unit_vectors(lat: Any, lon: Any) -> tuple[np.ndarray, np.ndarray]:
+    """Unit vectors of coordinates and which coordinates are present."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64).reshape(-1))
+    lon = np.radians(np.asarray(lon, dtype=np.float64).reshape(-1))
+    if lat.shape != lon.shape:
+        raise ValueError(f"lat and lon lengths differ {len(lat)} != {len(lon)}")
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    cos_lat = np.cos(lat)
+    xyz = np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+    xyz[~valid] = 0.0
+    return xyz, valid
+
+
+def _chunks(points: int, airports: int) -> list[tuple[int, int]]:
+    """Point ranges whose distance matrix fits in `BRUTE_FORCE_BYTES`."""
+    size = max(1, BRUTE_FORCE_BYTES // (8 * max(airports, 1)))
+    return [(start, min(start + size, points)) for start in range(0, points, size)]
+
+
+def _cache_file(cache_dir: Union[str, Path, None]) -> Path:
+    """Cache file for the installed `airportsdata` release."""
+    import airportsdata  # pylint: disable=import-outside-toplevel
+
+    directory = Path(cache_dir) if cache_dir else Path(set_homedir(CACHE_PATH))
+    directory.mkdir(parents=True, exist_ok=True)
+    version = getattr(airportsdata, "__version__", "0")
+    return directory / f"airports-{version}-v{INDEX_FORMAT}.npz"
@@ -1,15 +1,18 @@
 # pylint: disable=too-many-arguments
 """Decorators."""
 
-from typing import Union, Any, Callable
+from typing import Union, Any, Callable, Generator, Optional
+from collections import deque
 from functools import partial
 import functools
-from inspect import isfunction
+from inspect import Signature, isfunction, iscoroutinefunction, signature
+import asyncio
+import threading
 import time
 import random
 import re
 
-from pytoolkit import decorator
+from pytoolkit.exceptions import CircuitOpenError
 
 
 def __reform_except(error: Exception) -> str:
@@ -29,8 +32,42 @@ def __reform_except(error: Exception) -> str:
     return resp
 
 
+def retry_delays(
+    delay: float = 0,
+    max_delay: Union[float, None] = None,
+    backoff: float = 1,
+    jitter: Union[float, tuple[float, float]] = 0,
+) -> Generator[float, None, None]:
+    """
+    Yields the delay to wait before each retry attempt.
+
+    :param delay: intial delay between attempts, defaults to 0.
+    :type delay: float, optional
+    :param max_delay: the maximum value of delay, defaults to None (no limit).
+    :type max_delay: float, optional
+    :param backoff: multiplier applied to delay between attempts, defaults to 1 (no backoff).
+    :type backoff: float, optional
+    :param jitter: extra seconds added to delay between attempts, defaults to 0
+                   fixed if a number, random if a tuple (min,max)
+    :type jitter: float|tuple[float,float], optional
+    :yield: seconds to wait before the next attempt.
+    :rtype: float
+    """
+    _delay = delay
+    while True:
+        yield _delay
+        _delay *= backoff
+        if isinstance(jitter, tuple):
+            _delay += random.uniform(*jitter)
+        else:
+            _delay += jitter
+        if max_delay is not None:
+            _delay = min(_delay, max_delay)
+
+
 def __retry_interval(
-    func: Callable[[Any], Any],
+    func: Callable[[], Any],
+    error: Exception,
     exceptions=Exception,
     tries: int = -1,
     delay: int = 0,
@@ -38,15 +75,17 @@ def __retry_interval(
     backoff: int = 1,
     jitter: int = 0,
     logger: Any = None,
-) -> Union[Any, None]:
+) -> Any:
     """
-    Executes a function and retries it if it failed.
+    Retries a function after its first attempt failed.
 
     :param func: the funciton to execute.
     :type func: Function
+    :param error: the exception raised by the first attempt.
+    :type error: Exception
     :param exceptions: an exception or tupple of exceptions to catch, defaults to Exception
     :type exceptions: Exception|tuple[Excpetion,Exception], optional
-    :param tries: the maximum number of attempts, defaults to -1 (infinite).
+    :param tries: the maximum number of attempts including the first, defaults to -1 (infinite).
     :type tries: int, optional
     :param delay: intial delay between attempts, defaults to 0.
     :type delay: int, optional
@@ -62,27 +101,79 @@ def __retry_interval(
     :type logger: Logger, optional
     :return: the result of the func Function.
     """
-    _tries, _delay = tries, delay
-    while _tries:
+    _tries, delays = tries - 1, retry_delays(delay, max_delay, backoff, jitter)
+    while True:
+        time.sleep(__next_delay(delays, error, logger))
         try:
             return func()
+        except CircuitOpenError:
+            raise
         except exceptions as err:
             _tries -= 1
-            error = __reform_except(err)
             if not _tries:
                 raise
-            if logger is not None:
-                logger.warning(
-                    'msg="attempt failed",error=%s,retrying_in=%ss', error, _delay
-                )
-            time.sleep(_delay)
-            _delay *= backoff
-            if isinstance(jitter, tuple):
-                _delay += random.uniform(*jitter)
-            else:
-                _delay += jitter
-            if max_delay is not None:
-                _delay = min(_delay, max_delay)
+            error = err
+
+
+async def __async_retry_interval(
+    func: Callable[[], Any],
+    error: Exception,
+    exceptions=Exception,
+    tries: int = -1,
+    delay: int = 0,
+    max_delay: Union[int, None] = None,
+    backoff: int = 1,
+    jitter: int = 0,
+    logger: Any = None,
+) -> Any:
+    """
+    Retries a coroutine function after its first attempt failed; see `__retry_interval`.
+     Waits with `asyncio.sleep` and never retries a cancelled attempt.
+
+    :return: the result of the awaited func Function.
+    """
+    _tries, delays = tries - 1, retry_delays(delay, max_delay, backoff, jitter)
+    while True:
+        await asyncio.sleep(__next_delay(delays, error, logger))
+        try:
+            return await func()
+        except (asyncio.CancelledError, CircuitOpenError):
+            raise
+        except exceptions as err:
+            _tries -= 1
+            if not _tries:
+                raise
+            error = err
+
+
+def __next_delay(delays: Generator[float, None, None], error: Exception, logger: Any) -> float:
+    """Next retry delay, logged with the failed attempt error."""
+    _delay = next(delays)
+    if logger is not None:
+        logger.warning(
+            'msg="attempt failed",error=%s,retrying_in=%ss',
+            __reform_except(error),
+            _delay,
+        )
+    return _delay
+
+
+def __signature(func: Callable[..., Any]) -> Optional[Signature]:
+    """Signature of func, None when it cannot be inspected."""
+    try:
+        return signature(func)
+    except (TypeError, ValueError):
+        return None
+
+
+def __check_arguments(sig: Optional[Signature], args: tuple, kwargs: dict) -> None:
+    """
+    Re-raises call argument errors of a failed call so they are not retried or handled.
+
+    :raises TypeError: args and kwargs do not match the signature.
+    """
+    if sig is not None:
+        sig.bind(*args, **kwargs)
 
 
 def retry(
@@ -96,10 +187,15 @@ def retry(
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """
     Returns a retry decorator.
+     A successful first attempt is a plain call; the backoff state is only
+     created once an attempt fails. Coroutine functions are retried with
+     `asyncio.sleep` and cancellation is never retried. `CircuitOpenError` from
+     a `circuit_breaker` is re-raised at once so open circuits are not retried.
+     Calls with arguments that do not match the signature raise `TypeError` without retrying.
 
     :param exceptions: an exception or tupple of exceptions to catch, defaults to Exception
     :type exceptions: Exception|tuple[Excpetion,Exception], optional
-    :param tries: the maximum number of attempts, defaults to -1 (infinite).
+    :param tries: the maximum number of attempts, 0 makes a single attempt like 1, defaults to -1 (infinite).
     :type tries: int, optional
     :param delay: intial delay between attempts, defaults to 0.
     :type delay: int, optional
@@ -116,47 +212,98 @@ def retry(
     :return: a retry decorator.
     :rtype: function
     """
+    # a single attempt re-raises the first failure without retrying
+    single = 0 <= tries <= 1
 
-    @decorator
-    def retry_decorator(func, *fargs, **fkwargs):
-        args = fargs if fargs else list()
-        kwargs = fkwargs if fkwargs else dict()
-        return __retry_interval(
-            partial(func, *args, **kwargs),
-            exceptions,
-            tries,
-            delay,
-            max_delay,
-            backoff,
-            jitter,
-            logger,
-        )
+    def retry_decorator(func):
+        if iscoroutinefunction(func):
+            return _async_retry(func)
+        sig = __signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except CircuitOpenError:
+                raise
+            except exceptions as err:
+                __check_arguments(sig, args, kwargs)
+                if single:
+                    raise
+                error = err
+            return __retry_interval(
+                partial(func, *args, **kwargs),
+                error,
+                exceptions,
+                tries,
+                delay,
+                max_delay,
+                backoff,
+                jitter,
+                logger,
+            )
+
+        return wrapper
+
+    def _async_retry(func):
+        sig = __signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except (asyncio.CancelledError, CircuitOpenError):
+                raise
+            except exceptions as err:
+                __check_arguments(sig, args, kwargs)
+                if single:
+                    raise
+                error = err
+            return await __async_retry_interval(
+                partial(func, *args, **kwargs),
+                error,
+                exceptions,
+                tries,
+                delay,
+                max_delay,
+                backoff,
+                jitter,
+                logger,
+            )
+
+        return wrapper
 
     return retry_decorator
 
 
 def __exception_handler(
-    func,
-    exceptions=Exception,
+    func: Callable[..., Any],
+    err: Exception,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
     default_return=None,
     message="",
     logger=None,
     func_params={},
 ):  # pylint: disable=dangerous-default-value
-    """Exception Handler Decorator."""
-    try:
-        return func()
-    except exceptions as err:
-        error = __reform_except(err)
-        if logger:
-            # need to call func.func to get the original callable function name since created by partial()
-            logger.fatal(
-                f'function={func.func.__name__},error="{message}:error_raw={error}",level=error'
-            )
+    """Builds the error_handler return value of a failed call."""
+    error = __reform_except(err)
+    name = getattr(func, "__name__", type(func).__name__)
+    if logger:
+        logger.fatal(
+            f'function={name},error="{message}:error_raw={error}",level=error'
+        )
+    if isfunction(default_return):
+        params = dict(func_params, func_name=name)
+        params.update(kwargs)
+        params.update({("args" + str(idx + 1)): arg for idx, arg in enumerate(args)})
+        params.update(error=error, level="fatal")
+        return default_return(**params)
     if isinstance(default_return, functools.partial):
         return default_return(error=error, level="fatal")
     if default_return:
         return default_return
+    return None
 
 
 def error_handler(
@@ -164,37 +311,340 @@ def error_handler(
 ):  # pylint: disable=dangerous-default-value
     """
     Error Handler excption; allows passing a default return value if needed.
+     A successful call is a plain call; the default return is only built after a failure.
+     Coroutine functions are awaited and cancellation is re-raised.
+     Calls with arguments that do not match the signature raise `TypeError`.
 
-    :param exceptions: _description_, defaults to Exception
-    :type exceptions: _type_, optional
-    :param default_return: _description_, defaults to None
-    :type default_return: _type_, optional
-    :param logger: _description_, defaults to None
-    :type logger: _type_, optional
-    :param func_params: _description_, defaults to {}
+    :param exceptions: exception or tuple of exceptions to catch, defaults to Exception
+    :type exceptions: Exception|tuple[Exception,Exception], optional
+    :param default_return: value returned on error, a function is called with the call arguments,
+     `func_name`, `error` and `level`, defaults to None
+    :type default_return: Any, optional
+    :param logger: logger.fatal(msg) will be called on errors, defaults to None
+    :type logger: Logger, optional
+    :param func_params: extra keyword arguments passed to a `default_return` function, defaults to {}
     :type func_params: dict, optional
-    :return: _description_
-    :rtype: _type_
-    """
-
-    @decorator
-    def error_handle_decorator(func, *fargs, **fkwargs):
-        args = fargs if fargs else list()
-        kwargs = fkwargs if fkwargs else dict()
-        if isfunction(default_return):
-            func_params.update({"func_name": func.__name__})
-            func_params.update(kwargs)
-            func_params.update(
-                {("args" + str(idx + 1)): arg for idx, arg in enumerate(args)}
-            )
-            return __exception_handler(
-                partial(func, *args, **kwargs),
-                exceptions,
-                partial(default_return, **func_params),
-                logger,
-            )
-        return __exception_handler(
-            partial(func, *args, **kwargs), exceptions, default_return, logger
-        )
+    :return: an error handler decorator.
+    :rtype: function
+    """
+
+    def error_handle_decorator(func):
+        if iscoroutinefunction(func):
+            return _async_error_handle(func)
+        sig = __signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except exceptions as err:
+                __check_arguments(sig, args, kwargs)
+                return __exception_handler(
+                    func,
+                    err,
+                    args,
+                    kwargs,
+                    default_return,
+                    logger=logger,
+                    func_params=func_params,
+                )
+
+        return wrapper
+
+    def _async_error_handle(func):
+        sig = __signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                raise
+            except exceptions as err:
+                __check_arguments(sig, args, kwargs)
+                return __exception_handler(
+                    func,
+                    err,
+                    args,
+                    kwargs,
+                    default_return,
+                    logger=logger,
+                    func_params=func_params,
+                )
+
+        return wrapper
 
     return error_handle_decorator
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """
+    Circuit breaker shedding calls to a failing dependency.
+
+    The circuit is `closed` while the failure rate of the calls in the last
+    `window` seconds stays below `failure_rate`. Once it is reached (after at least
+    `min_calls` calls) the circuit opens and calls raise `CircuitOpenError` without
+    running. After `cooldown` seconds the circuit is `half_open` and lets
+    `half_open_calls` trial calls through; a successful trial closes it, a failed one
+    opens it again. Exceptions other than `exceptions` count as successful calls.
+    State is shared by every function decorated with the same breaker and is safe
+    to use from threads and asyncio tasks.
+
+    Usage:
+        >>> breaker = CircuitBreaker(failure_rate=0.5, window=60, cooldown=30)
+        >>> @error_handler(default_return=[])
+        ... @retry(delay=1, backoff=2, max_delay=30)
+        ... @breaker
+        ... def fetch_devices(site):
+        ...     ...
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        exceptions=Exception,
+        failure_rate: float = 0.5,
+        window: float = 60.0,
+        min_calls: int = 10,
+        cooldown: float = 30.0,
+        half_open_calls: int = 1,
+        name: str = "",
+        logger: Any = None,
+    ) -> None:
+        """
+        Create a closed circuit breaker.
+
+        :param exceptions: an exception or tupple of exceptions counted as failures, defaults to Exception
+        :type exceptions: Exception|tuple[Excpetion,Exception], optional
+        :param failure_rate: failed share of calls in the window that opens the circuit, defaults to 0.5
+        :type failure_rate: float, optional
+        :param window: seconds of calls the failure rate is measured over, defaults to 60.0
+        :type window: float, optional
+        :param min_calls: calls in the window before the circuit can open, defaults to 10
+        :type min_calls: int, optional
+        :param cooldown: seconds the circuit stays open before trial calls, defaults to 30.0
+        :type cooldown: float, optional
+        :param half_open_calls: trial calls let through at once while half open, defaults to 1
+        :type half_open_calls: int, optional
+        :param name: name used in errors and logs, defaults to the first decorated function name
+        :type name: str, optional
+        :param logger: logger.warning(fmt,...) will be called on state changes, defaults to None
+        :type logger: Logger, optional
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError(f"Invalid failure_rate {failure_rate} must be in (0, 1]")
+        self.exceptions = exceptions
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = max(min_calls, 1)
+        self.cooldown = cooldown
+        self.half_open_calls = max(half_open_calls, 1)
+        self.name = name
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        # (monotonic time, failed) per call in the window
+        self._calls: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        # bumped on every state change; outcomes of calls admitted earlier are ignored
+        self._generation = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: `closed`, `open` or `half_open`."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Decorate a function or coroutine function with this breaker."""
+        if not self.name:
+            self.name = getattr(func, "__name__", "")
+        if iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                generation = self.before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    self.release(generation)
+                    raise
+                except self.exceptions:
+                    self.record(False, generation)
+                    raise
+                except Exception:
+                    self.record(True, generation)
+                    raise
+                except BaseException:
+                    self.release(generation)
+                    raise
+                self.record(True, generation)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            generation = self.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except self.exceptions:
+                self.record(False, generation)
+                raise
+            except Exception:
+                self.record(True, generation)
+                raise
+            except BaseException:
+                self.release(generation)
+                raise
+            self.record(True)
+            return result
+
+        return wrapper
+
+    def before_call(self) -> int:
+        """
+        Admit a call; half open circuits count it as a trial call.
+
+        :raises CircuitOpenError: the circuit is open or its trial calls are in use.
+        :return: generation the call was admitted in; pass it to `record`/`release`.
+        :rtype: int
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == self.CLOSED:
+                return self._generation
+            if state == self.HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+                return self._generation
+            retry_in = max(self._opened_at + self.cooldown - now, 0)
+        raise CircuitOpenError(f"Circuit {self.name} is {state}; retry in {retry_in:.1f}s")
+
+    def record(self, success: bool, generation: Optional[int] = None) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        :param success: False when the call raised one of `exceptions`.
+        :type success: bool
+        :param generation: `before_call` result; outcomes of calls admitted before the
+         last state change are ignored, defaults to None (current state)
+        :type generation: int, optional
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            now = time.monotonic()
+            if self._state == self.HALF_OPEN:
+                self._trials = max(self._trials - 1, 0)
+                if success:
+                    self._change(self.CLOSED, now)
+                else:
+                    self._change(self.OPEN, now)
+                return
+            if self._state == self.OPEN:
+                return
+            self._calls.append((now, not success))
+            self._failures += not success
+            self._expire(now)
+            if (
+                not success
+                and len(self._calls) >= self.min_calls
+                and self._failures >= self.failure_rate * len(self._calls)
+            ):
+                self._change(self.OPEN, now)
+
+    def release(self, generation: Optional[int] = None) -> None:
+        """
+        Release an admitted call without recording an outcome, e.g. when it was cancelled.
+
+        :param generation: `before_call` result, defaults to None (current state)
+        :type generation: int, optional
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if self._state == self.HALF_OPEN:
+                self._trials = max(self._trials - 1, 0)
+
+    def reset(self) -> None:
+        """Close the circuit and forget recorded calls."""
+        with self._lock:
+            self._change(self.CLOSED, time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        """State at `now`; an open circuit becomes half open after the cooldown."""
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._change(self.HALF_OPEN, now)
+        return self._state
+
+    def _change(self, state: str, now: float) -> None:
+        """Move to `state`; the window starts over on every change."""
+        if state == self.OPEN:
+            self._opened_at = now
+        if self.logger is not None and state != self._state:
+            self.logger.warning(
+                'msg="circuit state changed",circuit=%s,from=%s,to=%s,failures=%s,calls=%s',
+                self.name,
+                self._state,
+                state,
+                self._failures,
+                len(self._calls),
+            )
+        self._state = state
+        self._calls.clear()
+        self._failures = 0
+        self._trials = 0
+        self._generation += 1
+
+    def _expire(self, now: float) -> None:
+        """Drop calls older than the window."""
+        calls, start = self._calls, now - self.window
+        while calls and calls[0][0] < start:
+            self._failures -= calls.popleft()[1]
+
+
+def circuit_breaker(
+    exceptions=Exception,
+    failure_rate: float = 0.5,
+    window: float = 60.0,
+    min_calls: int = 10,
+    cooldown: float = 30.0,
+    half_open_calls: int = 1,
+    logger: Any = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Returns a circuit breaker decorator; see `CircuitBreaker`.
+     Place it inside `retry` so every attempt is recorded and retries stop as soon as
+     the circuit opens, and inside `error_handler` to return the default while it is open.
+
+    :param exceptions: an exception or tupple of exceptions counted as failures, defaults to Exception
+    :type exceptions: Exception|tuple[Excpetion,Exception], optional
+    :param failure_rate: failed share of calls in the window that opens the circuit, defaults to 0.5
+    :type failure_rate: float, optional
+    :param window: seconds of calls the failure rate is measured over, defaults to 60.0
+    :type window: float, optional
+    :param min_calls: calls in the window before the circuit can open, defaults to 10
+    :type min_calls: int, optional
+    :param cooldown: seconds the circuit stays open before trial calls, defaults to 30.0
+    :type cooldown: float, optional
+    :param half_open_calls: trial calls let through at once while half open, defaults to 1
+    :type half_open_calls: int, optional
+    :param logger: logger.warning(fmt,...) will be called on state changes, defaults to None
+    :type logger: Logger, optional
+    :param breaker: existing breaker to share between functions; the other settings are ignored, defaults to None
+    :type breaker: CircuitBreaker, optional
+    :return: a circuit breaker decorator.
+    :rtype: function
+    """
+    if breaker is None:
+        breaker = CircuitBreaker(
+            exceptions, failure_rate, window, min_calls, cooldown, half_open_calls, logger=logger
+        )
+    return breaker
@@ -7,3 +7,7 @@ class PyToolKitError(Exception):
 
 class PyToolKitInvalidParameter(PyToolKitError):
     """Invalid parameter"""
+
+
+class CircuitOpenError(PyToolKitError):
+    """Call rejected while a circuit breaker is open"""
@@ -0,0 +1,145 @@
+# pylint: disable=logging-fstring-interpolation
+"""Splunk HEC Indexer Acknowledgement."""
+
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any
+
+from pytoolkit.py_splunk.splunk import SplunkHecClient, splunk_log
+from pytoolkit.utils import chunk, reformat_exception
+
+
+@dataclass
+class PendingAck:
+    """Chunk waiting for an indexer acknowledgement."""
+
+    client: SplunkHecClient
+    chunk: list[bytes]
+    sent: float
+
+
+class HecAckTracker:
+    """
+    Tracks HEC `ackId`s per endpoint and channel and polls the ack endpoint in batches.
+
+    The HEC token must have indexer acknowledgement enabled and each client
+    should use its own GUID channel (`SplunkHecHeader.channel`). Chunks that are
+    not acknowledged within `ack_timeout` seconds are sent again. `ackId`s are only
+    unique per indexer and channel, so clients of different endpoints are tracked apart.
+
+    Usage:
+        >>> tracker = HecAckTracker(ack_timeout=120)
+        >>> tracker.send(client, hec_data)
+        >>> tracker.poll()  # call periodically
+        {'acked': 10, 'resent': 0, 'pending': 0}
+    """
+
+    def __init__(
+        self,
+        ack_timeout: float = 300.0,
+        max_ids_per_request: int = 1000,
+        log: Any = splunk_log,
+    ) -> None:
+        """
+        Create a tracker.
+
+        :param ack_timeout: Seconds to wait for an ack before the chunk is sent again, defaults to 300.0
+        :type ack_timeout: float, optional
+        :param max_ids_per_request: Maximum `ackId`s asked for per ack request, defaults to 1000
+        :type max_ids_per_request: int, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        """
+        self.ack_timeout = ack_timeout
+        self.max_ids_per_request = max_ids_per_request
+        self.log = log
+        self._lock = threading.Lock()
+        # pending acks per (client url, channel)
+        self._pending: dict[tuple[str, str], dict[int, PendingAck]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of chunks waiting for an ack."""
+        with self._lock:
+            return sum(len(acks) for acks in self._pending.values())
+
+    def send(
+        self, client: SplunkHecClient, events: list[dict[str, Any]], **split_kwargs: Any
+    ) -> list[dict[str, Any]]:
+        """
+        Upload events and track the `ackId` of every delivered chunk.
+
+        :param client: HEC client to send with.
+        :type client: SplunkHecClient
+        :param events: List of dictionary events; see `splunk_hec_format`.
+        :type events: list[dict[str, Any]]
+        :param split_kwargs: `chunk_size`/`max_payload_bytes` overrides; see `SplunkHecClient.split`.
+        :return: Delivery report; see `SplunkHecClient.deliver`.
+        :rtype: list[dict[str, Any]]
+        """
+        return self.deliver(client, client.split(events, **split_kwargs))
+
+    def deliver(
+        self, client: SplunkHecClient, chunks: list[list[bytes]]
+    ) -> list[dict[str, Any]]:
+        """
+        Deliver encoded chunks and track the `ackId` of every delivered chunk.
+
+        :param client: HEC client to send with.
+        :type client: SplunkHecClient
+        :param chunks: Chunked encoded events; see `SplunkHecClient.split`.
+        :type chunks: list[list[bytes]]
+        :return: Delivery report; see `SplunkHecClient.deliver`.
+        :rtype: list[dict[str, Any]]
+        """
+        report = client.deliver(chunks)
+        now = time.monotonic()
+        with self._lock:
+            acks = self._pending.setdefault((client.url, client.channel), {})
+            for entry in report:
+                message = entry["message"]
+                if entry["delivered"] and isinstance(message, dict) and "ackId" in message:
+                    acks[int(message["ackId"])] = PendingAck(client, chunks[entry["chunk"]], now)
+        return report
+
+    def poll(self) -> dict[str, int]:
+        """
+        Ask each endpoint channel about its outstanding `ackId`s and resend chunks that timed out.
+
+        :return: Count of chunks `acked` and `resent` by this poll and still `pending`.
+        :rtype: dict[str, int]
+        """
+        acked = 0
+        expired: dict[tuple[str, str], list[PendingAck]] = {}
+        with self._lock:
+            channels = {key: dict(acks) for key, acks in self._pending.items() if acks}
+        for key, acks in channels.items():
+            url, channel = key
+            status: dict[int, bool] = {}
+            # every client of a key talks to the same endpoint and channel
+            client = next(iter(acks.values())).client
+            try:
+                for ack_ids in chunk(sorted(acks), self.max_ids_per_request):
+                    status.update(client.query_acks(ack_ids))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                error = reformat_exception(err)
+                self.log.error(f'msg="Unable to query splunk acks"|{url=}, {channel=}, {error=}')
+            now = time.monotonic()
+            with self._lock:
+                outstanding = self._pending[key]
+                for ack_id, pending in acks.items():
+                    if status.get(ack_id):
+                        outstanding.pop(ack_id, None)
+                        acked += 1
+                    elif now - pending.sent >= self.ack_timeout:
+                        outstanding.pop(ack_id, None)
+                        expired.setdefault(key, []).append(pending)
+        resent = 0
+        for (url, channel), pending_acks in expired.items():
+            self.log.warning(
+                f'msg="splunk acks timed out resending chunks"|{url=}, {channel=}, chunks={len(pending_acks)}'
+            )
+            self.deliver(pending_acks[0].client, [pending.chunk for pending in pending_acks])
+            resent += len(pending_acks)
+        return {"acked": acked, "resent": resent, "pending": self.pending}
@@ -0,0 +1,151 @@
+# pylint: disable=logging-fstring-interpolation
+"""Asyncio Splunk HEC Integrations."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
+
+from pytoolkit.py_splunk.splunk import SplunkHecClient, SplunkHecHeader, splunk_log
+
+
+class AsyncSplunkHecClient:
+    """
+    Asyncio HEC client that uploads chunks concurrently with a bounded number in flight.
+
+    Requests are posted over the pooled `SplunkHecClient` session from a
+    dedicated worker pool, so the event loop is never blocked on the indexer.
+
+    Usage:
+        >>> async with AsyncSplunkHecClient(header, max_in_flight=8) as client:
+        ...     resp_list = await client.send(hec_data)
+    """
+
+    def __init__(
+        self,
+        header: SplunkHecHeader,
+        max_in_flight: int = 4,
+        chunk_size: int = 100,
+        log: Any = splunk_log,
+        **client_kwargs: Any,
+    ) -> None:
+        """
+        Create an asyncio HEC client.
+
+        :param header: Splunk HEC connection settings.
+        :type header: SplunkHecHeader
+        :param max_in_flight: Maximum number of chunks uploading at once, defaults to 4
+        :type max_in_flight: int, optional
+        :param chunk_size: Number of events per request (0 will indicate all), defaults to 100
+        :type chunk_size: int, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        :param client_kwargs: Extra `SplunkHecClient` options.
+        :raises ValueError: `max_in_flight` is less than 1.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"Invalid max_in_flight {max_in_flight} must be 1 or more")
+        self.max_in_flight = max_in_flight
+        client_kwargs.setdefault("pool_maxsize", max_in_flight)
+        self.client = SplunkHecClient(
+            header, chunk_size=chunk_size, log=log, **client_kwargs
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="splunk-hec"
+        )
+
+    async def __aenter__(self) -> "AsyncSplunkHecClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Wait for in-flight uploads and release the session and worker pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.client.close()
+
+    async def send(
+        self,
+        events: list[dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_payload_bytes: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Upload events concurrently.
+
+        :param events: List of dictionary events; see `splunk_hec_format`.
+        :type events: list[dict[str, Any]]
+        :param chunk_size: Override the client chunk size for this call, defaults to None
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Pack events by serialized size instead, defaults to None
+        :type max_payload_bytes: int, optional
+        :return: Delivery report with one entry per chunk, in the original chunk order;
+         each chunk is retried independently per the client retry policy.
+        :rtype: list[dict[str, Any]]
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def _send(idx: int, payload: list[bytes]) -> dict[str, Any]:
+            async with semaphore:
+                [entry] = await loop.run_in_executor(
+                    self._executor, self.client.deliver, [payload]
+                )
+            entry["chunk"] = idx
+            return entry
+
+        return list(
+            await asyncio.gather(
+                *(
+                    _send(idx, payload)
+                    for idx, payload in enumerate(
+                        self.client.split(events, chunk_size, max_payload_bytes)
+                    )
+                )
+            )
+        )
+
+
+async def async_splunk_hec_upload(  # pylint: disable=too-many-arguments
+    server: str,
+    token: str,
+    hec_data: list[dict[str, Any]],
+    timeout: float = 15.0,
+    verify: Union[str, bool] = True,
+    port: int = 8088,
+    chunk_size: int = 100,
+    max_in_flight: int = 4,
+    log: Any = splunk_log,
+) -> list[dict[str, Any]]:
+    """
+    Upload Splunk Data concurrently from asyncio code.
+
+    :param server: Splunk HEC server.
+    :type server: str
+    :param token: HEC token.
+    :type token: str
+    :param hec_data: List of dictionary events.
+    :type hec_data: list[str,Any]
+    :param verify: Validation of Rest call
+    :type verify: [str|bool]
+    :param port: Port to use, defaults to 8088
+    :type port: int, optional
+    :param chunk_size: Set size to split up data into if too large, defaults to 100 (0 will indicate all)
+    :type chunk_size: int, optional
+    :param max_in_flight: Maximum number of chunks uploading at once, defaults to 4
+    :type max_in_flight: int, optional
+    :return: One response entry per chunk, in the original chunk order.
+    :rtype: list[dict[str, Any]]
+    """
+    header = SplunkHecHeader(
+        splunk_server=server,
+        token=token,
+        splunk_port=port,
+        verify=verify,
+        timeout=timeout,
+    )
+    async with AsyncSplunkHecClient(
+        header, max_in_flight=max_in_flight, chunk_size=chunk_size, log=log
+    ) as client:
+        return await client.send(hec_data)
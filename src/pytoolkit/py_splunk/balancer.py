@@ -0,0 +1,244 @@
+# pylint: disable=logging-fstring-interpolation
+"""Splunk HEC Load Balancing."""
+
+from concurrent.futures import ThreadPoolExecutor
+import dataclasses
+import threading
+import time
+from typing import Any, Optional, Union
+
+from pytoolkit.py_splunk.splunk import (
+    HecRetryPolicy,
+    SplunkHecClient,
+    SplunkHecHeader,
+    splunk_log,
+)
+
+LB_STRATEGIES = ("round_robin", "least_outstanding")
+
+
+@dataclasses.dataclass
+class HecEndpoint:
+    """HEC endpoint with its own connection pool and passive health state."""
+
+    client: SplunkHecClient
+    outstanding: int = 0
+    failures: int = 0
+    ejected_until: float = 0.0
+    probing: bool = False
+
+    @property
+    def name(self) -> str:
+        """`server:port` of the endpoint."""
+        return f"{self.client.header.splunk_server}:{self.client.header.splunk_port}"
+
+
+class HecLoadBalancer:  # pylint: disable=too-many-instance-attributes
+    """
+    Spreads HEC chunks over several indexers or heavy forwarders.
+
+    Each endpoint keeps its own pooled `SplunkHecClient`. Endpoints are ejected after
+    `max_failures` consecutive failed chunks and re-admitted once a health probe passes
+    after `eject_time` seconds. A chunk that fails on one endpoint fails over to the next.
+
+    Usage:
+        >>> with HecLoadBalancer(header, ["hf01.example.com", ("hf02.example.com", 8089)]) as balancer:
+        ...     report = balancer.send(hec_data)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        header: SplunkHecHeader,
+        endpoints: list[Union[str, tuple[str, int]]],
+        strategy: str = "round_robin",
+        max_failures: int = 3,
+        eject_time: float = 30.0,
+        max_in_flight: Optional[int] = None,
+        spool: Any = None,
+        log: Any = splunk_log,
+        **client_kwargs: Any,
+    ) -> None:
+        """
+        Create a client per endpoint from a shared `SplunkHecHeader`.
+
+        :param header: Shared HEC settings; server and port are replaced per endpoint.
+        :type header: SplunkHecHeader
+        :param endpoints: `server` or `(server, port)` per endpoint; `server` uses the header port.
+        :type endpoints: list[str|tuple[str,int]]
+        :param strategy: `round_robin` or `least_outstanding`, defaults to "round_robin"
+        :type strategy: str, optional
+        :param max_failures: Consecutive failures before an endpoint is ejected, defaults to 3
+        :type max_failures: int, optional
+        :param eject_time: Seconds before an ejected endpoint is probed, defaults to 30.0
+        :type eject_time: float, optional
+        :param max_in_flight: Chunks uploading at once, defaults to 2 per endpoint
+        :type max_in_flight: int, optional
+        :param spool: Spool for chunks that fail on every endpoint; see `spool.HecSpool`, defaults to None
+        :type spool: HecSpool, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        :param client_kwargs: Extra `SplunkHecClient` options; retries default to one
+         attempt per endpoint since failed chunks move on to the next endpoint.
+        :raises ValueError: No endpoints or an invalid strategy.
+        """
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        if strategy not in LB_STRATEGIES:
+            raise ValueError(f"Invalid strategy {strategy} must be one of {LB_STRATEGIES}")
+        client_kwargs.setdefault("retry", HecRetryPolicy(tries=1))
+        self.endpoints: list[HecEndpoint] = []
+        for endpoint in endpoints:
+            server, port = (
+                (endpoint, header.splunk_port) if isinstance(endpoint, str) else endpoint
+            )
+            self.endpoints.append(
+                HecEndpoint(
+                    SplunkHecClient(
+                        dataclasses.replace(header, splunk_server=server, splunk_port=port),
+                        log=log,
+                        **client_kwargs,
+                    )
+                )
+            )
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_time = eject_time
+        self.spool = spool
+        self.log = log
+        self._lock = threading.Lock()
+        self._next: int = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight if max_in_flight else 2 * len(self.endpoints),
+            thread_name_prefix="splunk-hec-lb",
+        )
+
+    def __enter__(self) -> "HecLoadBalancer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for in-flight chunks and close every endpoint pool."""
+        self._executor.shutdown()
+        for endpoint in self.endpoints:
+            endpoint.client.close()
+
+    def healthy(self) -> list[HecEndpoint]:
+        """Endpoints currently accepting traffic."""
+        now = time.monotonic()
+        return [endpoint for endpoint in self.endpoints if endpoint.ejected_until <= now]
+
+    def send(
+        self,
+        events: list[dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_payload_bytes: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Upload events with chunks spread over the healthy endpoints concurrently.
+
+        :param events: List of dictionary events; see `splunk_hec_format`.
+        :type events: list[dict[str, Any]]
+        :param chunk_size: Override the client chunk size for this call, defaults to None
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Override the client payload size for this call, defaults to None
+        :type max_payload_bytes: int, optional
+        :return: Delivery report in chunk order; each entry adds the `endpoint` used.
+        :rtype: list[dict[str, Any]]
+        """
+        chunks = self.endpoints[0].client.split(events, chunk_size, max_payload_bytes)
+        report = list(self._executor.map(self.deliver_chunk, chunks))
+        for idx, entry in enumerate(report):
+            entry["chunk"] = idx
+        return report
+
+    def deliver_chunk(self, payload: list[bytes]) -> dict[str, Any]:
+        """
+        Deliver one encoded chunk, failing over across endpoints.
+
+        :param payload: Encoded events.
+        :type payload: list[bytes]
+        :return: Delivery report entry with the `endpoint` used.
+        :rtype: dict[str, Any]
+        """
+        tried: set[int] = set()
+        entry: dict[str, Any] = {}
+        while len(tried) < len(self.endpoints):
+            endpoint = self._select(tried)
+            tried.add(id(endpoint))
+            try:
+                [entry] = endpoint.client.deliver([payload], spool_failed=False)
+            finally:
+                with self._lock:
+                    endpoint.outstanding -= 1
+            entry["endpoint"] = endpoint.name
+            self._record(endpoint, entry)
+            if not endpoint.client.is_retryable(entry):
+                return entry
+        if self.spool is not None:
+            self.spool.append(payload)
+            entry["spooled"] = True
+        return entry
+
+    def _select(self, tried: set[int]) -> HecEndpoint:
+        """Pick the next endpoint not tried yet for this chunk."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                endpoint for endpoint in self.endpoints if id(endpoint) not in tried
+            ]
+            probe = next(
+                (
+                    endpoint
+                    for endpoint in candidates
+                    if 0 < endpoint.ejected_until <= now and not endpoint.probing
+                ),
+                None,
+            )
+            if probe is not None:
+                probe.probing = True
+        if probe is not None:
+            self._probe(probe)
+        with self._lock:
+            now = time.monotonic()
+            healthy = [endpoint for endpoint in candidates if endpoint.ejected_until <= now]
+            if not healthy:
+                # every endpoint is ejected; use the one that is due back first
+                healthy = [min(candidates, key=lambda endpoint: endpoint.ejected_until)]
+            if self.strategy == "least_outstanding":
+                start = self._next % len(healthy)
+                rotated = healthy[start:] + healthy[:start]
+                endpoint = min(rotated, key=lambda endpoint: endpoint.outstanding)
+            else:
+                endpoint = healthy[self._next % len(healthy)]
+            self._next += 1
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _probe(self, endpoint: HecEndpoint) -> None:
+        """Health check an ejected endpoint; re-admit it or eject it again."""
+        healthy = endpoint.client.health()
+        with self._lock:
+            endpoint.probing = False
+            if healthy:
+                endpoint.failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                endpoint.ejected_until = time.monotonic() + self.eject_time
+        self.log.warning(
+            f'msg="probed ejected splunk endpoint"|endpoint={endpoint.name}, {healthy=}'
+        )
+
+    def _record(self, endpoint: HecEndpoint, entry: dict[str, Any]) -> None:
+        """Update passive health from a delivery report entry."""
+        with self._lock:
+            if not endpoint.client.is_retryable(entry):
+                endpoint.failures = 0
+                return
+            endpoint.failures += 1
+            if endpoint.failures >= self.max_failures and not endpoint.ejected_until:
+                endpoint.ejected_until = time.monotonic() + self.eject_time
+                self.log.error(
+                    f'msg="ejecting splunk endpoint"|endpoint={endpoint.name}, failures={endpoint.failures}'
+                )
@@ -0,0 +1,220 @@
+# pylint: disable=logging-fstring-interpolation
+"""Background Splunk HEC Batching."""
+
+import atexit
+from collections import deque
+import threading
+import time
+from typing import Any, Optional, Union
+
+from pytoolkit.py_splunk.payload import encode_event
+from pytoolkit.py_splunk.splunk import SplunkHecClient, splunk_hec_format, splunk_log
+from pytoolkit.utils import reformat_exception
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+class HecBatcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Long-lived HEC sender that batches events put from any thread.
+
+    A worker thread flushes the pending batch once it holds `max_events` events,
+    `max_bytes` of serialized events or has waited `flush_interval` milliseconds,
+    whichever comes first. Pending events are flushed on interpreter exit.
+
+    Usage:
+        >>> batcher = HecBatcher(SplunkHecClient(header), max_events=500, flush_interval=2000)
+        >>> batcher.add(host="server01", source="monitor", sourcetype="stat_cpu", cpu_usage=4.25)
+        >>> batcher.close()
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: SplunkHecClient,
+        max_events: int = 100,
+        max_bytes: int = 1000000,
+        flush_interval: float = 1000,
+        max_queue: int = 10000,
+        policy: str = "block",
+        put_timeout: Optional[float] = None,
+        log: Any = splunk_log,
+    ) -> None:
+        """
+        Create a batcher and start its worker thread.
+
+        :param client: HEC client used to upload each batch.
+        :type client: SplunkHecClient
+        :param max_events: Flush once the batch holds this many events, defaults to 100
+        :type max_events: int, optional
+        :param max_bytes: Flush before the serialized batch grows past this size, defaults to 1000000
+        :type max_bytes: int, optional
+        :param flush_interval: Flush a batch this many milliseconds after its first event, defaults to 1000
+        :type flush_interval: float, optional
+        :param max_queue: Maximum events waiting for the worker, defaults to 10000
+        :type max_queue: int, optional
+        :param policy: What to do when the queue is full; `block`, `drop_oldest` or `drop_newest`,
+         defaults to "block"
+        :type policy: str, optional
+        :param put_timeout: Seconds `block` waits for room before dropping the event, defaults to None (forever)
+        :type put_timeout: float, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        :raises ValueError: Invalid policy or limits.
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Invalid policy {policy} must be one of {BACKPRESSURE_POLICIES}")
+        if min(max_events, max_bytes, max_queue) < 1:
+            raise ValueError("max_events, max_bytes and max_queue must be 1 or more")
+        self.client = client
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval / 1000
+        self.policy = policy
+        self.put_timeout = put_timeout
+        self.log = log
+        self.dropped: int = 0
+        self.max_queue = max_queue
+        self._queue: deque[dict[str, Any]] = deque(
+            maxlen=max_queue if policy == "drop_oldest" else None
+        )
+        self._slots = threading.BoundedSemaphore(max_queue) if policy == "block" else None
+        self._wakeup = threading.Event()
+        self._flushed = threading.Condition()
+        self._flush_requested: int = 0
+        self._flush_completed: int = 0
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="splunk-hec-batcher", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "HecBatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def put(self, event: dict[str, Any]) -> bool:
+        """
+        Queue a HEC formatted event.
+
+        :param event: Event built by `splunk_hec_format`.
+        :type event: dict[str, Any]
+        :raises RuntimeError: Batcher is closed.
+        :return: False if the event was dropped by the backpressure policy.
+        :rtype: bool
+        """
+        if self._closed:
+            raise RuntimeError("HecBatcher is closed")
+        if self._slots is not None:
+            if not self._slots.acquire(timeout=self.put_timeout):
+                self.dropped += 1
+                return False
+        elif len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            if self.policy == "drop_newest":
+                return False
+        # deque.maxlen discards the oldest entry for `drop_oldest`.
+        self._queue.append(event)
+        self._wakeup.set()
+        return True
+
+    def add(
+        self,
+        host: str,
+        source: str,
+        sourcetype: str,
+        metrics_list: Union[list[str], None] = None,
+        **kwargs: Any,
+    ) -> bool:
+        """
+        Format an event with `splunk_hec_format` and queue it.
+
+        :return: False if the event was dropped by the backpressure policy.
+        :rtype: bool
+        """
+        return self.put(
+            splunk_hec_format(host, source, sourcetype, metrics_list, **kwargs)
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send everything queued so far and wait for it to be uploaded.
+
+        :param timeout: Seconds to wait, defaults to None (forever)
+        :type timeout: float, optional
+        :return: True if the flush completed within the timeout.
+        :rtype: bool
+        """
+        with self._flushed:
+            self._flush_requested += 1
+            request = self._flush_requested
+            self._wakeup.set()
+            return self._flushed.wait_for(
+                lambda: self._flush_completed >= request or not self._worker.is_alive(),
+                timeout=timeout,
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Flush pending events and stop the worker thread.
+
+        :param timeout: Seconds to wait for the final flush, defaults to None (forever)
+        :type timeout: float, optional
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._wakeup.set()
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        """Worker loop; drains the queue into batches and uploads them."""
+        batch: list[bytes] = []
+        batch_bytes: int = 0
+        deadline: float = 0.0
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if batch else None
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            with self._flushed:
+                flush_request = self._flush_requested
+            while self._queue:
+                event = encode_event(self._queue.popleft())
+                if self._slots is not None:
+                    self._slots.release()
+                size = len(event) + 1
+                if batch and batch_bytes + size > self.max_bytes:
+                    self._send(batch)
+                    batch, batch_bytes = [], 0
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(event)
+                batch_bytes += size
+                if len(batch) >= self.max_events or batch_bytes >= self.max_bytes:
+                    self._send(batch)
+                    batch, batch_bytes = [], 0
+            if batch and (
+                self._closed
+                or flush_request > self._flush_completed
+                or time.monotonic() >= deadline
+            ):
+                self._send(batch)
+                batch, batch_bytes = [], 0
+            with self._flushed:
+                self._flush_completed = flush_request
+                self._flushed.notify_all()
+            if self._closed and not self._queue:
+                return
+
+    def _send(self, batch: list[bytes]) -> None:
+        """Upload one batch of encoded events as a single request."""
+        try:
+            self.client.send_chunk(batch)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            error = reformat_exception(err)
+            self.log.error(
+                f'msg="Unable to upload batch to splunk server"|events={len(batch)}, {error=}'
+            )
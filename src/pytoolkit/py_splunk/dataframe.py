@@ -0,0 +1,150 @@
+"""Splunk HEC DataFrame Export."""
+
+import datetime
+import json
+from typing import Any, Generator, Optional, Union
+
+import pandas as pd
+
+from pytoolkit.py_splunk.splunk import SplunkHecClient
+from pytoolkit.static import ENCODING
+
+
+def iter_dataframe_hec(  # pylint: disable=too-many-arguments
+    df: pd.DataFrame,
+    time_col: Optional[str],
+    host: str,
+    source: str,
+    sourcetype: str,
+    metrics: Union[list[str], None] = None,
+    batch_rows: int = 10000,
+) -> Generator[list[bytes], None, None]:
+    """
+    Encode DataFrame rows as HEC events column-wise, one batch of rows at a time.
+     Produces the same events as calling `splunk_hec_format` per row; each
+     `event` and `fields` section is serialized by pandas for the whole batch
+     so no per-row dictionaries are built.
+
+    :param df: Rows to export; columns become event keys.
+    :type df: pd.DataFrame
+    :param time_col: Column holding the event time (datetime, naive treated as UTC, or epoch seconds);
+     None uses the current time for every row.
+    :type time_col: str, optional
+    :param host: hostname
+    :type host: str
+    :param source: source of data
+    :type source: str
+    :param sourcetype: sourcetype of data
+    :type sourcetype: str
+    :param metrics: Columns exported as `metric_name:<column>` fields, defaults to None
+    :type metrics: list[str], optional
+    :param batch_rows: Rows encoded per batch, defaults to 10000
+    :type batch_rows: int, optional
+    :yield: Encoded events of one batch.
+    :rtype: list[bytes]
+    """
+    metrics = metrics if metrics else []
+    missing = [metric for metric in metrics if metric not in df.columns]
+    if missing:
+        raise ValueError(f"Invalid metrics {missing} not found in DataFrame")
+    # column order matches the sorted `event` and `fields` built by `splunk_hec_format`
+    event_cols = sorted(
+        (col for col in df.columns if col != time_col and col not in metrics), key=str
+    )
+    field_names = {metric: f"metric_name:{metric}" for metric in metrics}
+    field_cols = sorted(metrics, key=lambda metric: field_names[metric])
+    head = "".join(
+        [
+            ',"host":',
+            json.dumps(host),
+            ',"source":',
+            json.dumps(source),
+            ',"sourcetype":',
+            json.dumps(sourcetype),
+            ',"event":',
+        ]
+    )
+    now = json.dumps(datetime.datetime.now().timestamp())
+    for start in range(0, len(df), batch_rows):
+        batch = df.iloc[start : start + batch_rows]
+        if time_col is None:
+            times = pd.Series(now, index=batch.index)
+        else:
+            times = pd.Series(_json_values(_epoch_seconds(batch[time_col])), index=batch.index)
+        lines = '{"time":' + times + head + pd.Series(
+            _json_lines(batch[event_cols]), index=batch.index
+        )
+        if field_cols:
+            fields = batch[field_cols].rename(columns=field_names)
+            lines = lines + ',"fields":' + pd.Series(_json_lines(fields), index=batch.index)
+        yield ("\n".join(lines + "}")).encode(ENCODING).split(b"\n")
+
+
+def dataframe_to_hec(  # pylint: disable=too-many-arguments
+    df: pd.DataFrame,
+    time_col: Optional[str],
+    host: str,
+    source: str,
+    sourcetype: str,
+    client: SplunkHecClient,
+    metrics: Union[list[str], None] = None,
+    batch_rows: int = 10000,
+    **chunk_kwargs: Any,
+) -> list[dict[str, Any]]:
+    """
+    Stream a DataFrame to HEC; each batch of encoded rows is chunked and uploaded
+     before the next batch is encoded.
+
+    :param df: Rows to export; see `iter_dataframe_hec`.
+    :type df: pd.DataFrame
+    :param time_col: Column holding the event time; None uses the current time.
+    :type time_col: str, optional
+    :param host: hostname
+    :type host: str
+    :param source: source of data
+    :type source: str
+    :param sourcetype: sourcetype of data
+    :type sourcetype: str
+    :param client: HEC client to upload with.
+    :type client: SplunkHecClient
+    :param metrics: Columns exported as `metric_name:<column>` fields, defaults to None
+    :type metrics: list[str], optional
+    :param batch_rows: Rows encoded per batch, defaults to 10000
+    :type batch_rows: int, optional
+    :param chunk_kwargs: `chunk_size`/`max_payload_bytes` overrides; see `SplunkHecClient.chunk_encoded`.
+    :return: Delivery report for every chunk uploaded; chunks are numbered across batches.
+    :rtype: list[dict[str, Any]]
+    """
+    report: list[dict[str, Any]] = []
+    for encoded in iter_dataframe_hec(
+        df, time_col, host, source, sourcetype, metrics, batch_rows
+    ):
+        offset = len(report)
+        for entry in client.deliver(client.chunk_encoded(encoded, **chunk_kwargs)):
+            entry["chunk"] += offset
+            report.append(entry)
+    return report
+
+
+def _epoch_seconds(times: pd.Series) -> pd.Series:
+    """Convert a datetime column to epoch seconds; numeric columns are returned as is."""
+    if pd.api.types.is_datetime64_any_dtype(times):
+        # naive times are treated as UTC like `pd.Timestamp.timestamp()`
+        epoch = pd.Timestamp(0, tz="UTC") if times.dt.tz is not None else pd.Timestamp(0)
+        return (times - epoch) / pd.Timedelta(seconds=1)
+    return times
+
+
+def _json_values(values: pd.Series) -> list[str]:
+    """JSON encode a column into one string per row."""
+    encoded = values.to_json(orient="values", double_precision=6)
+    return encoded[1:-1].split(",") if len(values) else []
+
+
+def _json_lines(frame: pd.DataFrame) -> list[str]:
+    """JSON encode each row of a frame as an object in column order."""
+    if not len(frame.columns):
+        return ["{}"] * len(frame)
+    return frame.to_json(
+        orient="records", lines=True, date_format="iso", double_precision=15
+    ).splitlines()
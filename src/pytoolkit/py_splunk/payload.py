@@ -0,0 +1,106 @@
+"""Splunk HEC Payload Encoding."""
+
+import gzip
+import json
+from typing import Any, Iterable
+
+from pytoolkit.static import ENCODING
+
+try:
+    import orjson
+
+    JSON_ENCODER = "orjson"
+    _dumps = orjson.dumps
+except ImportError:
+    try:
+        import ujson
+
+        JSON_ENCODER = "ujson"
+
+        def _dumps(event: dict[str, Any]) -> bytes:
+            return ujson.dumps(event, escape_forward_slashes=False).encode(ENCODING)
+
+    except ImportError:
+        JSON_ENCODER = "json"
+
+        def _dumps(event: dict[str, Any]) -> bytes:
+            return json.dumps(event, separators=(",", ":")).encode(ENCODING)
+
+
+def encode_event(event: dict[str, Any]) -> bytes:
+    """
+    Serialize a single HEC event once so the bytes can be sized and sent as is.
+     Uses `orjson` or `ujson` when installed and the standard `json` module otherwise.
+
+    :param event: HEC event; see `splunk_hec_format`.
+    :type event: dict[str, Any]
+    :return: Compact JSON encoded event.
+    :rtype: bytes
+    """
+    try:
+        return _dumps(event)
+    except TypeError:
+        # the fast encoders reject some types the standard module accepts (e.g. integers wider than 64 bits)
+        return json.dumps(event, separators=(",", ":")).encode(ENCODING)
+
+
+def encode_events(events: Iterable[dict[str, Any]]) -> list[bytes]:
+    """
+    Serialize a list of HEC events.
+
+    :param events: HEC events.
+    :type events: Iterable[dict[str, Any]]
+    :return: Encoded events in the same order.
+    :rtype: list[bytes]
+    """
+    return [encode_event(event) for event in events]
+
+
+def chunk_by_size(encoded: list[bytes], max_bytes: int) -> list[list[bytes]]:
+    """
+    Pack encoded events into chunks whose request body stays within `max_bytes`.
+     An event larger than `max_bytes` is sent on its own since it cannot be split.
+
+    :param encoded: Encoded events; see `encode_events`.
+    :type encoded: list[bytes]
+    :param max_bytes: Target request body size, e.g. the HEC `max_content_length`.
+    :type max_bytes: int
+    :raises ValueError: `max_bytes` is less than 1.
+    :return: Chunks of encoded events.
+    :rtype: list[list[bytes]]
+    """
+    if max_bytes < 1:
+        raise ValueError(f"Invalid max_bytes {max_bytes} must be 1 or more")
+    chunks: list[list[bytes]] = []
+    current: list[bytes] = []
+    size: int = 0
+    for event in encoded:
+        # events are joined by a newline in the request body
+        event_size = len(event) + (1 if current else 0)
+        if current and size + event_size > max_bytes:
+            chunks.append(current)
+            current, size, event_size = [], 0, len(event)
+        current.append(event)
+        size += event_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def join_payload(
+    encoded: list[bytes], compress: bool = False, compresslevel: int = 6
+) -> bytes:
+    """
+    Build a HEC request body from encoded events.
+
+    :param encoded: Encoded events.
+    :type encoded: list[bytes]
+    :param compress: gzip the body; send with `Content-Encoding: gzip`, defaults to False
+    :type compress: bool, optional
+    :param compresslevel: gzip compression level 1 (fastest) to 9 (smallest), defaults to 6
+    :type compresslevel: int, optional
+    :return: Newline separated events.
+    :rtype: bytes
+    """
+    body = b"\n".join(encoded)
+    return gzip.compress(body, compresslevel=compresslevel) if compress else body
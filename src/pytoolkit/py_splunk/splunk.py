@@ -3,15 +3,20 @@
 
 from collections import OrderedDict
 import datetime
+import email.utils
 from typing import Any, Optional, Union
 import logging
+import time
 
 from dataclasses import dataclass
 
 import urllib3
 import requests
+from requests.adapters import HTTPAdapter
 
-from pytoolkit.static import SPLUNK_HEC_EVENTPATH
+from pytoolkit.decorate import retry_delays
+from pytoolkit.py_splunk.payload import chunk_by_size, encode_events, join_payload
+from pytoolkit.static import SPLUNK_HEC_ACKPATH, SPLUNK_HEC_EVENTPATH, SPLUNK_HEC_HEALTHPATH
 from pytoolkit.utilities import BaseMonitor, NONETYPE
 from pytoolkit.utils import chunk, reformat_exception
 
@@ -34,6 +39,20 @@ class SplunkHecHeader(BaseMonitor):
     upload: bool = True
     timeout: float = 15.0
     schema: str = "https"
+    channel: Optional[str] = NONETYPE
+
+
+@dataclass
+class HecRetryPolicy(BaseMonitor):
+    """Splunk Hec delivery retry settings; see `decorate.retry` for the backoff values."""
+
+    tries: int = 3
+    delay: float = 1.0
+    max_delay: Optional[float] = 30.0
+    backoff: float = 2.0
+    jitter: Union[float, tuple[float, float]] = 0
+    max_retry_time: float = 60.0
+    retry_status: tuple[int, ...] = (408, 429, 500, 502, 503, 504)
 
 
 def splunk_format(**kwargs: Any) -> str:
@@ -85,7 +104,369 @@ def splunk_hec_format(
     return hec_json
 
 
-def splunk_hec_upload(  # pylint: disable=too-many-arguments,too-many-locals
+class SplunkHecClient:
+    """
+    Reusable Splunk HEC client that keeps a pooled keep-alive session to the indexer.
+
+    Usage:
+        >>> header = SplunkHecHeader(splunk_server="splunk.example.com", token="xxxx")
+        >>> with SplunkHecClient(header, pool_maxsize=4) as client:
+        ...     resp_list = client.send(hec_data)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        header: SplunkHecHeader,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        chunk_size: int = 100,
+        max_payload_bytes: Optional[int] = None,
+        compress: bool = False,
+        compresslevel: int = 6,
+        retry: Optional[HecRetryPolicy] = None,
+        spool: Any = None,
+        log: Any = splunk_log,
+    ) -> None:
+        """
+        Create a HEC client from a `SplunkHecHeader`.
+
+        :param header: Splunk HEC connection settings.
+        :type header: SplunkHecHeader
+        :param pool_connections: Number of connection pools to cache, defaults to 1
+        :type pool_connections: int, optional
+        :param pool_maxsize: Maximum connections kept open per pool, defaults to 10
+        :type pool_maxsize: int, optional
+        :param pool_block: Block when the pool is exhausted instead of opening
+         throw-away connections, defaults to False
+        :type pool_block: bool, optional
+        :param keep_alive: Reuse connections between requests, defaults to True
+        :type keep_alive: bool, optional
+        :param chunk_size: Default number of events per request (0 will indicate all), defaults to 100
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Pack events by serialized size up to this many bytes per request
+         instead of by `chunk_size`, defaults to None
+        :type max_payload_bytes: int, optional
+        :param compress: gzip request bodies and send `Content-Encoding: gzip`, defaults to False
+        :type compress: bool, optional
+        :param compresslevel: gzip compression level 1 (fastest) to 9 (smallest), defaults to 6
+        :type compresslevel: int, optional
+        :param retry: Retry settings for failed chunks; `tries=1` disables retries,
+         defaults to `HecRetryPolicy()`
+        :type retry: HecRetryPolicy, optional
+        :param spool: Spool that keeps chunks still failing after retries; see `spool.HecSpool`,
+         defaults to None
+        :type spool: HecSpool, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        """
+        self.header = header
+        self.chunk_size = chunk_size
+        self.max_payload_bytes = max_payload_bytes
+        self.compress = compress
+        self.compresslevel = compresslevel
+        self.retry = retry if retry else HecRetryPolicy()
+        self.spool = spool
+        self.log = log
+        base_url = f"{header.schema}://{header.splunk_server}:{header.splunk_port}"
+        self.url = f"{base_url}/{SPLUNK_HEC_EVENTPATH}"
+        self.ack_url = f"{base_url}/{SPLUNK_HEC_ACKPATH}"
+        self.health_url = f"{base_url}/{SPLUNK_HEC_HEALTHPATH}"
+        # indexer acknowledgement requires a GUID channel; the token is kept as the default channel
+        self.channel: str = header.channel if header.channel is not NONETYPE else header.token  # type: ignore
+        if not header.verify:
+            log.error(
+                f'msg="SSL Verficiation is off recommended this be fixed"|verify={header.verify}'
+            )
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount(f"{header.schema}://", adapter)
+        self.session.verify = header.verify
+        self.session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "Authorization": f"Splunk {header.token}",
+                "X-Splunk-Request-Channel": self.channel,
+                "Connection": "keep-alive" if keep_alive else "close",
+            }
+        )
+        if compress:
+            self.session.headers["Content-Encoding"] = "gzip"
+
+    def __enter__(self) -> "SplunkHecClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        self.session.close()
+
+    def send(
+        self,
+        events: list[dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_payload_bytes: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Upload events to the HEC endpoint over the pooled session.
+
+        :param events: List of dictionary events; see `splunk_hec_format`.
+        :type events: list[dict[str, Any]]
+        :param chunk_size: Override the client chunk size for this call, defaults to None
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Override the client payload size for this call, defaults to None
+        :type max_payload_bytes: int, optional
+        :return: Delivery report with one entry per chunk; see `deliver`.
+        :rtype: list[dict[str, Any]]
+        """
+        return self.deliver(self.split(events, chunk_size, max_payload_bytes))
+
+    def split(
+        self,
+        events: list[dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_payload_bytes: Optional[int] = None,
+    ) -> list[list[bytes]]:
+        """
+        Split events into the chunks that `send` will upload.
+         Each event is serialized once and the encoded chunks are returned
+         so the same bytes become the request body.
+
+        :param events: List of dictionary events.
+        :type events: list[dict[str, Any]]
+        :param chunk_size: Override the client chunk size, defaults to None
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Override the client payload size, defaults to None
+        :type max_payload_bytes: int, optional
+        :return: Chunked encoded events.
+        :rtype: list[list[bytes]]
+        """
+        return self.chunk_encoded(encode_events(events), chunk_size, max_payload_bytes)
+
+    def chunk_encoded(
+        self,
+        encoded: list[bytes],
+        chunk_size: Optional[int] = None,
+        max_payload_bytes: Optional[int] = None,
+    ) -> list[list[bytes]]:
+        """
+        Chunk already encoded events the same way `split` does.
+
+        :param encoded: Encoded events; see `payload.encode_events`.
+        :type encoded: list[bytes]
+        :param chunk_size: Override the client chunk size, defaults to None
+        :type chunk_size: int, optional
+        :param max_payload_bytes: Override the client payload size, defaults to None
+        :type max_payload_bytes: int, optional
+        :return: Chunked encoded events.
+        :rtype: list[list[bytes]]
+        """
+        max_payload_bytes = (
+            self.max_payload_bytes if max_payload_bytes is None else max_payload_bytes
+        )
+        if max_payload_bytes:
+            return chunk_by_size(encoded, max_payload_bytes)
+        chunk_size = self.chunk_size if chunk_size is None else chunk_size
+        return chunk(encoded, chunk_size) if len(encoded) > chunk_size > 0 else [encoded]
+
+    def send_chunk(
+        self, payload: Union[list[dict[str, Any]], list[bytes]]
+    ) -> dict[str, Any]:
+        """
+        Deliver a single chunk, retrying it per the client retry policy.
+
+        :param payload: Events to send in one request; dictionary or encoded events.
+        :type payload: list[dict[str, Any]] | list[bytes]
+        :return: Delivery report entry; see `deliver`.
+        :rtype: dict[str, Any]
+        """
+        encoded: list[bytes] = (
+            payload  # type: ignore
+            if payload and isinstance(payload[0], bytes)
+            else encode_events(payload)  # type: ignore
+        )
+        return self.deliver([encoded])[0]
+
+    def health(self) -> bool:
+        """
+        Check the HEC health endpoint.
+
+        :return: True if the endpoint reports it is healthy.
+        :rtype: bool
+        """
+        try:
+            response = self.session.get(self.health_url, timeout=self.header.timeout)
+        except requests.RequestException as err:
+            error = reformat_exception(err)
+            self.log.error(
+                f'msg="splunk health check failed"|splunk_server={self.header.splunk_server}, {error=}'
+            )
+            return False
+        return response.status_code == 200
+
+    def query_acks(self, ack_ids: list[int]) -> dict[int, bool]:
+        """
+        Ask the indexer which `ackId`s on this client channel have been indexed, in one request.
+
+        :param ack_ids: `ackId`s returned by the event endpoint.
+        :type ack_ids: list[int]
+        :raises requests.HTTPError: Ack endpoint returned an error.
+        :return: ackId to acknowledged status.
+        :rtype: dict[int, bool]
+        """
+        response = self.session.post(
+            self.ack_url,
+            params={"channel": self.channel},
+            json={"acks": ack_ids},
+            timeout=self.header.timeout,
+            # ack queries are small; never gzip them
+            headers={"Content-Encoding": None},
+        )
+        response.raise_for_status()
+        return {int(ack_id): bool(status) for ack_id, status in response.json()["acks"].items()}
+
+    def is_retryable(self, entry: dict[str, Any]) -> bool:
+        """
+        Whether a failed delivery report entry is worth sending again.
+
+        :param entry: Delivery report entry.
+        :type entry: dict[str, Any]
+        :return: True for connection errors and retry policy status codes.
+        :rtype: bool
+        """
+        return not entry["delivered"] and (
+            not entry["status_code"] or entry["status_code"] in self.retry.retry_status
+        )
+
+    def deliver(
+        self, chunks: list[list[bytes]], spool_failed: bool = True
+    ) -> list[dict[str, Any]]:
+        """
+        Upload encoded chunks and resend only the chunks that failed with a retryable error.
+         Request bodies are built once and reused for every attempt. Waits follow the
+         retry policy backoff and honor `Retry-After` on 429/503 responses until
+         `max_retry_time` is used up.
+
+        :param chunks: Chunked encoded events; see `split`.
+        :type chunks: list[list[bytes]]
+        :param spool_failed: Append chunks that still fail with a retryable error
+         to the client spool, defaults to True
+        :type spool_failed: bool, optional
+        :return: One entry per chunk with `chunk`, `status_code` (0 if no response),
+         `payload_len`, `message`, `attempts`, `delivered` and `spooled`.
+        :rtype: list[dict[str, Any]]
+        """
+        policy = self.retry
+        bodies = [join_payload(item, self.compress, self.compresslevel) for item in chunks]
+        report: list[dict[str, Any]] = [{} for _ in chunks]
+        pending = list(range(len(chunks)))
+        delays = retry_delays(policy.delay, policy.max_delay, policy.backoff, policy.jitter)
+        deadline = time.monotonic() + policy.max_retry_time
+        attempt = 0
+        while pending:
+            attempt += 1
+            retry_after: float = 0
+            failed: list[int] = []
+            for idx in pending:
+                entry, wait = self._post(bodies[idx])
+                report[idx] = {
+                    "chunk": idx,
+                    **entry,
+                    "payload_len": len(chunks[idx]),
+                    "attempts": attempt,
+                    "spooled": False,
+                }
+                if self.is_retryable(entry):
+                    failed.append(idx)
+                    retry_after = max(retry_after, wait)
+            pending = failed
+            if not pending or attempt >= policy.tries > 0:
+                break
+            wait = max(next(delays), retry_after)
+            if time.monotonic() + wait > deadline:
+                break
+            self.log.warning(
+                f'msg="retrying failed splunk chunks"|chunks={len(pending)}, {attempt=}, retrying_in={wait}'
+            )
+            time.sleep(wait)
+        if self.spool is not None and spool_failed:
+            for idx in pending:
+                self.spool.append(chunks[idx])
+                report[idx]["spooled"] = True
+        return report
+
+    def _post(self, body: bytes) -> tuple[dict[str, Any], float]:
+        """Single upload attempt; returns the response entry and any `Retry-After` wait."""
+        try:
+            response = self.session.post(
+                self.url, data=body, timeout=self.header.timeout
+            )
+        except requests.RequestException as err:
+            error = reformat_exception(err)
+            self.log.error(
+                f'msg="Unable to upload datea to splunk server"|splunk_server={self.header.splunk_server}, {error=}'
+            )
+            return {"status_code": 0, "message": error, "delivered": False}, 0
+        message = _response_message(response)
+        self.log.info(
+            f'msg="uploaded splunk data response"|status_code={response.status_code}, response={message}'
+        )
+        try:
+            response.raise_for_status()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            error = reformat_exception(err)
+            self.log.error(
+                f'msg="Unable to upload datea to splunk server"|splunk_server={self.header.splunk_server}, {error=}'
+            )
+            wait = (
+                _retry_after(response.headers.get("Retry-After"))
+                if response.status_code in (429, 503)
+                else 0
+            )
+            return {
+                "status_code": response.status_code,
+                "message": message if message else "",
+                "delivered": False,
+            }, wait
+        return {
+            "status_code": response.status_code,
+            "message": message if message else "",
+            "delivered": True,
+        }, 0
+
+
+def _response_message(response: requests.Response) -> Any:
+    """Decode a HEC response body once; falls back to raw text if not JSON."""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def _retry_after(value: Optional[str]) -> float:
+    """Seconds to wait from a `Retry-After` header given in seconds or as an HTTP date."""
+    if not value:
+        return 0
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0
+    return max((retry_at - datetime.datetime.now(retry_at.tzinfo)).total_seconds(), 0)
+
+
+def splunk_hec_upload(  # pylint: disable=too-many-arguments
     server: str,
     token: str,
     hec_data: list[dict[str, Any]],
@@ -112,38 +493,12 @@ def splunk_hec_upload(  # pylint: disable=too-many-arguments,too-many-locals
      hec_data must be a list of json entries, defaults to 100 (0 will indicate all)
     :type chunk_size: int, optional
     """
-    if not verify:
-        log.error(f'msg="SSL Verficiation is off recommended this be fixed"|{verify=}')
-        urllib3.disable_warnings  # pylint: disable=pointless-statement
-    url = f"https://{server}:{port}/{SPLUNK_HEC_EVENTPATH}"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Splunk {token}",
-        "X-Splunk-Request-Channel": token,
-    }
-    chunk_data: list[list[Any]] = (
-        chunk(hec_data, chunk_size) if len(hec_data) > chunk_size > 0 else [hec_data]
+    header = SplunkHecHeader(
+        splunk_server=server,
+        token=token,
+        splunk_port=port,
+        verify=verify,
+        timeout=timeout,
     )
-    resp_list: list[dict[str, Any]] = []
-    for payload in chunk_data:
-        response = requests.post(
-            url, headers=headers, json=payload, verify=verify, timeout=timeout
-        )
-        splunk_log.info(
-            f'msg="uploaded splunk data response"|status_code={response.status_code}, response={response.json()}'
-        )
-        resp_list.append(
-            {
-                "status_code": response.status_code,
-                "payload_len": len(payload),
-                "message": response.json() if response.json() else "",
-            }
-        )
-        try:
-            response.raise_for_status()
-        except Exception as err:
-            error = reformat_exception(err)
-            splunk_log.error(
-                f'msg="Unable to upload datea to splunk server"|splunk_server={server}, {error=}'
-            )
-    return resp_list
+    with SplunkHecClient(header, chunk_size=chunk_size, log=log) as client:
+        return client.send(hec_data)
@@ -0,0 +1,303 @@
+# pylint: disable=logging-fstring-interpolation
+"""Durable Splunk HEC Spool."""
+
+import mmap
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from pytoolkit.files import set_location
+from pytoolkit.py_splunk.splunk import SplunkHecClient, splunk_log
+from pytoolkit.static import ENCODING
+
+SEGMENT_NAME = "segment-{:012d}.ndjson"
+RE_SEGMENT = re.compile(r"^segment-(\d{12})\.ndjson$")
+CURSOR_NAME = "cursor"
+
+
+class HecSpool:  # pylint: disable=too-many-instance-attributes
+    """
+    Disk backed spool for encoded HEC events that could not be delivered.
+
+    Events are appended to newline separated segment files that rotate at
+    `segment_bytes`; writes are fsync'd in batches. `replay` drains closed
+    segments in order through a memory map and removes them once delivered.
+    The oldest segments are dropped when the spool grows past `max_bytes`.
+
+    Usage:
+        >>> spool = HecSpool(location="var", extend_path="myapp/hec_spool")
+        >>> client = SplunkHecClient(header, spool=spool)
+        >>> client.send(hec_data)  # undelivered chunks are spooled
+        >>> spool.replay(client)  # once the indexer is back
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        location: str = "var",
+        extend_path: str = "pytoolkit/hec_spool",
+        mode: str = "restrictive",
+        segment_bytes: int = 16 * 1024 * 1024,
+        max_bytes: int = 1024 * 1024 * 1024,
+        fsync_every: int = 1000,
+        fsync_interval: float = 1.0,
+        log: Any = splunk_log,
+    ) -> None:
+        """
+        Open (or recover) a spool directory.
+
+        :param location: `home` or `var` base directory; see `files.set_location`, defaults to "var"
+        :type location: str, optional
+        :param extend_path: Spool directory under the base directory, defaults to "pytoolkit/hec_spool"
+        :type extend_path: str, optional
+        :param mode: Directory permissions; see `FILE_UMASK_PERMISSIONS`, defaults to "restrictive"
+        :type mode: str, optional
+        :param segment_bytes: Rotate to a new segment file after this size, defaults to 16MiB
+        :type segment_bytes: int, optional
+        :param max_bytes: Maximum disk usage before the oldest segments are dropped, defaults to 1GiB
+        :type max_bytes: int, optional
+        :param fsync_every: fsync after this many appended events, defaults to 1000
+        :type fsync_every: int, optional
+        :param fsync_interval: fsync at least this often in seconds while appending, defaults to 1.0
+        :type fsync_interval: float, optional
+        :param log: logger, defaults to splunk_log
+        :type log: Logger, optional
+        :raises ValueError: `segment_bytes` is larger than `max_bytes`.
+        """
+        if not 0 < segment_bytes <= max_bytes:
+            raise ValueError(f"Invalid segment_bytes {segment_bytes} must be between 1 and {max_bytes=}")
+        self.directory = Path(set_location(location, extend_path=extend_path, mode=mode))
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.log = log
+        self.dropped: int = 0
+        self._lock = threading.RLock()
+        self._replay_lock = threading.Lock()
+        self._sizes: dict[int, int] = {}
+        for path in self.directory.iterdir():
+            match = RE_SEGMENT.match(path.name)
+            if match:
+                self._sizes[int(match.group(1))] = path.stat().st_size
+        # never append to a segment left behind by a previous process
+        self._active: int = max(self._sizes, default=0) + 1
+        self._file: Any = None
+        self._unsynced: int = 0
+        self._last_sync: float = time.monotonic()
+
+    def __enter__(self) -> "HecSpool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Bytes currently used by spooled segments."""
+        return sum(self._sizes.values())
+
+    def segments(self) -> list[Path]:
+        """Segment files in replay order."""
+        return [self._segment_path(seq) for seq in sorted(self._sizes)]
+
+    def append(self, encoded: list[bytes]) -> None:
+        """
+        Append encoded events to the active segment.
+
+        :param encoded: Encoded events; see `payload.encode_events`.
+        :type encoded: list[bytes]
+        """
+        if not encoded:
+            return
+        data = b"".join(event + b"\n" for event in encoded)
+        with self._lock:
+            if self._file is None:
+                self._file = open(  # pylint: disable=consider-using-with
+                    self._segment_path(self._active), "ab"
+                )
+                self._sizes.setdefault(self._active, 0)
+            self._file.write(data)
+            self._sizes[self._active] += len(data)
+            self._unsynced += len(encoded)
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self.sync()
+            if self._sizes[self._active] >= self.segment_bytes:
+                self._rotate()
+            self._enforce_max_bytes()
+
+    def sync(self) -> None:
+        """Flush and fsync the active segment."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """fsync and close the active segment."""
+        with self._lock:
+            self._rotate()
+
+    def replay(self, client: SplunkHecClient, batch_events: int = 100) -> int:
+        """
+        Deliver spooled events in order; stops at the first batch that still fails.
+
+        :param client: HEC client to deliver through.
+        :type client: SplunkHecClient
+        :param batch_events: Events sent per request, defaults to 100
+        :type batch_events: int, optional
+        :return: Number of events delivered.
+        :rtype: int
+        """
+        delivered = 0
+        with self._replay_lock:
+            with self._lock:
+                self._rotate()
+                pending = sorted(self._sizes)
+            for seq in pending:
+                count, finished = self._replay_segment(client, seq, batch_events)
+                delivered += count
+                if not finished:
+                    break
+        if delivered:
+            self.log.info(f'msg="replayed spooled splunk events"|events={delivered}')
+        return delivered
+
+    def _replay_segment(
+        self, client: SplunkHecClient, seq: int, batch_events: int
+    ) -> tuple[int, bool]:
+        """Replay one closed segment from the saved cursor."""
+        path = self._segment_path(seq)
+        offset = self._read_cursor(seq)
+        delivered = 0
+        try:
+            with open(path, "rb") as fil:
+                if os.fstat(fil.fileno()).st_size > offset:
+                    with mmap.mmap(fil.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        while offset < len(mapped):
+                            batch, end = _read_batch(mapped, offset, batch_events)
+                            if end == offset:
+                                # torn final line from an interrupted write
+                                break
+                            if not batch:
+                                offset = end
+                                continue
+                            [entry] = client.deliver([batch], spool_failed=False)
+                            if not entry["delivered"] and client.is_retryable(entry):
+                                self._write_cursor(seq, offset)
+                                return delivered, False
+                            if not entry["delivered"]:
+                                self.log.error(
+                                    f'msg="dropping rejected spooled splunk events"|events={len(batch)}, '
+                                    f'status_code={entry["status_code"]}'
+                                )
+                            else:
+                                delivered += len(batch)
+                            offset = end
+                            self._write_cursor(seq, offset)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._sizes.pop(seq, None)
+            path.unlink(missing_ok=True)
+            self._cursor_path.unlink(missing_ok=True)
+        return delivered, True
+
+    def _rotate(self) -> None:
+        """Close the active segment so it can be replayed; the next append opens a new one."""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+        self._active += 1
+
+    def _enforce_max_bytes(self) -> None:
+        """Drop the oldest closed segments while over `max_bytes`."""
+        while self.size > self.max_bytes:
+            closed = [seq for seq in sorted(self._sizes) if seq != self._active]
+            if not closed:
+                return
+            seq = closed[0]
+            self._sizes.pop(seq)
+            self._segment_path(seq).unlink(missing_ok=True)
+            self.dropped += 1
+            self.log.error(
+                f'msg="spool over max_bytes dropped oldest segment"|segment={seq}, max_bytes={self.max_bytes}'
+            )
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / SEGMENT_NAME.format(seq)
+
+    @property
+    def _cursor_path(self) -> Path:
+        return self.directory / CURSOR_NAME
+
+    def _read_cursor(self, seq: int) -> int:
+        """Offset already delivered from segment `seq`."""
+        try:
+            cursor_seq, offset = self._cursor_path.read_text(encoding=ENCODING).split()
+        except (FileNotFoundError, ValueError):
+            return 0
+        return int(offset) if int(cursor_seq) == seq else 0
+
+    def _write_cursor(self, seq: int, offset: int) -> None:
+        tmp = self._cursor_path.with_suffix(".tmp")
+        tmp.write_text(f"{seq} {offset}", encoding=ENCODING)
+        os.replace(tmp, self._cursor_path)
+
+
+def _read_batch(mapped: mmap.mmap, offset: int, batch_events: int) -> tuple[list[bytes], int]:
+    """Read up to `batch_events` complete lines starting at `offset`."""
+    batch: list[bytes] = []
+    while len(batch) < batch_events:
+        end = mapped.find(b"\n", offset)
+        if end == -1:
+            break
+        if end > offset:
+            batch.append(mapped[offset:end])
+        offset = end + 1
+    return batch, offset
+
+
+class HecSpoolReplayer:
+    """
+    Background thread that replays a `HecSpool` every `interval` seconds.
+
+    Usage:
+        >>> replayer = HecSpoolReplayer(spool, client, interval=30)
+        >>> replayer.stop()
+    """
+
+    def __init__(
+        self,
+        spool: HecSpool,
+        client: SplunkHecClient,
+        interval: float = 30.0,
+        batch_events: int = 100,
+    ) -> None:
+        self.spool = spool
+        self.client = client
+        self.interval = interval
+        self.batch_events = batch_events
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="splunk-hec-replayer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop replaying; waits for an in-progress replay to finish."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.spool.replay(self.client, self.batch_events)
@@ -0,0 +1,361 @@
+"""Sanitize Sensitive Values."""
+
+from concurrent.futures import ProcessPoolExecutor
+import json
+from pathlib import Path
+import re
+import shutil
+from typing import IO, Any, Hashable, Iterable, Optional, Pattern, Union
+
+from pytoolkit.static import ENCODING, SANATIZE_KEYS
+
+MASK = "[MASKED]"
+# quoted values are masked whole; bare values end at whitespace or a delimiter
+TEXT_VALUE = r"""(?P<value>"[^"]*"|'[^']*'|[^\s,;|&"'}\]]+)"""
+
+
+class Sanitizer:  # pylint: disable=too-many-instance-attributes
+    """
+    Masks the values of sensitive keys at any depth of a nested structure.
+
+    Key names are matched case insensitively against a frozenset, an optional
+    combined regex and optional dotted path suffixes (e.g. `db.password`).
+    The keys to mask are decided once per dictionary shape (its key tuple, and its
+    path when suffixes are used) and cached, so repeated payloads only pay for
+    dictionary lookups. Dictionaries and lists are copied only when something
+    under them is masked unless `in_place` is set.
+
+    With `scrub_strings`, string values are also scrubbed of `key=value` pairs and
+    command line arguments (keys starting with `-`, e.g. `-p secret`) that match.
+
+    Usage:
+        >>> sanitizer = Sanitizer(patterns=[r"secret"], suffixes=["db.user"])
+        >>> sanitizer.sanitize({"db": {"user": "admin", "password": "welcome123"}, "api_secret": "x"})
+        {'db': {'user': '[MASKED]', 'password': '[MASKED]'}, 'api_secret': '[MASKED]'}
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        keys: Iterable[str] = SANATIZE_KEYS,
+        patterns: Optional[Iterable[Union[str, Pattern[str]]]] = None,
+        suffixes: Optional[Iterable[str]] = None,
+        mask: Any = MASK,
+        sep: str = ".",
+        cache_size: int = 4096,
+        scrub_strings: bool = False,
+        attached_flags: bool = False,
+    ) -> None:
+        """
+        Compile the matching rules.
+
+        :param keys: Key names to mask at any depth, defaults to SANATIZE_KEYS
+        :type keys: Iterable[str], optional
+        :param patterns: Regexes searched in key names, defaults to None
+        :type patterns: Iterable[str|Pattern], optional
+        :param suffixes: Dotted key paths to mask when a key path ends with them, defaults to None
+        :type suffixes: Iterable[str], optional
+        :param mask: Replacement value, defaults to "[MASKED]"
+        :type mask: Any, optional
+        :param sep: Seperator used by `suffixes`, defaults to "."
+        :type sep: str, optional
+        :param cache_size: Dictionary shapes kept in the plan cache, defaults to 4096
+        :type cache_size: int, optional
+        :param scrub_strings: Also mask matches of `sanitize_text` inside string values, defaults to False
+        :type scrub_strings: bool, optional
+        :param attached_flags: Also mask values attached to a flag in text (`-psecret`), defaults to False
+            flag values are otherwise only masked after whitespace or `=` (`-p secret`, `-p=secret`)
+        :type attached_flags: bool, optional
+        """
+        keys = list(keys)
+        self.keys: frozenset[str] = frozenset(key.lower() for key in keys)
+        patterns = [
+            pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+            for pattern in (patterns if patterns else [])
+        ]
+        self.pattern: Optional[Pattern[str]] = (
+            re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+            if patterns
+            else None
+        )
+        self.suffixes: tuple[str, ...] = tuple(
+            suffix.lower() for suffix in (suffixes if suffixes else [])
+        )
+        self.mask = mask
+        self.sep = sep
+        self.cache_size = cache_size
+        self.scrub_strings = scrub_strings
+        self._plans: dict[Hashable, frozenset[Hashable]] = {}
+        # command line flags are case sensitive (`-p` and `-P` differ); key names are not
+        flags = sorted({key for key in keys if key.startswith("-")}, key=len, reverse=True)
+        names = sorted({key for key in keys if not key.startswith("-")}, key=len, reverse=True)
+        leads = []
+        if names:
+            leads.append(
+                r"(?i:\b(?:" + "|".join(map(re.escape, names)) + r")\b[\"']?\s*[=:]\s*)"
+            )
+        if flags:
+            # the separator is required by default so words like `-port` or `-pcf` are left alone
+            separator = r"(?:=|\s+)?" if attached_flags else r"(?:=|\s+)"
+            leads.append(r"(?<![\w-])(?:" + "|".join(map(re.escape, flags)) + r")" + separator)
+        self.text_pattern: Optional[Pattern[str]] = (
+            re.compile(f"(?P<lead>{'|'.join(leads)}){TEXT_VALUE}") if leads else None
+        )
+
+    def __call__(self, data: Any, in_place: bool = False) -> Any:
+        return self.sanitize(data, in_place)
+
+    def sanitize(self, data: Any, in_place: bool = False) -> Any:
+        """
+        Mask sensitive values in a dictionary, list or nested combination of both.
+
+        :param data: Data to sanitize.
+        :type data: Any
+        :param in_place: Modify `data` instead of copying what changes, defaults to False
+        :type in_place: bool, optional
+        :return: `data` when nothing was masked or `in_place` is set; otherwise a copy
+         sharing every unchanged dictionary and list with `data`.
+        :rtype: Any
+        """
+        return self._walk(data, (), in_place)
+
+    def sanitize_text(self, text: str) -> str:
+        """
+        Mask `key=value`, `key: value` and `-p secret` style secrets in free text.
+
+        :param text: Log line or string value.
+        :type text: str
+        :return: `text` itself when nothing matched, otherwise the masked text.
+        :rtype: str
+        """
+        if self.text_pattern is None:
+            return text
+        masked, count = self.text_pattern.subn(self._mask_text, text)
+        return masked if count else text
+
+    def sanitize_line(self, line: bytes) -> bytes:
+        """
+        Sanitize one NDJSON or log line; lines that are not JSON are treated as text.
+
+        :param line: Encoded line with or without its line ending.
+        :type line: bytes
+        :return: `line` itself when nothing matched, otherwise the masked line with the same ending.
+        :rtype: bytes
+        """
+        body = line.rstrip(b"\r\n")
+        ending = line[len(body) :]
+        stripped = body.lstrip()
+        if stripped[:1] in (b"{", b"["):
+            try:
+                data = json.loads(body)
+            except ValueError:
+                pass
+            else:
+                sanitized = self.sanitize(data)
+                if sanitized is data:
+                    return line
+                return (
+                    json.dumps(sanitized, ensure_ascii=False, separators=(",", ":")).encode(ENCODING)
+                    + ending
+                )
+        text = body.decode(ENCODING, errors="surrogateescape")
+        masked = self.sanitize_text(text)
+        if masked is text:
+            return line
+        return masked.encode(ENCODING, errors="surrogateescape") + ending
+
+    def is_sensitive(self, key: Hashable, path: tuple[Hashable, ...] = ()) -> bool:
+        """
+        Whether a key is masked.
+
+        :param key: Key name.
+        :type key: Hashable
+        :param path: Parent keys; only used by `suffixes`, defaults to ()
+        :type path: tuple[Hashable, ...], optional
+        :return: True if the value of the key is masked.
+        :rtype: bool
+        """
+        if not isinstance(key, str):
+            return False
+        name = key.lower()
+        if name in self.keys:
+            return True
+        if self.pattern is not None and self.pattern.search(key):
+            return True
+        if self.suffixes:
+            dotted = self.sep.join([*(str(parent) for parent in path), name]).lower()
+            return any(
+                dotted == suffix or dotted.endswith(self.sep + suffix)
+                for suffix in self.suffixes
+            )
+        return False
+
+    def _plan(self, keys: tuple[Hashable, ...], path: tuple[Hashable, ...]) -> frozenset[Hashable]:
+        """Keys to mask for a dictionary shape; cached per shape."""
+        shape = (path, keys) if self.suffixes else keys
+        plan = self._plans.get(shape)
+        if plan is None:
+            plan = frozenset(key for key in keys if self.is_sensitive(key, path))
+            if len(self._plans) >= self.cache_size:
+                self._plans.clear()
+            self._plans[shape] = plan
+        return plan
+
+    def _mask_text(self, match: "re.Match[str]") -> str:
+        value = match.group("value")
+        quote = value[0] if value[0] in "\"'" else ""
+        return f"{match.group('lead')}{quote}{self.mask}{quote}"
+
+    def _walk(self, value: Any, path: tuple[Hashable, ...], in_place: bool) -> Any:
+        """Sanitize one level; returns `value` itself when nothing under it changed."""
+        if isinstance(value, dict):
+            masked = self._plan(tuple(value), path)
+            out: Optional[dict[Hashable, Any]] = None
+            for key, item in value.items():
+                if key in masked:
+                    new = self.mask
+                elif isinstance(item, (dict, list)) or (self.scrub_strings and isinstance(item, str)):
+                    new = self._walk(item, path + (key,) if self.suffixes else path, in_place)
+                else:
+                    continue
+                if new is not item:
+                    if out is None:
+                        out = value if in_place else dict(value)
+                    out[key] = new
+            return value if out is None else out
+        if isinstance(value, list):
+            items: Optional[list[Any]] = None
+            for idx, item in enumerate(value):
+                if not (
+                    isinstance(item, (dict, list))
+                    or (self.scrub_strings and isinstance(item, str))
+                ):
+                    continue
+                new = self._walk(item, path, in_place)
+                if new is not item:
+                    if items is None:
+                        items = value if in_place else list(value)
+                    items[idx] = new
+            return value if items is None else items
+        if self.scrub_strings and isinstance(value, str):
+            return self.sanitize_text(value)
+        return value
+
+
+SANITIZER = Sanitizer()
+
+
+def sanitize_stream(
+    src: IO[bytes], dst: IO[bytes], sanitizer: Optional[Sanitizer] = None
+) -> int:
+    """
+    Sanitize an NDJSON or log stream line by line; memory use is bound by the longest line.
+
+    :param src: Binary stream to read, e.g. an open file or `sys.stdin.buffer`.
+    :type src: IO[bytes]
+    :param dst: Binary stream the sanitized lines are written to as they are read.
+    :type dst: IO[bytes]
+    :param sanitizer: Masking rules, defaults to `SANATIZE_KEYS` with `scrub_strings`
+    :type sanitizer: Sanitizer, optional
+    :return: Number of lines written.
+    :rtype: int
+    """
+    sanitizer = sanitizer if sanitizer else STREAM_SANITIZER
+    count = 0
+    for line in src:
+        dst.write(sanitizer.sanitize_line(line))
+        count += 1
+    return count
+
+
+def sanitize_file(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    sanitizer: Optional[Sanitizer] = None,
+    processes: int = 1,
+    chunk_bytes: int = 64 * 1024 * 1024,
+) -> int:
+    """
+    Sanitize an NDJSON or log file into `dst`.
+     With more than one process the file is split into line aligned byte ranges
+     that are sanitized in parallel and joined in order.
+
+    :param src: File to read.
+    :type src: str|Path
+    :param dst: File to write; replaced if it exists.
+    :type dst: str|Path
+    :param sanitizer: Masking rules, defaults to `SANATIZE_KEYS` with `scrub_strings`
+    :type sanitizer: Sanitizer, optional
+    :param processes: Worker processes, defaults to 1
+    :type processes: int, optional
+    :param chunk_bytes: Target size of each byte range when using processes, defaults to 64MiB
+    :type chunk_bytes: int, optional
+    :return: Number of lines written.
+    :rtype: int
+    """
+    sanitizer = sanitizer if sanitizer else STREAM_SANITIZER
+    src, dst = Path(src), Path(dst)
+    if processes <= 1:
+        with open(src, "rb") as reader, open(dst, "wb") as writer:
+            return sanitize_stream(reader, writer, sanitizer)
+    ranges = _line_ranges(src, max(processes, -(-src.stat().st_size // chunk_bytes)))
+    parts = [dst.with_name(f"{dst.name}.part{idx}") for idx in range(len(ranges))]
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            counts = list(
+                executor.map(
+                    _sanitize_range,
+                    [src] * len(ranges),
+                    parts,
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    [sanitizer] * len(ranges),
+                )
+            )
+        with open(dst, "wb") as writer:
+            for part in parts:
+                with open(part, "rb") as reader:
+                    shutil.copyfileobj(reader, writer)
+    finally:
+        for part in parts:
+            part.unlink(missing_ok=True)
+    return sum(counts)
+
+
+def _line_ranges(path: Path, parts: int) -> list[tuple[int, int]]:
+    """Split a file into at most `parts` byte ranges that start and end on line boundaries."""
+    size = path.stat().st_size
+    bounds = [0]
+    with open(path, "rb") as fil:
+        for idx in range(1, parts):
+            target = max(size * idx // parts, bounds[-1])
+            if target >= size:
+                break
+            fil.seek(target)
+            if target:
+                # finish the line the target landed in
+                fil.seek(target - 1)
+                fil.readline()
+            bounds.append(fil.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _sanitize_range(
+    src: Path, dst: Path, start: int, end: int, sanitizer: Sanitizer
+) -> int:
+    """Sanitize the lines in `[start, end)` of `src` into `dst`."""
+    count = 0
+    with open(src, "rb") as reader, open(dst, "wb") as writer:
+        reader.seek(start)
+        position = start
+        while position < end:
+            line = reader.readline()
+            if not line:
+                break
+            position += len(line)
+            writer.write(sanitizer.sanitize_line(line))
+            count += 1
+    return count
+
+
+STREAM_SANITIZER = Sanitizer(scrub_strings=True)
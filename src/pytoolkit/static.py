@@ -69,3 +69,5 @@ NO_AIRPORTDATA = {
     "lid": None,
 }
 SPLUNK_HEC_EVENTPATH = "services/collector/event"
+SPLUNK_HEC_ACKPATH = "services/collector/ack"
+SPLUNK_HEC_HEALTHPATH = "services/collector/health"
@@ -1,20 +1,32 @@
 # pylint: disable=line-too-long
 """Package Supplied Utilities."""
 
-from typing import Any, Callable, Generator, Hashable, List, Union
+import re
+import sys
+import types
+import typing
+from typing import Any, Callable, Generator, Hashable, Iterable, List, Pattern, Union
 from collections.abc import MutableMapping
 
 from pathlib import Path
-from dataclasses import dataclass, fields, field, is_dataclass
-import pandas as pd
+from dataclasses import MISSING, dataclass, fields, field, is_dataclass
 
 from pytoolkit.static import NONETYPE
 
+# `X | None` annotations (Python 3.10+) have their own origin type
+UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+_MONITOR_FIELDS: dict[type, frozenset[str]] = {}
+_MONITOR_CONSTRUCTORS: dict[type, Callable[[dict[str, Any]], Any]] = {}
+_MONITOR_SLOTS: dict[type, tuple[str, ...]] = {}
+
 
 @dataclass
 class BaseMonitor:
     """Base Dataclass Methods."""
 
+    # empty so `SlottedMonitor` subclasses can drop the instance `__dict__`
+    __slots__ = ()
+
     @classmethod
     def create_from_dict(cls, _dict: dict[str, Any]):
         """
@@ -26,8 +38,8 @@ class BaseMonitor:
         :return: Dataclass
         :rtype: :dataclass: DataModel
         """
-        class_fields: set[str] = {f.name for f in fields(cls)}
-        return cls(**{k: v for k, v in _dict.items() if k in class_fields})
+        create = _MONITOR_CONSTRUCTORS.get(cls)
+        return (create if create else cls.monitor_constructor())(_dict)
 
     @classmethod
     def create_from_kwargs(cls, **kwargs: Any):
@@ -40,8 +52,49 @@ class BaseMonitor:
         :return: Dataclass
         :rtype: :dataclass: DataModel
         """
-        class_fields: set[str] = {f.name for f in fields(cls)}
-        return cls(**{k: v for k, v in kwargs.items() if k in class_fields})
+        create = _MONITOR_CONSTRUCTORS.get(cls)
+        return (create if create else cls.monitor_constructor())(kwargs)
+
+    @classmethod
+    def create_many(cls, records: Iterable[dict[str, Any]]) -> list[Any]:
+        """
+        Class method that returns a dataclass per dictionary and strips invalid params.
+
+        :param records: Dictionaries of Values
+        :type records: Iterable[dict[str, Any]]
+        :return: Dataclasses in the same order.
+        :rtype: list[:dataclass: DataModel]
+        """
+        create = cls.monitor_constructor()
+        return [create(record) for record in records]
+
+    @classmethod
+    def monitor_fields(cls) -> frozenset[str]:
+        """
+        Names of the fields accepted by `create_from_dict`; cached per class.
+
+        :return: Init field names.
+        :rtype: frozenset[str]
+        """
+        names = _MONITOR_FIELDS.get(cls)
+        if names is None:
+            names = _MONITOR_FIELDS[cls] = frozenset(f.name for f in fields(cls) if f.init)
+        return names
+
+    @classmethod
+    def monitor_constructor(cls) -> Callable[[dict[str, Any]], Any]:
+        """
+        Constructor specialized for this class that picks the field values
+         out of a dictionary; generated at first use and cached per class.
+
+        :return: Function taking a dictionary and returning the dataclass.
+        :rtype: Callable[[dict[str, Any]], :dataclass: DataModel]
+        """
+        # keyed by the exact class so subclasses never reuse the parent constructor
+        create = _MONITOR_CONSTRUCTORS.get(cls)
+        if create is None:
+            create = _MONITOR_CONSTRUCTORS[cls] = _monitor_constructor(cls, cls.monitor_fields())
+        return create
 
     def to_dict(self, extend: bool = True) -> dict[str, Any]:
         """
@@ -57,29 +110,165 @@ class BaseMonitor:
         return {k: v for k, v in self.__dict__.items() if v is not NONETYPE}
 
 
-def _flatten_dict_gen(
-    _d: MutableMapping[str, Any],
-    parent_key: str,
-    sep: str,
-    extended_label: bool,
-    skip_item: list[str],
-) -> Generator[tuple[str, Any], Any, None]:
-    for k, v in _d.items():
-        new_key: str = k
-        if extended_label:
-            new_key: str = (
-                parent_key + sep + k if (parent_key and k not in skip_item) else k
-            )  # type: ignore
-        if isinstance(v, MutableMapping):
-            yield from flatten_dict(
-                v,  # type: ignore
-                new_key,
-                extended_label=extended_label,
-                skip_item=skip_item,
-                sep=sep,
-            ).items()
+@dataclass
+class SlottedMonitor(BaseMonitor):
+    """
+    Base Dataclass Methods for subclasses declared with `slotted_dataclass`.
+     Instances store fields in `__slots__` instead of a `__dict__`, which roughly
+     halves the memory of large record sets.
+
+    Usage:
+        >>> @slotted_dataclass
+        ... class Sample(SlottedMonitor):
+        ...     host: str
+        ...     site: Optional[str] = NONETYPE
+    """
+
+    __slots__ = ()
+
+    def to_dict(self, extend: bool = True) -> dict[str, Any]:
+        """
+        Returns dataclass as dictionary.
+
+        :param extend: Extends the dataclass that have a value `NONETYPE`.
+        :type bool: Optional True
+        :return: dataclass dictionary
+        :rtype: dict[str, Any]
+        """
+        names = _MONITOR_SLOTS.get(type(self))
+        if names is None:
+            names = _MONITOR_SLOTS[type(self)] = tuple(f.name for f in fields(self))
+        values = {k: getattr(self, k) for k in names}
+        if not extend:
+            return values
+        return {k: v for k, v in values.items() if v is not NONETYPE}
+
+
+def slotted_dataclass(cls: Union[type, None] = None, **kwargs: Any) -> Any:
+    """
+    Dataclass decorator that stores the fields in `__slots__`; used with `SlottedMonitor`.
+     Equivalent to `dataclass(slots=True)` on Python 3.10+.
+
+    :param cls: Class to decorate; omitted when called with dataclass options.
+    :type cls: type, optional
+    :param kwargs: `dataclasses.dataclass` options.
+    :return: Slotted dataclass or decorator.
+    :rtype: type
+    """
+
+    def wrap(cls: type) -> type:
+        cls = dataclass(cls, **kwargs)  # type: ignore
+        inherited = {
+            slot for base in cls.__mro__[1:] for slot in getattr(base, "__slots__", ())
+        }
+        namespace = dict(cls.__dict__)
+        names = tuple(f.name for f in fields(cls))
+        namespace["__slots__"] = tuple(name for name in names if name not in inherited)
+        # defaults live in the generated __init__; class attributes would shadow the slots
+        for name in names:
+            namespace.pop(name, None)
+        namespace.pop("__dict__", None)
+        namespace.pop("__weakref__", None)
+        slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+        slotted.__qualname__ = cls.__qualname__
+        # zero argument super() in methods refers to the class through a `__class__` cell
+        for member in namespace.values():
+            if isinstance(member, (classmethod, staticmethod)):
+                member = member.__func__
+            if isinstance(member, property):
+                functions = [member.fget, member.fset, member.fdel]
+            else:
+                functions = [member]
+            for func in functions:
+                _rebind_class_cell(func, cls, slotted)
+        return slotted
+
+    return wrap if cls is None else wrap(cls)
+
+
+def _rebind_class_cell(func: Any, old: type, new: type) -> None:
+    """Point the `__class__` closure cell of a function at the rebuilt class."""
+    func = getattr(func, "__wrapped__", func)
+    if not isinstance(func, types.FunctionType) or "__class__" not in func.__code__.co_freevars:
+        return
+    cell = func.__closure__[func.__code__.co_freevars.index("__class__")]  # type: ignore
+    if cell.cell_contents is old:
+        cell.cell_contents = new
+
+
+def _monitor_constructor(cls: type, names: frozenset[str]) -> Callable[[dict[str, Any]], Any]:
+    """Generate a constructor that reads each init field from a dictionary."""
+    namespace: dict[str, Any] = {"__cls": cls}
+
+    def fallback(_dict: dict[str, Any]) -> Any:
+        # a required field is missing; let the dataclass raise its usual TypeError
+        return cls(**{k: v for k, v in _dict.items() if k in names})
+
+    namespace["__fallback"] = fallback
+    required: list[str] = []
+    arguments: list[str] = []
+    for idx, fld in enumerate(f for f in fields(cls) if f.init):
+        if fld.default is not MISSING:
+            namespace[f"__default{idx}"] = fld.default
+            arguments.append(f"{fld.name}=__data.get({fld.name!r}, __default{idx})")
+        elif fld.default_factory is not MISSING:
+            namespace[f"__factory{idx}"] = fld.default_factory
+            arguments.append(
+                f"{fld.name}=__data[{fld.name!r}] if {fld.name!r} in __data else __factory{idx}()"
+            )
         else:
+            required.append(f"        __value{idx} = __data[{fld.name!r}]")
+            arguments.append(f"{fld.name}=__value{idx}")
+    lines = ["def __create(__data):"]
+    if required:
+        lines += ["    try:", *required, "    except KeyError:", "        return __fallback(__data)"]
+    lines.append(f"    return __cls({', '.join(arguments)})")
+    exec("\n".join(lines), namespace)  # pylint: disable=exec-used
+    create = namespace["__create"]
+    create.__qualname__ = f"{cls.__qualname__}.create_from_dict"
+    return create
+
+
+def iter_flatten(
+    _dict: MutableMapping[str, Any],
+    parent_key: str = "",
+    sep: str = ".",
+    extended_label: bool = True,
+    skip_item: Union[list[str], None] = None,
+) -> Generator[tuple[str, Any], None, None]:
+    """
+    Lazily yield the `(key, value)` pairs of a nested dictionary in depth first order.
+     Walks an explicit stack so deep nesting does not hit the recursion limit;
+     a key repeated by the nesting is yielded each time it is found.
+
+    :param _dict: Dictionary
+    :type _dict: MutableMapping[str,Any]
+    :param parent_key: Top Level Key, defaults to ""
+    :type parent_key: str, optional
+    :param sep: Seperator, defaults to "."
+    :type sep: str, optional
+    :param extended_label: Appends the hierarchy into the name of the key, defaults to True
+    :type extended_label: bool, optional
+    :param skip_item: List of Keys to ignore and flatten without the parent, defaults to []
+    :type skip_item: list, optional
+    :yield: Flattened key and value.
+    :rtype: tuple[str, Any]
+    """
+    skip_item = skip_item if skip_item else [""]
+    stack: list[tuple[str, Any]] = [(parent_key, iter(_dict.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key: str = k
+            if extended_label and prefix and k not in skip_item:
+                new_key = prefix + sep + k
+            if isinstance(v, MutableMapping):
+                # descend now; the parent iterator resumes once the child is exhausted
+                stack.append((new_key, iter(v.items())))
+                break
             yield new_key, v
+        else:
+            stack.pop()
 
 
 def flatten_dict(
@@ -106,8 +295,7 @@ def flatten_dict(
     :return: Flattened Dictionary
     :rtype: dict[str,Any]
     """
-    skip_item = skip_item if skip_item else [""]
-    return dict(_flatten_dict_gen(_dict, parent_key, sep, extended_label, skip_item))
+    return dict(iter_flatten(_dict, parent_key, sep, extended_label, skip_item))
 
 
 def flatten_dictionary(
@@ -123,19 +311,66 @@ def flatten_dictionary(
     :return: Flattened Dictionary.
     :rtype: MutableMapping
     """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
     [flat_dict] = pd.json_normalize(_dict, sep=sep).to_dict(  # type: ignore
         orient="records"
     )  # type: ignore
     return flat_dict
 
 
-def _nest_dict_rec(key: str, value: Any, sep: str, out: dict[str, Any]) -> None:
-    """Maniplates dictionary into a nested dictionary based on seperator."""
-    key, *rest = key.split(sep, 1)
-    if rest:
-        _nest_dict_rec(rest[0], value, sep, out.setdefault(key, {}))
-    else:
-        out[key] = value
+def flatten_json(
+    _dict: MutableMapping[Any, Any], sep: str = "."
+) -> dict[Hashable, Any]:
+    """
+    Flatten a dictionary into the same keys as `flatten_dictionary` without pandas.
+     Top level values that are not dictionaries come first, followed by the
+     nested dictionaries flattened depth first; lists are kept as values and
+     empty dictionaries are dropped. Values are returned as is instead of being
+     converted by a DataFrame.
+
+    :param _dict: Dictionary
+    :type _dict: MutableMapping
+    :param sep: Adds seperator to Key, defaults to '.'
+    :type sep: str, optional
+    :return: Flattened Dictionary.
+    :rtype: dict[Hashable, Any]
+    """
+    flat: dict[Hashable, Any] = {}
+    stack: list[tuple[str, Any]] = []
+    for key, value in _dict.items():
+        if isinstance(value, dict):
+            stack.append((str(key), value))
+        else:
+            flat[key] = value
+    # pop in original order; nested items are pushed on top so they expand depth first
+    stack.reverse()
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(
+                (f"{key}{sep}{child}", child_value)
+                for child, child_value in reversed(value.items())
+            )
+        else:
+            flat[key] = value
+    return flat
+
+
+def flatten_records(
+    records: Iterable[MutableMapping[Any, Any]], sep: str = "."
+) -> list[dict[Hashable, Any]]:
+    """
+    Flatten many dictionaries; see `flatten_json`.
+
+    :param records: Dictionaries to flatten.
+    :type records: Iterable[MutableMapping]
+    :param sep: Adds seperator to Key, defaults to '.'
+    :type sep: str, optional
+    :return: Flattened Dictionaries in the same order.
+    :rtype: list[dict[Hashable, Any]]
+    """
+    return [flatten_json(record, sep) for record in records]
 
 
 def nested_dict(_dict: MutableMapping[str, Any], sep: str = ".") -> dict[str, Any]:
@@ -152,7 +387,11 @@ def nested_dict(_dict: MutableMapping[str, Any], sep: str = ".") -> dict[str, An
     # TODO: fix the nested structure add abiltiy to read in a csv or XCEL to help maniplate proper csv human readable datastructures
     result: dict[str, Any] = {}
     for k, v in _dict.items():
-        _nest_dict_rec(k, v, sep, result)
+        *parents, key = k.split(sep)
+        out = result
+        for parent in parents:
+            out = out.setdefault(parent, {})
+        out[key] = v
     return result
 
 
@@ -188,42 +427,235 @@ def set_bool(value: Union[str, bool], default: bool = False) -> Union[str, bool]
 
 
 def extract_matches(
-    iterable: Union[list[Any], None], condition: Callable[[list[Any]], Any]
+    iterable: Union[list[Any], Any, None],
+    condition: Union[Callable[[Any], Any], None] = None,
+    patterns: Union[Iterable[str], Pattern[str], None] = None,
+    literal: bool = False,
+    flags: int = 0,
 ) -> Matches:
     """
     Returns two lists; one that matches the condition and other that does not.
-     Use the condition variable to send callable functions used in a regular expression match.
-
-    :param iterable: Lists of Strings.
-    :type iterable: Union[list[Any], None]
-    :param condition: Callable function or lambda function.
-    :type condition: Callable[[list[Any]], Any]
+     Use the condition variable to send callable functions used in a regular expression match,
+     or `patterns` to search each string with one combined regular expression.
+     Each item is evaluated once. A pandas Series is partitioned with `Series.str.contains`
+     and the matches are returned as Series.
+
+    :param iterable: Lists of Strings or a pandas Series.
+    :type iterable: Union[list[Any], pd.Series, None]
+    :param condition: Callable function or lambda function returning a list of match results.
+    :type condition: Callable[[Any], Any], optional
+    :param patterns: Regular expressions (or literals) where any match counts; see `compile_patterns`.
+    :type patterns: Union[Iterable[str], Pattern[str]], optional
+    :param literal: Treat `patterns` as literal strings, defaults to False
+    :type literal: bool, optional
+    :param flags: `re` flags used to compile `patterns`, defaults to 0
+    :type flags: int, optional
+    :raises ValueError: Neither or both of `condition` and `patterns` are given.
     :return: matches
     :rtype: Matches
     """
+    if (condition is None) == (patterns is None):
+        raise ValueError("Invalid arguments use either condition or patterns")
+    pattern = compile_patterns(patterns, literal, flags) if patterns is not None else None
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(iterable, pd.Series):
+        if pattern is not None:
+            mask = iterable.str.contains(pattern, regex=True, na=False)
+        else:
+            mask = iterable.map(lambda item: any(condition(item))).astype(bool)  # type: ignore
+        return Matches(matches=iterable[mask], no_match=iterable[~mask])
     res = Matches([], [])
     if not iterable:
         return res
-    return Matches(
-        matches=[item for item in iterable if any(condition(item))],
-        no_match=[item for item in iterable if not any(condition(item))],
-    )
+    matches, no_match = res.matches.append, res.no_match.append
+    if pattern is not None:
+        search = pattern.search
+        for item in iterable:
+            (matches if isinstance(item, str) and search(item) else no_match)(item)
+    else:
+        for item in iterable:
+            (matches if any(condition(item)) else no_match)(item)  # type: ignore
+    return res
+
+
+def compile_patterns(
+    patterns: Union[Iterable[str], Pattern[str]], literal: bool = False, flags: int = 0
+) -> Pattern[str]:
+    """
+    Combine several patterns into one regular expression so each string is scanned once.
+
+    :param patterns: Regular expressions or literal strings; a compiled pattern is returned as is.
+    :type patterns: Union[Iterable[str], Pattern[str]]
+    :param literal: Escape the patterns and try longer literals first, defaults to False
+    :type literal: bool, optional
+    :param flags: `re` flags, defaults to 0
+    :type flags: int, optional
+    :raises ValueError: No patterns.
+    :return: Combined pattern matching when any of the patterns match.
+    :rtype: Pattern[str]
+    """
+    if isinstance(patterns, re.Pattern):
+        return patterns
+    patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+    if not patterns:
+        raise ValueError("At least one pattern is required")
+    if literal:
+        patterns = [re.escape(pattern) for pattern in sorted(set(patterns), key=len, reverse=True)]
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
 
 
 def nested_dataclass(*args, **kwargs):
+    """
+    Dataclass decorator that converts dictionaries into the dataclasses named by the
+     field annotations, including `list`, `tuple`, `dict` values and `Optional` fields
+     of dataclasses at any depth. The conversion plan is compiled once per class and
+     `from_dicts` builds many instances at once.
+
+    Usage:
+        >>> @nested_dataclass
+        ... class Site:
+        ...     devices: list[Device]
+        ...     primary: Optional[Device] = None
+        >>> sites = Site.from_dicts(api_response["sites"])
+    """
+
     def wrapper(cls):
         cls = dataclass(cls, **kwargs)
         original_init = cls.__init__
+        init_names = [f.name for f in fields(cls) if f.init]
+        keyword_plan: dict[str, Callable[[Any], Any]] = {}
+        positional_plan: list[tuple[int, Callable[[Any], Any]]] = []
+        compiled = False
+
+        def compile_plan(final: bool) -> None:
+            nonlocal compiled
+            plan, complete = _conversion_plan(cls)
+            keyword_plan.clear()
+            keyword_plan.update(plan)
+            positional_plan[:] = [
+                (idx, keyword_plan[name])
+                for idx, name in enumerate(init_names)
+                if name in keyword_plan
+            ]
+            compiled = complete or final
 
         def __init__(self, *args, **kwargs):
-            for name, value in kwargs.items():
-                field_type = cls.__annotations__.get(name, None)
-                if is_dataclass(field_type) and isinstance(value, dict):
-                    new_obj = field_type(**value)
-                    kwargs[name] = new_obj
+            if not compiled:
+                compile_plan(final=True)
+            if args:
+                args = list(args)
+                for idx, convert in positional_plan:
+                    if idx < len(args):
+                        args[idx] = convert(args[idx])
+            for name, convert in keyword_plan.items():
+                if name in kwargs:
+                    kwargs[name] = convert(kwargs[name])
             original_init(self, *args, **kwargs)
 
+        def from_dicts(klass, records: Iterable[dict[str, Any]]) -> list[Any]:
+            """Build an instance per dictionary."""
+            return [klass(**record) for record in records]
+
+        # forward references to classes defined later are resolved again on first use;
+        # names that are still undefined then (e.g. `TYPE_CHECKING` imports) are not converted
+        compile_plan(final=False)
         cls.__init__ = __init__
+        cls.from_dicts = classmethod(from_dicts)
         return cls
 
     return wrapper(args[0]) if args else wrapper
+
+
+def _conversion_plan(cls: type) -> tuple[dict[str, Callable[[Any], Any]], bool]:
+    """
+    Converter per field of a dataclass whose annotation contains dataclasses, and
+     whether every field annotation could be resolved.
+    """
+    hints, complete = _field_hints(cls)
+    plan: dict[str, Callable[[Any], Any]] = {}
+    for fld in fields(cls):
+        convert = _converter(hints.get(fld.name), {})
+        if convert is not None:
+            plan[fld.name] = convert
+    return plan, complete
+
+
+def _field_hints(cls: type) -> tuple[dict[str, Any], bool]:
+    """
+    Resolved annotations of a class like `typing.get_type_hints`, and whether all of them
+     resolved. Annotations naming undefined classes are resolved one by one and left out.
+    """
+    try:
+        return typing.get_type_hints(cls), True
+    except NameError:
+        pass
+    hints: dict[str, Any] = {}
+    complete = True
+    for base in reversed(cls.__mro__):
+        base_globals = getattr(sys.modules.get(base.__module__), "__dict__", {})
+        for name, value in base.__dict__.get("__annotations__", {}).items():
+            # a class holding only this annotation, resolved in the scope of `base`
+            stub = type(base.__name__, (), {"__annotations__": {name: value}})
+            try:
+                hints[name] = typing.get_type_hints(stub, base_globals, dict(vars(base)))[name]
+            except NameError:
+                hints.pop(name, None)
+                complete = False
+    return hints, complete
+
+
+def _converter(field_type: Any, seen: dict[Any, Any]) -> Union[Callable[[Any], Any], None]:
+    """Function converting dictionaries into the dataclasses of a type; None if there are none."""
+    if is_dataclass(field_type) and isinstance(field_type, type):
+        if field_type in seen:
+            # recursive dataclass; resolved once the outer converter is built
+            return lambda value: seen[field_type](value)
+        if hasattr(field_type, "from_dicts"):
+            # nested_dataclass converts its own fields
+            def build(value: Any) -> Any:
+                return field_type(**value) if isinstance(value, dict) else value
+
+            return build
+        seen[field_type] = None
+        hints, _ = _field_hints(field_type)
+        inner = {
+            fld.name: _converter(hints.get(fld.name), seen) for fld in fields(field_type)
+        }
+        inner = {name: convert for name, convert in inner.items() if convert is not None}
+
+        def build_fields(value: Any) -> Any:
+            if not isinstance(value, dict):
+                return value
+            return field_type(
+                **{k: inner[k](v) if k in inner else v for k, v in value.items()}
+            )
+
+        seen[field_type] = build_fields
+        return build_fields
+    origin = typing.get_origin(field_type)
+    type_args = typing.get_args(field_type)
+    if origin in UNION_TYPES:
+        options = [arg for arg in type_args if arg is not type(None)]
+        return _converter(options[0], seen) if len(options) == 1 else None
+    if origin in (list, set, frozenset, tuple) and type_args:
+        is_variadic = origin is not tuple or (len(type_args) == 2 and type_args[1] is Ellipsis)
+        if not is_variadic:
+            return None
+        item = _converter(type_args[0], seen)
+        if item is None:
+            return None
+
+        def build_items(value: Any) -> Any:
+            return origin(item(v) for v in value) if isinstance(value, origin) else value
+
+        return build_items
+    if origin is dict and len(type_args) == 2:
+        item = _converter(type_args[1], seen)
+        if item is None:
+            return None
+
+        def build_values(value: Any) -> Any:
+            return {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+
+        return build_values
+    return None
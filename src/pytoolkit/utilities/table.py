@@ -0,0 +1,284 @@
+"""Columnar BaseMonitor Storage."""
+
+from dataclasses import MISSING, Field, fields
+import typing
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar, Union
+
+import numpy as np
+
+from pytoolkit.static import NONETYPE
+from pytoolkit.utilities import BaseMonitor
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+T = TypeVar("T", bound=BaseMonitor)
+# fields annotated with these types are stored unboxed; everything else is an object column
+COLUMN_DTYPES: dict[Any, Any] = {
+    int: np.int64,
+    "int": np.int64,
+    float: np.float64,
+    "float": np.float64,
+    bool: np.bool_,
+    "bool": np.bool_,
+}
+# value types stored in an unboxed column per dtype kind; ints are exact in float columns
+COLUMN_VALUE_KINDS: dict[str, tuple[str, ...]] = {"i": ("i",), "f": ("f", "i"), "b": ("b",)}
+
+
+class MonitorTable(Generic[T]):
+    """
+    Column store for many records of one `BaseMonitor` dataclass.
+
+    Each field is kept in a NumPy column that grows by doubling; fields annotated
+    `int`, `float` or `bool` are stored unboxed and every other field as an object
+    column. A typed column receiving values of another type (e.g. None) becomes an
+    object column so records read back unchanged. Columns are exported to pandas
+    (and pyarrow when installed) without copying.
+
+    Usage:
+        >>> table = MonitorTable(Device)
+        >>> table.extend(api_records)
+        >>> slow = table.filter(table.column("latency") > 100)
+        >>> slow.to_pandas().groupby("site")["latency"].mean()
+    """
+
+    def __init__(
+        self,
+        cls: type[T],
+        records: Optional[Iterable[Union[T, dict[str, Any]]]] = None,
+        capacity: int = 1024,
+    ) -> None:
+        """
+        Create an empty table for a dataclass.
+
+        :param cls: `BaseMonitor` dataclass stored in the table.
+        :type cls: type[T]
+        :param records: Records or dictionaries to add, defaults to None
+        :type records: Iterable[T|dict[str, Any]], optional
+        :param capacity: Rows allocated up front, defaults to 1024
+        :type capacity: int, optional
+        """
+        self.cls = cls
+        self._fields: tuple[Field, ...] = fields(cls)  # type: ignore
+        self.columns: tuple[str, ...] = tuple(f.name for f in self._fields)
+        hints = _type_hints(cls)
+        self.dtypes: dict[str, np.dtype] = {
+            f.name: np.dtype(COLUMN_DTYPES.get(hints.get(f.name, f.type), object))
+            for f in self._fields
+        }
+        # dictionaries are stored directly unless the dataclass computes values itself
+        self._direct = not hasattr(cls, "__post_init__")
+        self._data: dict[str, np.ndarray] = {
+            name: np.empty(max(capacity, 1), dtype) for name, dtype in self.dtypes.items()
+        }
+        self._size: int = 0
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        for idx in range(self._size):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> T:
+        """Rebuild the record at row `idx`."""
+        if idx < 0:
+            idx += self._size
+        if not 0 <= idx < self._size:
+            raise IndexError(f"Row {idx} out of range for {self._size} rows")
+        values = {name: _scalar(self._data[name][idx]) for name in self.columns}
+        record = self.cls(**{f.name: values[f.name] for f in self._fields if f.init})
+        for fld in self._fields:
+            if not fld.init:
+                object.__setattr__(record, fld.name, values[fld.name])
+        return record
+
+    def append(self, record: Union[T, dict[str, Any]]) -> None:
+        """
+        Add one record or dictionary; see `extend`.
+
+        :param record: Record or dictionary of values.
+        :type record: T|dict[str, Any]
+        """
+        self.extend([record])
+
+    def extend(self, records: Iterable[Union[T, dict[str, Any]]]) -> None:
+        """
+        Add records or dictionaries; dictionaries are filtered like `create_from_dict`.
+
+        :param records: Records or dictionaries of values.
+        :type records: Iterable[T|dict[str, Any]]
+        :raises TypeError: A dictionary is missing a required field.
+        """
+        values: dict[str, list[Any]] = {name: [] for name in self.columns}
+        columns = [(name, values[name].append) for name in self.columns]
+        count = 0
+        for record in records:
+            if isinstance(record, dict):
+                record = self._from_dict(record)
+            for name, add in columns:
+                add(getattr(record, name))
+            count += 1
+        if not count:
+            return
+        self._reserve(self._size + count)
+        for name in self.columns:
+            column = self._data[name]
+            if column.dtype != object and not _fits(values[name], column.dtype):
+                column = self._to_object(name)
+            if column.dtype == object:
+                # assigned one by one so sequence values are not broadcast
+                for idx, value in enumerate(values[name], self._size):
+                    column[idx] = value
+            else:
+                column[self._size : self._size + count] = values[name]
+        self._size += count
+
+    def _to_object(self, name: str) -> np.ndarray:
+        """Turn a typed column into an object column holding Python values."""
+        column = np.empty(len(self._data[name]), object)
+        column[: self._size] = self._data[name][: self._size].tolist()
+        self._data[name] = column
+        self.dtypes[name] = column.dtype
+        return column
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Read-only view of a column.
+
+        :param name: Field name.
+        :type name: str
+        :return: Column values without copying.
+        :rtype: np.ndarray
+        """
+        view = self._data[name][: self._size]
+        view.flags.writeable = False
+        return view
+
+    def filter(self, mask: Union[np.ndarray, Callable[["MonitorTable[T]"], np.ndarray]]) -> "MonitorTable[T]":
+        """
+        Rows selected by a boolean mask, e.g. `table.filter(table.column("latency") > 100)`.
+
+        :param mask: Boolean array with one value per row, or a function of the table returning one.
+        :type mask: np.ndarray|Callable[[MonitorTable], np.ndarray]
+        :raises ValueError: The mask is not boolean or has the wrong length.
+        :return: New table with the selected rows.
+        :rtype: MonitorTable[T]
+        """
+        if callable(mask):
+            mask = mask(self)
+        mask = np.asarray(mask)
+        if mask.dtype != np.bool_ or mask.shape != (self._size,):
+            raise ValueError(f"Invalid mask must be a boolean array of {self._size} rows")
+        table: MonitorTable[T] = MonitorTable(self.cls, capacity=1)
+        table._data = {name: self.column(name)[mask] for name in self.columns}
+        table.dtypes = dict(self.dtypes)
+        table._size = int(mask.sum())
+        return table
+
+    def to_pandas(self) -> Any:
+        """
+        Export as a DataFrame; numeric columns share memory with the table.
+         `NONETYPE` values become None.
+
+        :return: One column per field.
+        :rtype: pd.DataFrame
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+
+        return pd.DataFrame({name: self._export(name) for name in self.columns}, copy=False)
+
+    def to_arrow(self) -> Any:
+        """
+        Export as a pyarrow Table; numeric columns share memory with the table.
+
+        :raises ImportError: pyarrow is not installed.
+        :return: One column per field.
+        :rtype: pa.Table
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for MonitorTable.to_arrow")
+        return pa.table({name: pa.array(self._export(name)) for name in self.columns})
+
+    def _from_dict(self, _dict: dict[str, Any]) -> Any:
+        """Field values of a dictionary, without building the dataclass when possible."""
+        if not self._direct:
+            return self.cls.create_from_dict(_dict)
+        row = _Row()
+        for fld in self._fields:
+            if fld.init and fld.name in _dict:
+                value = _dict[fld.name]
+            elif fld.default is not MISSING:
+                value = fld.default
+            elif fld.default_factory is not MISSING:
+                value = fld.default_factory()
+            else:
+                raise TypeError(f"Missing required field {fld.name} for {self.cls.__name__}")
+            setattr(row, fld.name, value)
+        return row
+
+    def _reserve(self, size: int) -> None:
+        """Grow every column to hold at least `size` rows."""
+        capacity = min((len(column) for column in self._data.values()), default=size)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, column in self._data.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._data[name] = grown
+
+    def _export(self, name: str) -> np.ndarray:
+        """Column for export with `NONETYPE` replaced by None."""
+        column = self.column(name)
+        if column.dtype != object:
+            return column
+        missing = np.fromiter((value is NONETYPE for value in column), bool, len(column))
+        if not missing.any():
+            return column
+        column = column.copy()
+        column[missing] = None
+        return column
+
+
+class _Row:  # pylint: disable=too-few-public-methods
+    """Attribute holder for dictionary values."""
+
+
+def _type_hints(cls: type) -> dict[str, Any]:
+    """Resolved field annotations; unresolvable annotations fall back to the raw `Field.type`."""
+    try:
+        return typing.get_type_hints(cls)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return {}
+
+
+def _fits(values: list[Any], dtype: np.dtype) -> bool:
+    """True if every value can be stored in a typed column without changing it."""
+    kinds = COLUMN_VALUE_KINDS[dtype.kind]
+    for value_type in set(map(type, values)):
+        if issubclass(value_type, (bool, np.bool_)):
+            kind = "b"
+        elif issubclass(value_type, (int, np.integer)):
+            kind = "i"
+        elif issubclass(value_type, (float, np.floating)):
+            kind = "f"
+        else:
+            return False
+        if kind not in kinds:
+            return False
+    if dtype.kind == "i":
+        # Python ints outside the int64 range
+        info = np.iinfo(dtype)
+        return all(info.min <= value <= info.max for value in values if type(value) is int)
+    return True
+
+
+def _scalar(value: Any) -> Any:
+    """Unbox NumPy scalars so rebuilt records hold plain Python values."""
+    return value.item() if isinstance(value, np.generic) else value
@@ -2,6 +2,7 @@
 """Utilities."""
 
 from enum import Enum
+import functools
 import os
 from pathlib import Path
 import platform
@@ -10,18 +11,22 @@ import socket
 from typing import Any, List, Union
 import base64
 import re
-import json
-
-import airportsdata
 
 from pytoolkit.decorate import error_handler
 from pytoolkit.static import ENCODING, NO_AIRPORTDATA, RE_DOMAIN, RE_IP4, SANATIZE_KEYS
-from pytoolkit.utilities import flatten_dictionary, nested_dict
+from pytoolkit.sanitize import SANITIZER, Sanitizer
+from pytoolkit.utilities import flatten_dictionary, nested_dict  # noqa: F401  # pylint: disable=unused-import
 
 PATTERN = re.compile(r"(?<!^)(?=[A-Z])")
-AIRPORTDATA = json.loads(
-    json.dumps(airportsdata.load(code_type="IATA"), ensure_ascii=False)
-)
+
+
+def __getattr__(name: str) -> Any:
+    """Build `AIRPORTDATA` on first access instead of at import."""
+    if name == "AIRPORTDATA":
+        from pytoolkit.airports import airport_data  # pylint: disable=import-outside-toplevel
+
+        return airport_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def os_plat() -> str:
@@ -285,20 +290,23 @@ def sanatize_data(  # pylint: disable=W0102
 ) -> dict[str, Any]:
     """
     Sanatize Data from a dictionary of values if a string is found to mask values that should not be exposed.
+     Keys are matched at any depth; see `sanitize.Sanitizer`.
 
-    :param data: _description_
+    :param data: Dictionary to mask.
     :type data: dict[str,Any]
-    :param keys: _description_, defaults to SANATIZE_KEYS
+    :param keys: Key names to mask, defaults to SANATIZE_KEYS
     :type keys: list[str], optional
-    :return: _description_
+    :return: Copy of `data` with masked values; unchanged nested values are shared with `data`.
     :rtype: dict[str, Any]
     """
-    flat = flatten_dictionary(data)
-    new_dict = {
-        key: "[MASKED]" if isinstance(key, str) and key.lower() in keys else value
-        for key, value in flat.items()
-    }
-    return nested_dict(new_dict)
+    sanitizer = SANITIZER if keys is SANATIZE_KEYS else _sanitizer(tuple(keys))
+    return sanitizer.sanitize(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _sanitizer(keys: tuple[str, ...]) -> Sanitizer:
+    """Reuse the compiled `Sanitizer` of a custom key list."""
+    return Sanitizer(keys)
 
 
 def split(event_list: list[Any], chunk_size: int):
@@ -382,7 +390,10 @@ def get_airport_info(airport_code: str) -> dict[str, Any]:
     :return: Airport Information. Returns Emtpy Dictionary if not found or invalid
     :rtype: dict[str,Any]
     """
-    return AIRPORTDATA[airport_code.upper()]
+    from pytoolkit.airports import get_index  # pylint: disable=import-outside-toplevel
+
+    info = get_index().get(airport_code)
+    return info if info is not None else dict(NO_AIRPORTDATA)
 
 
 def convert_list_to_dict(lst: list[str]) -> dict[str, str]:
@@ -0,0 +1,35 @@
+"""
+Benchmark bulk airport enrichment.
+
+Compares per-row `get_airport_info` with `enrich_airports`.
+
+Usage:
+    python src/tests/benchmarks/bench_airports.py
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from pytoolkit.airports import enrich_airports, get_index
+from pytoolkit.utils import get_airport_info
+
+FIELDS = ["city", "country", "lat", "lon"]
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    sites = np.char.lower(get_index().columns["iata"][:2000]).astype(object)
+    codes = pd.Series(rng.choice(sites, 1_000_000))
+    sample = codes.iloc[:100_000]
+    row_time = timeit.timeit(
+        lambda: pd.DataFrame([get_airport_info(code) for code in sample])[FIELDS], number=1
+    )
+    bulk_time = timeit.timeit(lambda: enrich_airports(codes, fields=FIELDS), number=1)
+    print(f"get_airport_info: {row_time / len(sample) * 1e9:9.1f} ns/row")
+    print(f"enrich_airports:  {bulk_time / len(codes) * 1e9:9.1f} ns/row")
+    print(f"speedup:          {row_time / len(sample) / (bulk_time / len(codes)):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark decorator call overhead.
+
+Compares undecorated calls with `retry` and `error_handler` wrapped calls that succeed.
+
+Usage:
+    python src/tests/benchmarks/bench_decorate.py
+"""
+import timeit
+
+from pytoolkit.decorate import error_handler, retry
+
+
+def add(left: int, right: int = 1) -> int:
+    return left + right
+
+
+CALLS = {
+    "undecorated": add,
+    "retry": retry(tries=3)(add),
+    "error_handler": error_handler(default_return=0)(add),
+    "retry+error_handler": error_handler(default_return=0)(retry(tries=3)(add)),
+}
+
+
+def main() -> None:
+    runs = 1_000_000
+    base = 0.0
+    for name, func in CALLS.items():
+        elapsed = timeit.timeit(lambda: func(1, right=2), number=runs) / runs * 1e9
+        base = base or elapsed
+        print(f"{name + ':':21} {elapsed:8.1f} ns/call  overhead {elapsed - base:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
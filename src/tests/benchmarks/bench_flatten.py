@@ -0,0 +1,41 @@
+"""
+Benchmark dictionary flattening.
+
+Compares `flatten_dictionary` (pandas json_normalize) with `flatten_json`.
+
+Usage:
+    python src/tests/benchmarks/bench_flatten.py
+"""
+import timeit
+from typing import Any
+
+from pytoolkit.utilities import flatten_dictionary, flatten_json, flatten_records
+
+RECORD: dict[str, Any] = {
+    "host": "server01",
+    "status": "up",
+    "latency": 12.5,
+    "tags": ["prod", "edge"],
+    "metadata": {
+        "site": "dfw",
+        "rack": {"row": 4, "slot": 12},
+        "owner": {"team": "network", "contact": {"email": "noc@example.com"}},
+    },
+}
+RECORDS: list[dict[str, Any]] = [dict(RECORD, host=f"server{idx:05d}") for idx in range(10000)]
+
+
+def main() -> None:
+    assert flatten_json(RECORD) == flatten_dictionary(RECORD)
+    runs = 1000
+    pandas_time = timeit.timeit(lambda: flatten_dictionary(RECORD), number=runs)
+    json_time = timeit.timeit(lambda: flatten_json(RECORD), number=runs)
+    print(f"flatten_dictionary: {pandas_time / runs * 1e6:9.2f} us/record")
+    print(f"flatten_json:       {json_time / runs * 1e6:9.2f} us/record")
+    print(f"speedup:            {pandas_time / json_time:9.1f}x")
+    batch_time = timeit.timeit(lambda: flatten_records(RECORDS), number=1)
+    print(f"flatten_records:    {batch_time:9.3f} s/{len(RECORDS)} records")
+
+
+if __name__ == "__main__":
+    main()
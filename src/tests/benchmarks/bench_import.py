@@ -0,0 +1,33 @@
+"""
+Benchmark the import time of `pytoolkit.utils` and the first airport lookup.
+
+Usage:
+    python src/tests/benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+IMPORT = "import time; start = time.perf_counter(); import pytoolkit.utils; print(time.perf_counter() - start)"
+LOOKUP = (
+    "import time; import pytoolkit.utils as utils; start = time.perf_counter(); "
+    "utils.get_airport_info('JFK'); print(time.perf_counter() - start)"
+)
+
+
+def measure(code: str) -> float:
+    """Median seconds printed by `code` over fresh interpreters."""
+    return statistics.median(
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True).stdout)
+        for _ in range(RUNS)
+    )
+
+
+def main() -> None:
+    print(f"import pytoolkit.utils: {measure(IMPORT) * 1000:8.1f} ms")
+    print(f"first get_airport_info: {measure(LOOKUP) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
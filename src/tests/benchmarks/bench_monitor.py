@@ -0,0 +1,80 @@
+"""
+Benchmark building BaseMonitor dataclasses from API dictionaries and their memory use.
+
+Usage:
+    python src/tests/benchmarks/bench_monitor.py
+"""
+from dataclasses import dataclass, field, fields
+import timeit
+import tracemalloc
+from typing import Any, Optional
+
+from pytoolkit.static import NONETYPE
+from pytoolkit.utilities import BaseMonitor, SlottedMonitor, slotted_dataclass
+
+
+@dataclass
+class Device(BaseMonitor):
+    """Sample monitor record."""
+
+    host: str
+    status: str
+    latency: float
+    site: Optional[str] = NONETYPE
+    tags: list[str] = field(default_factory=list)
+
+
+@slotted_dataclass
+class SlottedDevice(SlottedMonitor):
+    """Sample monitor record without an instance `__dict__`."""
+
+    host: str
+    status: str
+    latency: float
+    site: Optional[str] = NONETYPE
+    tags: list[str] = field(default_factory=list)
+
+
+RECORD: dict[str, Any] = {
+    "host": "server01",
+    "status": "up",
+    "latency": 12.5,
+    "site": "dfw",
+    "vendor": "example",
+    "serial": "ABC123",
+    "uptime": 86400,
+}
+RECORDS: list[dict[str, Any]] = [RECORD] * 100000
+
+
+def create_uncached(_dict: dict[str, Any]) -> Device:
+    """`create_from_dict` before field caching."""
+    class_fields: set[str] = {f.name for f in fields(Device)}
+    return Device(**{k: v for k, v in _dict.items() if k in class_fields})
+
+
+def bytes_per_instance(cls: Any, count: int = 100000) -> float:
+    """Memory allocated per instance, excluding the shared field values."""
+    tags: list[list[str]] = [[] for _ in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [cls("server01", "up", 12.5, "dfw", tags[idx]) for idx in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def main() -> None:
+    uncached = timeit.timeit(lambda: [create_uncached(record) for record in RECORDS], number=1)
+    cached = timeit.timeit(lambda: [Device.create_from_dict(record) for record in RECORDS], number=1)
+    many = timeit.timeit(lambda: Device.create_many(RECORDS), number=1)
+    print(f"uncached create_from_dict: {uncached:7.3f} s/{len(RECORDS)} records")
+    print(f"create_from_dict:          {cached:7.3f} s/{len(RECORDS)} records")
+    print(f"create_many:               {many:7.3f} s/{len(RECORDS)} records")
+    print(f"BaseMonitor:               {bytes_per_instance(Device):7.1f} bytes/instance")
+    print(f"SlottedMonitor:            {bytes_per_instance(SlottedDevice):7.1f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main()
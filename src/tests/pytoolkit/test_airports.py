@@ -0,0 +1,131 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring
+"""Test Airport Index."""
+
+from pathlib import Path
+import tempfile
+import unittest
+
+import airportsdata
+import numpy as np
+import pandas as pd
+
+from pytoolkit import airports
+from pytoolkit import utils
+from pytoolkit.static import NO_AIRPORTDATA
+
+
+class TestAirportIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = airports.get_index()
+
+    def test_lookup(self):
+        info = self.index.get("jfk")
+        self.assertEqual(info["iata"], "JFK")  # type: ignore
+        self.assertEqual(info["icao"], "KJFK")  # type: ignore
+        self.assertIsInstance(info["lat"], float)  # type: ignore
+        self.assertEqual(self.index.get("KJFK", code_type="icao"), info)
+        self.assertIsNone(self.index.get("ZZZZ"))
+        self.assertEqual(self.index.find("!!"), -1)
+        with self.assertRaises(ValueError):
+            self.index.get("JFK", code_type="FAA")
+
+    def test_matches_airportsdata(self):
+        self.assertEqual(self.index.to_dict(), airportsdata.load(code_type="IATA"))
+        self.assertIs(utils.AIRPORTDATA, airports.airport_data())
+        with self.assertRaises(AttributeError):
+            utils.NOT_AN_ATTRIBUTE  # pylint: disable=no-member,pointless-statement
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            built = airports.AirportIndex.load(tmp)
+            [cache] = list(Path(tmp).iterdir())
+            self.assertEqual(cache.suffix, ".npz")
+            cached = airports.AirportIndex.load(tmp)
+            self.assertEqual(len(cached), len(built))
+            self.assertEqual(cached.get("ord"), built.get("ord"))
+            valid = cache.read_bytes()
+            for damaged in (b"corrupt", b"", valid[: len(valid) // 2], valid[:-100]):
+                cache.write_bytes(damaged)
+                self.assertEqual(len(airports.AirportIndex.load(tmp)), len(built))
+                self.assertEqual(cache.read_bytes(), valid, "cache is rewritten")
+
+    def test_get_airport_info(self):
+        self.assertEqual(utils.get_airport_info("dfw")["country"], "US")
+        missing = utils.get_airport_info("zzz")
+        self.assertEqual(missing, NO_AIRPORTDATA)
+        self.assertIsNot(missing, NO_AIRPORTDATA)
+        self.assertEqual(utils.get_airport_info(None), NO_AIRPORTDATA)  # type: ignore
+
+
+
+class TestAirportSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = airports.get_index()
+
+    def test_nearest(self):
+        codes, distances = airports.nearest_airports(40.64, -73.78)
+        self.assertEqual(codes.tolist(), ["JFK"])
+        self.assertLess(distances[0], 1)
+        codes, distances = self.index.nearest(
+            pd.Series([40.64, np.nan, 32.9]), pd.Series([-73.78, 0.0, -97.04]), k=3
+        )
+        self.assertEqual(codes.shape, (3, 3))
+        self.assertEqual(codes[0, 0], "JFK")
+        self.assertEqual(codes[2, 0], "DFW")
+        self.assertEqual(codes[1].tolist(), ["", "", ""])
+        self.assertTrue(np.isnan(distances[1]).all())
+        self.assertTrue((np.diff(distances[[0, 2]], axis=1) >= 0).all())
+        with self.assertRaises(ValueError):
+            self.index.nearest([1.0], [1.0], k=0)
+        with self.assertRaises(ValueError):
+            self.index.nearest([1.0, 2.0], [1.0])
+
+    def test_nearest_matches_full_scan(self):
+        rng = np.random.default_rng(7)
+        lat, lon = rng.uniform(-60, 70, 200), rng.uniform(-180, 180, 200)
+        full = airports.haversine(
+            lat[:, None], lon[:, None], self.index.columns["lat"], self.index.columns["lon"]
+        )
+        codes, distances = self.index.nearest(lat, lon, k=2)
+        np.testing.assert_allclose(distances, np.sort(full, axis=1)[:, :2])
+        self.assertEqual(codes[0, 0], self.index.columns["iata"][np.argmin(full[0])])
+        positions, codes, distances = self.index.within(lat, lon, 250)
+        self.assertEqual(len(positions), int((full <= 250).sum()))
+        self.assertTrue((distances <= 250).all())
+
+    def test_within(self):
+        positions, codes, distances = airports.airports_within([40.64, np.nan], [-73.78, 0.0], 20)
+        self.assertEqual(positions.tolist(), [0, 0, 0])
+        self.assertEqual(codes.tolist(), ["JFK", "LGA", "NYS"])
+        self.assertTrue((np.diff(distances) >= 0).all())
+        self.assertEqual(len(airports.airports_within([], [], 20)[0]), 0)
+
+    def test_haversine(self):
+        # JFK to LHR is roughly 5540 km
+        self.assertAlmostEqual(float(airports.haversine(40.6413, -73.7781, 51.47, -0.4543)), 5540, delta=10)
+
+
+class TestAirportEnrich(unittest.TestCase):
+    def test_enrich_series(self):
+        codes = pd.Series(["jfk", "DFW", None, np.nan, "zzz", 5, "jfk"], index=list("abcdefg"))
+        frame = airports.enrich_airports(codes, fields=["iata", "city", "lat"])
+        self.assertEqual(frame.index.tolist(), list("abcdefg"))
+        self.assertEqual(frame["iata"].tolist(), ["JFK", "DFW", None, None, None, None, "JFK"])
+        self.assertEqual(frame["city"].iloc[0], utils.get_airport_info("JFK")["city"])
+        self.assertTrue(frame["lat"].iloc[2:6].isna().all())
+        self.assertIsNone(frame["city"].iloc[3], "NaN must not match NAN")
+
+    def test_enrich_arrays(self):
+        columns = airports.enrich_airports(np.array(["kjfk", "egll"]), code_type="ICAO", frame=False)
+        self.assertEqual(set(columns), set(airports.AIRPORT_FIELDS))
+        self.assertEqual(columns["iata"].tolist(), ["JFK", "LHR"])
+        self.assertEqual(airports.get_index().rows(["lhr", "xx"])[1], -1)
+        self.assertEqual(len(airports.enrich_airports([], fields=["city"])), 0)
+        with self.assertRaises(ValueError):
+            airports.enrich_airports(["JFK"], fields=["bogus"])
+
+
+if __name__ == "__main__":
+    unittest.main()
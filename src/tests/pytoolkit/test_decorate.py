@@ -0,0 +1,315 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring
+"""Test Decorators."""
+
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+from unittest import mock
+
+from pytoolkit.decorate import CircuitBreaker, circuit_breaker, error_handler, retry
+from pytoolkit.exceptions import CircuitOpenError
+
+
+class Flaky:
+    """Callable failing a set number of times before succeeding."""
+
+    def __init__(self, failures: int, error: type[Exception] = ValueError) -> None:
+        self.failures = failures
+        self.error = error
+        self.calls: list[tuple] = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if len(self.calls) <= self.failures:
+            raise self.error(f"failure {len(self.calls)}")
+        return args, kwargs
+
+
+class TestRetry(unittest.TestCase):
+    def test_success(self):
+        @retry(tries=3)
+        def add(left: int, right: int = 1) -> int:
+            """Add."""
+            return left + right
+
+        self.assertEqual(add(1, right=2), 3)
+        self.assertEqual(add.__name__, "add")
+        self.assertEqual(add.__doc__, "Add.")
+        self.assertEqual(list(inspect.signature(add).parameters), ["left", "right"])
+
+    def test_retries(self):
+        flaky = Flaky(2)
+        logger = mock.Mock()
+        with mock.patch("pytoolkit.decorate.time.sleep") as sleep:
+            result = retry(tries=3, delay=1, backoff=2, logger=logger)(flaky)(1, key="a")
+        self.assertEqual(result, ((1,), {"key": "a"}))
+        self.assertEqual(flaky.calls, [((1,), {"key": "a"})] * 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2])
+        self.assertEqual(logger.warning.call_count, 2)
+        self.assertEqual(logger.warning.call_args_list[0].args[1], "ValueError: failure 1")
+
+    def test_gives_up(self):
+        for tries, calls in ((3, 3), (1, 1), (0, 1)):
+            flaky = Flaky(5)
+            with mock.patch("pytoolkit.decorate.time.sleep"):
+                with self.assertRaisesRegex(ValueError, f"failure {calls}"):
+                    retry(tries=tries)(flaky)()
+            self.assertEqual(len(flaky.calls), calls)
+
+    def test_bad_arguments(self):
+        flaky = Flaky(100, TypeError)
+
+        @retry()
+        def one(value):
+            return flaky(value)
+
+        with self.assertRaisesRegex(TypeError, "too many positional arguments"):
+            one(1, 2)
+        with self.assertRaisesRegex(TypeError, "too many positional arguments"):
+            asyncio.run(retry()(as_coroutine_function_of(one.__wrapped__))(1, 2))
+        with self.assertRaisesRegex(TypeError, "missing a required argument"):
+            error_handler(default_return={"a": 1})(one.__wrapped__)()
+        self.assertEqual(flaky.calls, [])
+        with mock.patch("pytoolkit.decorate.time.sleep"):
+            with self.assertRaisesRegex(TypeError, "failure 3"):
+                retry(tries=3)(one.__wrapped__)(1)
+
+    def test_uncaught_exception(self):
+        flaky = Flaky(1, KeyError)
+        with self.assertRaises(KeyError):
+            retry(ValueError, tries=3)(flaky)()
+        self.assertEqual(len(flaky.calls), 1)
+
+
+class TestErrorHandler(unittest.TestCase):
+    def test_default_return(self):
+        self.assertEqual(error_handler(default_return={"a": 1})(Flaky(0))(1), ((1,), {}))
+        self.assertEqual(error_handler(default_return={"a": 1})(Flaky(1))(), {"a": 1})
+        self.assertIsNone(error_handler()(Flaky(1))())
+        with self.assertRaises(KeyError):
+            error_handler(ValueError)(Flaky(1, KeyError))()
+
+    def test_default_function(self):
+        def fallback(**kwargs):
+            return kwargs
+
+        def lookup(code, field="city"):
+            raise ValueError(code)
+
+        result = error_handler(default_return=fallback, func_params={"app": "x"})(lookup)("JFK", field="tz")
+        self.assertEqual(
+            result,
+            {
+                "app": "x",
+                "func_name": "lookup",
+                "field": "tz",
+                "args1": "JFK",
+                "error": "ValueError: JFK",
+                "level": "fatal",
+            },
+        )
+        partial_result = error_handler(default_return=functools.partial(fallback, app="y"))(lookup)("JFK")
+        self.assertEqual(partial_result, {"app": "y", "error": "ValueError: JFK", "level": "fatal"})
+
+    def test_logger(self):
+        logger = mock.Mock()
+        error_handler(logger=logger)(Flaky(1))()
+        self.assertIn("error_raw=ValueError: failure 1", logger.fatal.call_args.args[0])
+
+
+class AsyncFlaky(Flaky):
+    """Coroutine function failing a set number of times before succeeding."""
+
+    async def __call__(self, *args, **kwargs):
+        return super().__call__(*args, **kwargs)
+
+
+def as_coroutine_function(flaky: AsyncFlaky):
+    async def call(*args, **kwargs):
+        return await flaky(*args, **kwargs)
+
+    return call
+
+
+def as_coroutine_function_of(func):
+    async def call(value):
+        return func(value)
+
+    return call
+
+
+class TestAsyncDecorators(unittest.TestCase):
+    def test_retry(self):
+        flaky = AsyncFlaky(2)
+        logger = mock.Mock()
+        decorated = retry(tries=3, delay=1, backoff=2, logger=logger)(as_coroutine_function(flaky))
+        self.assertTrue(inspect.iscoroutinefunction(decorated))
+        with mock.patch("pytoolkit.decorate.asyncio.sleep", new=mock.AsyncMock()) as sleep, mock.patch(
+            "pytoolkit.decorate.time.sleep"
+        ) as time_sleep:
+            self.assertEqual(asyncio.run(decorated(1)), ((1,), {}))
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [1, 2])
+        time_sleep.assert_not_called()
+        self.assertEqual(logger.warning.call_count, 2)
+
+    def test_retry_gives_up(self):
+        flaky = AsyncFlaky(5)
+        with mock.patch("pytoolkit.decorate.asyncio.sleep", new=mock.AsyncMock()):
+            with self.assertRaisesRegex(ValueError, "failure 3"):
+                asyncio.run(retry(tries=3)(as_coroutine_function(flaky))())
+
+    def test_retry_cancellation(self):
+        flaky = AsyncFlaky(5, asyncio.CancelledError)
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(retry(BaseException, tries=3)(as_coroutine_function(flaky))())
+        self.assertEqual(len(flaky.calls), 1)
+
+        async def cancel_while_waiting():
+            task = asyncio.ensure_future(retry(delay=60)(as_coroutine_function(AsyncFlaky(5)))())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel_while_waiting())
+
+    def test_error_handler(self):
+        decorated = error_handler(default_return={"a": 1})(as_coroutine_function(AsyncFlaky(1)))
+        self.assertTrue(inspect.iscoroutinefunction(decorated))
+        self.assertEqual(asyncio.run(decorated()), {"a": 1})
+        self.assertEqual(asyncio.run(decorated(2)), ((2,), {}))
+        cancelled = error_handler(BaseException)(as_coroutine_function(AsyncFlaky(1, asyncio.CancelledError)))
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancelled())
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("pytoolkit.decorate.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_states(self):
+        breaker = CircuitBreaker(ConnectionError, failure_rate=0.5, window=10, min_calls=4, cooldown=30)
+        flaky = Flaky(3, ConnectionError)
+        call = breaker(flaky)
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                call()
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(call(), ((), {}))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED, "4 calls, 3 failures but last call succeeded")
+        flaky.failures = 10
+        with self.assertRaises(ConnectionError):
+            call()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaisesRegex(CircuitOpenError, "retry in 30.0s"):
+            call()
+        self.assertEqual(len(flaky.calls), 5)
+        self.now += 30
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(ConnectionError):
+            call()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.now += 30
+        flaky.failures = 0
+        self.assertEqual(call(), ((), {}))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_stale_outcomes(self):
+        breaker = CircuitBreaker(min_calls=1, cooldown=30)
+        for stale_success in (True, False):
+            breaker.reset()
+            slow = breaker.before_call()
+            breaker.record(False, breaker.before_call())
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            self.now += 30
+            trial = breaker.before_call()
+            # the slow call admitted while closed finishes during the half open trial
+            breaker.record(stale_success, slow)
+            breaker.release(slow)
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record(True, trial)
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_window(self):
+        breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=2)
+        call = breaker(Flaky(10))
+        with self.assertRaises(ValueError):
+            call()
+        self.now += 11
+        with self.assertRaises(ValueError):
+            call()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED, "first failure left the window")
+        with self.assertRaises(ValueError):
+            call()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        breaker.reset()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_other_exceptions(self):
+        breaker = CircuitBreaker(ConnectionError, min_calls=1)
+        with self.assertRaises(KeyError):
+            breaker(Flaky(1, KeyError))()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_rate=0)
+
+    def test_compose(self):
+        flaky = Flaky(100, ConnectionError)
+        logger = mock.Mock()
+        breaker = CircuitBreaker(min_calls=3, cooldown=30, logger=logger)
+        guarded = error_handler(default_return={"down": True})(retry(tries=-1)(breaker(flaky)))
+        with mock.patch("pytoolkit.decorate.time.sleep"):
+            self.assertEqual(guarded(), {"down": True})
+            self.assertEqual(guarded(), {"down": True})
+        self.assertEqual(len(flaky.calls), 3, "retry stops once the circuit opens")
+        self.assertIn("open", logger.warning.call_args.args)
+        shared = circuit_breaker(breaker=breaker)
+        self.assertIs(shared, breaker)
+        with self.assertRaises(CircuitOpenError):
+            shared(Flaky(0))()
+
+    def test_async(self):
+        breaker = circuit_breaker(min_calls=2, cooldown=5)
+        flaky = AsyncFlaky(2)
+        call = breaker(as_coroutine_function(flaky))
+        self.assertTrue(inspect.iscoroutinefunction(call))
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                asyncio.run(call())
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(call())
+        self.now += 5
+        cancelled = breaker(as_coroutine_function(AsyncFlaky(1, asyncio.CancelledError)))
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancelled())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN, "cancelled trial is released")
+        self.assertEqual(asyncio.run(call()), ((), {}))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_threads(self):
+        breaker = CircuitBreaker(min_calls=1, cooldown=30)
+        breaker.record(False)
+        self.now += 30
+        call = breaker(Flaky(0))
+
+        def attempt(_):
+            try:
+                return call() is not None
+            except CircuitOpenError:
+                return False
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(attempt, range(200)))
+        self.assertGreaterEqual(sum(results), 1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring
+"""Test Sanitizer."""
+import io
+import json
+from pathlib import Path
+import re
+import tempfile
+import unittest
+
+from pytoolkit.sanitize import (
+    MASK,
+    Sanitizer,
+    _line_ranges,
+    sanitize_file,
+    sanitize_stream,
+)
+from pytoolkit.utils import sanatize_data
+
+NESTED_DATA = {
+    "value1": "one",
+    "subvalue01": {"password": "welcome123", "username": "testuser"},
+    "events": [{"Token": "abc", "host": "server01"}, "plain"],
+    "clean": {"host": "server02", "tags": ["a", "b"]},
+}
+
+
+class TestSanitizer(unittest.TestCase):
+    def test_nested(self):
+        result = sanatize_data(NESTED_DATA)
+        self.assertEqual(result["subvalue01"]["password"], MASK)
+        self.assertEqual(result["events"][0]["Token"], MASK)
+        self.assertEqual(result["events"][1], "plain")
+        self.assertEqual(result["subvalue01"]["username"], "testuser")
+        # original is untouched and unchanged subtrees are shared
+        self.assertEqual(NESTED_DATA["subvalue01"]["password"], "welcome123")
+        self.assertIs(result["clean"], NESTED_DATA["clean"])
+
+    def test_unchanged(self):
+        data = {"host": "server01", "metadata": {"site": "dfw"}}
+        self.assertIs(Sanitizer().sanitize(data), data)
+
+    def test_in_place(self):
+        data = {"auth": {"user": "admin"}, "nested": {"jwt": "x"}}
+        result = Sanitizer().sanitize(data, in_place=True)
+        self.assertIs(result, data)
+        self.assertEqual(data, {"auth": MASK, "nested": {"jwt": MASK}})
+
+    def test_patterns_suffixes(self):
+        sanitizer = Sanitizer(
+            keys=[],
+            patterns=[r"secret$", re.compile("^api_")],
+            suffixes=["db.user"],
+            mask="***",
+        )
+        data = {
+            "client_secret": 1,
+            "API_KEY": 2,
+            "db": {"user": "admin", "name": "prod"},
+            "user": "other",
+            1: "not a string key",
+        }
+        self.assertEqual(
+            sanitizer(data),
+            {
+                "client_secret": "***",
+                "API_KEY": "***",
+                "db": {"user": "***", "name": "prod"},
+                "user": "other",
+                1: "not a string key",
+            },
+        )
+        self.assertTrue(sanitizer.is_sensitive("user", ("app", "db")))
+        self.assertFalse(sanitizer.is_sensitive("user", ("mydb",)))
+
+    def test_plan_cache(self):
+        sanitizer = Sanitizer(cache_size=2)
+        for idx in range(5):
+            result = sanitizer.sanitize({f"key{idx}": 1, "password": "x"})
+            self.assertEqual(result["password"], MASK)
+        self.assertLessEqual(len(sanitizer._plans), 2)  # pylint: disable=protected-access
+
+    def test_custom_keys(self):
+        result = sanatize_data({"Secret": "x", "password": "y"}, keys=["SECRET"])
+        self.assertEqual(result, {"Secret": MASK, "password": "y"})
+
+
+class TestStreamSanitizer(unittest.TestCase):
+    def test_text(self):
+        sanitizer = Sanitizer(scrub_strings=True)
+        self.assertEqual(
+            sanitizer.sanitize_text("mysql -u root -p=secret -P 3306 -p 'a b' x-p y"),
+            f"mysql -u root -p={MASK} -P {MASK} -p '{MASK}' x-p y",
+        )
+        for text in ("run -port 8080", "tar -pcf x.tar", "mysql -psecret"):
+            self.assertIs(sanitizer.sanitize_text(text), text)
+        self.assertEqual(
+            Sanitizer(attached_flags=True).sanitize_text("mysql -u root -psecret -P 3306"),
+            f"mysql -u root -p{MASK} -P {MASK}",
+        )
+        self.assertEqual(
+            sanitizer.sanitize_text('login Password=abc, token: "x y" user=bob'),
+            f'login Password={MASK}, token: "{MASK}" user=bob',
+        )
+        text = "nothing to see"
+        self.assertIs(sanitizer.sanitize_text(text), text)
+        self.assertEqual(
+            sanitizer.sanitize({"cmd": "run -p s3", "args": ["--user x", "-P y"]}),
+            {"cmd": f"run -p {MASK}", "args": ["--user x", f"-P {MASK}"]},
+        )
+
+    def test_stream(self):
+        lines = [
+            b'{"password": "x", "nested": {"token": 1}}\n',
+            b'{"host": "server01"}\r\n',
+            b"plain log line auth=abc\n",
+            b"[1, 2",
+        ]
+        output = io.BytesIO()
+        self.assertEqual(sanitize_stream(io.BytesIO(b"".join(lines)), output), 4)
+        result = output.getvalue().splitlines(keepends=True)
+        self.assertEqual(json.loads(result[0]), {"password": MASK, "nested": {"token": MASK}})
+        self.assertEqual(result[1], lines[1])
+        self.assertEqual(result[2], f"plain log line auth={MASK}\n".encode())
+        self.assertEqual(result[3], lines[3])
+
+    def test_file_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, single, multi = Path(tmp, "in.ndjson"), Path(tmp, "one"), Path(tmp, "many")
+            with open(src, "wb") as fil:
+                for idx in range(2000):
+                    fil.write(json.dumps({"idx": idx, "password": str(idx)}).encode() + b"\n")
+            ranges = _line_ranges(src, 7)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], src.stat().st_size)
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+            self.assertEqual(sanitize_file(src, single), 2000)
+            self.assertEqual(sanitize_file(src, multi, processes=2, chunk_bytes=4096), 2000)
+            self.assertEqual(single.read_bytes(), multi.read_bytes())
+            self.assertEqual(len(list(Path(tmp).iterdir())), 3)
+            first = json.loads(single.read_bytes().splitlines()[0])
+            self.assertEqual(first, {"idx": 0, "password": MASK})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,23 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring
 """Test Utilities."""
 
+import asyncio
+import datetime
+import email.utils
+import gzip
+import json
+import tempfile
+import threading
+import time
 from typing import Any
 import unittest
+from unittest import mock
 
-from pytoolkit.py_splunk import splunk
+import numpy as np
+import pandas as pd
+import requests
+
+from pytoolkit.py_splunk import ack, async_splunk, balancer, batcher, dataframe, payload, splunk, spool
 
 sample_data: dict[str, Any] = {
     "action": "test_cpu",
@@ -27,6 +40,23 @@ sample_data: dict[str, Any] = {
 }
 
 
+HEADER = splunk.SplunkHecHeader(splunk_server="splunk.example.com", token="token")
+
+
+def mock_response(status_code: int = 200, body: Any = None, headers: Any = None) -> mock.MagicMock:
+    response = mock.MagicMock()
+    response.status_code = status_code
+    response.headers = headers if headers else {}
+    response.json.return_value = body if body is not None else {"text": "Success", "code": 0}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
+    return response
+
+
+def sent_batches(client: mock.MagicMock) -> list[list[dict[str, Any]]]:
+    return [[json.loads(event) for event in call.args[0]] for call in client.send_chunk.call_args_list]
+
+
 class TestSplunk(unittest.TestCase):
     def test_hec(self) -> None:
         self.assertIsInstance(sample_data, dict)
@@ -45,3 +75,449 @@ class TestSplunk(unittest.TestCase):
         string: str = splunk.splunk_format(**sample_data)
         print("Converting Splunk Data Dictionary to a string format.")
         self.assertIsInstance(string, str)
+
+
+class TestSplunkHecClient(unittest.TestCase):
+    def test_send_reuses_session(self) -> None:
+        events = [{"event": {"value": x}} for x in range(250)]
+        with splunk.SplunkHecClient(HEADER, pool_maxsize=4) as client:
+            with mock.patch.object(client.session, "post", return_value=mock_response()) as post:
+                resp_list = client.send(events)
+            self.assertEqual(post.call_count, 3)
+            self.assertEqual([resp["payload_len"] for resp in resp_list], [100, 100, 50])
+            self.assertEqual(client.url, "https://splunk.example.com:8088/services/collector/event")
+            self.assertEqual(client.session.headers["Authorization"], "Splunk token")
+            adapter = client.session.get_adapter(client.url)
+            self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+
+    def test_send_error_response(self) -> None:
+        client = splunk.SplunkHecClient(HEADER, chunk_size=0)
+        response = mock_response(status_code=400, body={"text": "Invalid data format", "code": 6})
+        with mock.patch.object(client.session, "post", return_value=response):
+            resp_list = client.send([{"event": "one"}, {"event": "two"}])
+        client.close()
+        self.assertEqual(len(resp_list), 1)
+        self.assertEqual(resp_list[0]["status_code"], 400)
+        self.assertEqual(resp_list[0]["message"]["code"], 6)
+
+    def test_upload_wrapper(self) -> None:
+        with mock.patch("requests.Session.post", return_value=mock_response()) as post:
+            resp_list = splunk.splunk_hec_upload(
+                server="splunk.example.com", token="token", hec_data=[{"event": "one"}]
+            )
+        post.assert_called_once()
+        self.assertEqual(resp_list[0]["status_code"], 200)
+
+
+class TestAsyncSplunkHecClient(unittest.TestCase):
+    def test_send_bounded_and_ordered(self) -> None:
+        events = [{"event": {"value": x}} for x in range(10)]
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def post(url, data, timeout):  # pylint: disable=unused-argument
+            value = json.loads(data)["event"]["value"]
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            # later chunks finish first to prove ordering is preserved
+            time.sleep(0.01 * (10 - value))
+            with lock:
+                state["in_flight"] -= 1
+            return mock_response(body={"text": "Success", "value": value})
+
+        async def run() -> list[dict[str, Any]]:
+            async with async_splunk.AsyncSplunkHecClient(
+                HEADER, max_in_flight=3, chunk_size=1
+            ) as client:
+                with mock.patch.object(client.client.session, "post", side_effect=post):
+                    return await client.send(events)
+
+        resp_list = asyncio.run(run())
+        self.assertEqual([resp["message"]["value"] for resp in resp_list], list(range(10)))
+        self.assertLessEqual(state["peak"], 3)
+        self.assertGreater(state["peak"], 1)
+
+    def test_upload_function(self) -> None:
+        with mock.patch("requests.Session.post", return_value=mock_response()) as post:
+            resp_list = asyncio.run(
+                async_splunk.async_splunk_hec_upload(
+                    server="splunk.example.com",
+                    token="token",
+                    hec_data=[{"event": x} for x in range(5)],
+                    chunk_size=2,
+                )
+            )
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual([resp["payload_len"] for resp in resp_list], [2, 2, 1])
+        self.assertRaises(ValueError, async_splunk.AsyncSplunkHecClient, HEADER, max_in_flight=0)
+
+
+class TestHecBatcher(unittest.TestCase):
+    def test_flush_on_count_and_close(self) -> None:
+        client = mock.MagicMock()
+        with batcher.HecBatcher(client, max_events=10, flush_interval=60000) as hec_batcher:
+            for value in range(25):
+                hec_batcher.add(host="sample.com", source="source", sourcetype="type", value=value)
+            self.assertTrue(hec_batcher.flush(timeout=5))
+            sizes = [len(batch) for batch in sent_batches(client)]
+            self.assertEqual(sizes, [10, 10, 5])
+        self.assertEqual(sent_batches(client)[0][0]["event"]["value"], 0)
+        self.assertRaises(RuntimeError, hec_batcher.put, {"event": "closed"})
+
+    def test_flush_on_interval(self) -> None:
+        client = mock.MagicMock()
+        hec_batcher = batcher.HecBatcher(client, max_events=1000, flush_interval=20)
+        hec_batcher.put({"event": "one"})
+        deadline = time.monotonic() + 5
+        while not client.send_chunk.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sent_batches(client)[0], [{"event": "one"}])
+        hec_batcher.close()
+
+    def test_flush_on_bytes(self) -> None:
+        client = mock.MagicMock()
+        with batcher.HecBatcher(client, max_events=1000, max_bytes=100, flush_interval=60000) as hec_batcher:
+            for _ in range(4):
+                hec_batcher.put({"event": "x" * 30})
+            hec_batcher.flush(timeout=5)
+        self.assertEqual([len(batch) for batch in sent_batches(client)], [2, 2])
+
+    def test_backpressure_policies(self) -> None:
+        gate = threading.Event()
+        client = mock.MagicMock()
+        client.send_chunk.side_effect = lambda *args, **kwargs: gate.wait(5)
+        hec_batcher = batcher.HecBatcher(client, max_events=1, max_queue=2, policy="drop_newest")
+        hec_batcher.put({"event": 0})
+        time.sleep(0.1)  # worker is now blocked uploading event 0
+        results = [hec_batcher.put({"event": value}) for value in range(1, 5)]
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(hec_batcher.dropped, 2)
+        gate.set()
+        hec_batcher.close()
+        self.assertEqual([batch[0]["event"] for batch in sent_batches(client)], [0, 1, 2])
+
+        gate.clear()
+        client.reset_mock()
+        hec_batcher = batcher.HecBatcher(client, max_events=1, max_queue=2, policy="drop_oldest")
+        hec_batcher.put({"event": 0})
+        time.sleep(0.1)
+        for value in range(1, 5):
+            hec_batcher.put({"event": value})
+        self.assertEqual(hec_batcher.dropped, 2)
+        gate.set()
+        hec_batcher.close()
+        self.assertEqual([batch[0]["event"] for batch in sent_batches(client)], [0, 3, 4])
+
+        gate.clear()
+        client.reset_mock()
+        hec_batcher = batcher.HecBatcher(client, max_events=1, max_queue=1, put_timeout=0.01)
+        hec_batcher.put({"event": 0})
+        time.sleep(0.1)
+        self.assertTrue(hec_batcher.put({"event": 1}))
+        self.assertFalse(hec_batcher.put({"event": 2}))
+        gate.set()
+        hec_batcher.close()
+        self.assertRaises(ValueError, batcher.HecBatcher, client, policy="invalid")
+
+
+class TestHecPayload(unittest.TestCase):
+    def test_chunk_by_size(self) -> None:
+        encoded = payload.encode_events([{"event": "x" * size} for size in (10, 10, 200, 10, 10, 10)])
+        self.assertEqual(encoded[0], b'{"event":"xxxxxxxxxx"}')
+        chunks = payload.chunk_by_size(encoded, 70)
+        # oversized event goes alone, others pack up to 70 bytes including newlines
+        self.assertEqual([len(item) for item in chunks], [2, 1, 3])
+        for item in chunks:
+            self.assertTrue(len(payload.join_payload(item)) <= 70 or len(item) == 1)
+        self.assertRaises(ValueError, payload.chunk_by_size, encoded, 0)
+
+    def test_send_by_size(self) -> None:
+        events = [{"event": {"value": "x" * 100}} for _ in range(10)]
+        with splunk.SplunkHecClient(HEADER, max_payload_bytes=300) as client:
+            with mock.patch.object(client.session, "post", return_value=mock_response()) as post:
+                resp_list = client.send(events)
+        self.assertEqual([resp["payload_len"] for resp in resp_list], [2, 2, 2, 2, 2])
+        body = post.call_args.kwargs["data"]
+        self.assertNotIn("json", post.call_args.kwargs)
+        self.assertLessEqual(len(body), 300)
+        self.assertEqual([json.loads(line) for line in body.split(b"\n")], events[:2])
+
+    def test_gzip_body(self) -> None:
+        events = [{"event": {"value": x}} for x in range(3)]
+        with splunk.SplunkHecClient(HEADER, compress=True, compresslevel=1) as client:
+            self.assertEqual(client.session.headers["Content-Encoding"], "gzip")
+            with mock.patch.object(client.session, "post", return_value=mock_response()) as post:
+                client.send(events)
+        body = gzip.decompress(post.call_args.kwargs["data"])
+        self.assertEqual([json.loads(line) for line in body.splitlines()], events)
+        self.assertEqual(payload.encode_event({"big": 2**70}), b'{"big":1180591620717411303424}')
+
+
+class TestHecRetry(unittest.TestCase):
+    def test_resend_only_failed_chunks(self) -> None:
+        retry = splunk.HecRetryPolicy(tries=3, delay=0.5, backoff=2)
+        events = [{"event": {"value": x}} for x in range(3)]
+        responses = {
+            0: [mock_response()],
+            1: [mock_response(503, headers={"Retry-After": "2"}), requests.ConnectionError("reset"), mock_response()],
+            2: [mock_response(400, body={"text": "Invalid data format", "code": 6})],
+        }
+
+        def post(url, data, timeout):  # pylint: disable=unused-argument
+            result = responses[json.loads(data)["event"]["value"]].pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with splunk.SplunkHecClient(HEADER, chunk_size=1, retry=retry) as client:
+            with mock.patch.object(client.session, "post", side_effect=post) as patched_post, mock.patch(
+                "pytoolkit.py_splunk.splunk.time.sleep"
+            ) as sleep:
+                report = client.send(events)
+        self.assertEqual(patched_post.call_count, 5)
+        # Retry-After beats the 0.5s backoff, then the backoff doubles
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [2.0, 1.0])
+        self.assertEqual([entry["delivered"] for entry in report], [True, True, False])
+        self.assertEqual([entry["attempts"] for entry in report], [1, 3, 1])
+        self.assertEqual([entry["chunk"] for entry in report], [0, 1, 2])
+        self.assertEqual(report[2]["status_code"], 400)
+
+    def test_retry_limits(self) -> None:
+        retry = splunk.HecRetryPolicy(tries=-1, delay=10, backoff=1, max_retry_time=25)
+        clock = mock.MagicMock()
+        clock.monotonic.return_value = 0
+        clock.sleep.side_effect = lambda wait: setattr(clock.monotonic, "return_value", clock.monotonic() + wait)
+        with splunk.SplunkHecClient(HEADER, retry=retry) as client:
+            with mock.patch.object(client.session, "post", return_value=mock_response(500)), mock.patch(
+                "pytoolkit.py_splunk.splunk.time", clock
+            ):
+                [entry] = client.send([{"event": "one"}])
+        # sleeps of 10s twice fit in 25s, a third would not
+        self.assertEqual(clock.sleep.call_count, 2)
+        self.assertEqual(entry["attempts"], 3)
+        self.assertFalse(entry["delivered"])
+
+    def test_retry_after(self) -> None:
+        retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+        self.assertGreater(splunk._retry_after(email.utils.format_datetime(retry_at)), 20)  # pylint: disable=protected-access
+        self.assertEqual(splunk._retry_after("5"), 5)  # pylint: disable=protected-access
+        self.assertEqual(splunk._retry_after("soon"), 0)  # pylint: disable=protected-access
+        self.assertEqual(splunk._retry_after(None), 0)  # pylint: disable=protected-access
+
+
+class TestHecSpool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        patcher = mock.patch.object(spool, "set_location", return_value=self.tmpdir.name)
+        self.set_location = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_spool_failed_and_replay(self) -> None:
+        retry = splunk.HecRetryPolicy(tries=1)
+        events = [{"event": {"value": x}} for x in range(5)]
+        with spool.HecSpool(extend_path="test/spool", segment_bytes=40) as hec_spool:
+            self.set_location.assert_called_with("var", extend_path="test/spool", mode="restrictive")
+            client = splunk.SplunkHecClient(HEADER, chunk_size=2, retry=retry, spool=hec_spool)
+            responses = [mock_response(), mock_response(503), requests.ConnectionError("down")]
+            with mock.patch.object(client.session, "post", side_effect=responses):
+                report = client.send(events)
+            self.assertEqual([entry["spooled"] for entry in report], [False, True, True])
+            self.assertGreater(len(hec_spool.segments()), 1)
+
+            # indexer still down; nothing is lost
+            with mock.patch.object(client.session, "post", return_value=mock_response(503)):
+                self.assertEqual(hec_spool.replay(client, batch_events=2), 0)
+            with mock.patch.object(client.session, "post", return_value=mock_response()) as post:
+                self.assertEqual(hec_spool.replay(client, batch_events=2), 3)
+            sent = [
+                json.loads(line)["event"]["value"]
+                for call in post.call_args_list
+                for line in call.kwargs["data"].split(b"\n")
+            ]
+            self.assertEqual(sent, [2, 3, 4])
+            self.assertEqual(hec_spool.segments(), [])
+            self.assertEqual(hec_spool.size, 0)
+
+    def test_recover_and_max_bytes(self) -> None:
+        encoded = payload.encode_events([{"event": "x" * 17}] * 4)
+        hec_spool = spool.HecSpool(segment_bytes=30, max_bytes=90, fsync_every=1)
+        for event in encoded:
+            hec_spool.append([event])
+        # four 30 byte segments do not fit in 90 bytes
+        self.assertEqual(hec_spool.dropped, 1)
+        self.assertEqual(hec_spool.size, 90)
+        hec_spool.close()
+        with open(hec_spool.segments()[-1], "ab") as segment:
+            segment.write(b'{"torn')
+
+        recovered = spool.HecSpool(segment_bytes=30, max_bytes=1000)
+        self.assertEqual(len(recovered.segments()), 3)
+        client = mock.MagicMock()
+        client.deliver.return_value = [{"delivered": True}]
+        self.assertEqual(recovered.replay(client), 3)
+        self.assertEqual(recovered.segments(), [])
+        self.assertRaises(ValueError, spool.HecSpool, segment_bytes=100, max_bytes=10)
+
+    def test_replayer(self) -> None:
+        hec_spool = spool.HecSpool()
+        client = mock.MagicMock()
+        with mock.patch.object(hec_spool, "replay") as replay:
+            replayer = spool.HecSpoolReplayer(hec_spool, client, interval=0.01)
+            time.sleep(0.1)
+            replayer.stop()
+        replay.assert_called_with(client, 100)
+
+
+class TestHecAckTracker(unittest.TestCase):
+    def test_batched_ack_polling(self) -> None:
+        header = splunk.SplunkHecHeader(
+            splunk_server="splunk.example.com", token="token", channel="0aecb1b5-f8b2-4bc6-8b2d-f0e3aa1a2c1e"
+        )
+        events = [{"event": {"value": x}} for x in range(3)]
+        ack_ids = iter(range(10))
+        acked = {0: True, 1: False, 2: False}
+        clock = mock.MagicMock(return_value=0)
+
+        def post(  # pylint: disable=unused-argument,redefined-outer-name,too-many-arguments
+            url, data=None, json=None, timeout=None, params=None, headers=None
+        ):
+            if url.endswith("/ack"):
+                self.assertEqual(params, {"channel": header.channel})
+                return mock_response(body={"acks": {str(ack_id): acked.get(ack_id, False) for ack_id in json["acks"]}})
+            return mock_response(body={"text": "Success", "code": 0, "ackId": next(ack_ids)})
+
+        tracker = ack.HecAckTracker(ack_timeout=60)
+        with splunk.SplunkHecClient(header, chunk_size=1) as client:
+            self.assertEqual(client.session.headers["X-Splunk-Request-Channel"], header.channel)
+            with mock.patch.object(client.session, "post", side_effect=post) as patched_post, mock.patch(
+                "pytoolkit.py_splunk.ack.time.monotonic", clock
+            ):
+                tracker.send(client, events)
+                self.assertEqual(tracker.pending, 3)
+                self.assertEqual(tracker.poll(), {"acked": 1, "resent": 0, "pending": 2})
+                acked[1] = True
+                clock.return_value = 61
+                # ackId 1 arrives; ackId 2 timed out and is resent as ackId 3
+                self.assertEqual(tracker.poll(), {"acked": 1, "resent": 1, "pending": 1})
+                ack_posts = [call for call in patched_post.call_args_list if call.args[0].endswith("/ack")]
+        self.assertEqual(len(ack_posts), 2)
+        self.assertEqual(ack_posts[0].kwargs["json"], {"acks": [0, 1, 2]})
+        self.assertEqual(json.loads(patched_post.call_args_list[-1].kwargs["data"]), events[2])
+
+    def test_ack_query_failure(self) -> None:
+        tracker = ack.HecAckTracker()
+        client = mock.MagicMock()
+        client.channel = "channel"
+        client.deliver.return_value = [
+            {"chunk": 0, "delivered": True, "message": {"ackId": 7}},
+            {"chunk": 1, "delivered": False, "message": ""},
+        ]
+        client.query_acks.side_effect = requests.ConnectionError("down")
+        tracker.deliver(client, [[b"{}"], [b"{}"]])
+        self.assertEqual(tracker.poll(), {"acked": 0, "resent": 0, "pending": 1})
+
+    def test_ack_ids_per_endpoint(self) -> None:
+        tracker = ack.HecAckTracker()
+        clients = []
+        for server in ("idx01", "idx02"):
+            client = mock.MagicMock()
+            client.url = f"https://{server}:8088/services/collector/event"
+            client.channel = "token"
+            client.deliver.return_value = [{"chunk": 0, "delivered": True, "message": {"ackId": 0}}]
+            client.query_acks.return_value = {0: True}
+            tracker.deliver(client, [[server.encode()]])
+            clients.append(client)
+        self.assertEqual(tracker.pending, 2)
+        self.assertEqual(tracker.poll(), {"acked": 2, "resent": 0, "pending": 0})
+        for client in clients:
+            client.query_acks.assert_called_once_with([0])
+
+
+class TestHecLoadBalancer(unittest.TestCase):
+    def test_round_robin_and_failover(self) -> None:
+        events = [{"event": {"value": x}} for x in range(6)]
+        with balancer.HecLoadBalancer(
+            HEADER, ["hf01", ("hf02", 8089), "hf03"], max_failures=1, eject_time=60, max_in_flight=1
+        ) as hec_lb:
+            sessions = [endpoint.client.session for endpoint in hec_lb.endpoints]
+            self.assertEqual(hec_lb.endpoints[1].client.url, "https://hf02:8089/services/collector/event")
+            with mock.patch.object(sessions[0], "post", return_value=mock_response()), mock.patch.object(
+                sessions[1], "post", side_effect=requests.ConnectionError("down")
+            ), mock.patch.object(sessions[2], "post", return_value=mock_response()):
+                report = hec_lb.send(events, chunk_size=1)
+            self.assertTrue(all(entry["delivered"] for entry in report))
+            self.assertEqual([entry["chunk"] for entry in report], list(range(6)))
+            # hf02 failed once, was ejected and its chunk failed over to another endpoint
+            self.assertTrue(report[1]["delivered"])
+            self.assertNotIn("hf02:8089", {entry["endpoint"] for entry in report})
+            self.assertEqual(len(hec_lb.healthy()), 2)
+
+            # probe re-admits hf02 once the ejection expires
+            hec_lb.endpoints[1].ejected_until = time.monotonic() - 1
+            with mock.patch.object(sessions[1], "get", return_value=mock_response()) as probe, mock.patch.object(
+                sessions[1], "post", return_value=mock_response()
+            ), mock.patch.object(sessions[0], "post", return_value=mock_response()), mock.patch.object(
+                sessions[2], "post", return_value=mock_response()
+            ):
+                report = hec_lb.send(events, chunk_size=1)
+            probe.assert_called_once()
+            self.assertIn("hf02:8089", {entry["endpoint"] for entry in report})
+            self.assertEqual(len(hec_lb.healthy()), 3)
+
+    def test_least_outstanding_and_spool(self) -> None:
+        hec_spool = mock.MagicMock()
+        hec_lb = balancer.HecLoadBalancer(HEADER, ["hf01", "hf02"], strategy="least_outstanding", spool=hec_spool)
+        hec_lb.endpoints[0].outstanding = 5
+        self.assertIs(hec_lb._select(set()), hec_lb.endpoints[1])  # pylint: disable=protected-access
+        hec_lb.endpoints[0].outstanding = 0
+        hec_lb.endpoints[1].outstanding = 0
+        with mock.patch("requests.Session.post", return_value=mock_response(503)):
+            [entry] = hec_lb.send([{"event": "one"}])
+        self.assertTrue(entry["spooled"])
+        hec_spool.append.assert_called_once()
+        hec_lb.close()
+        self.assertRaises(ValueError, balancer.HecLoadBalancer, HEADER, [])
+        self.assertRaises(ValueError, balancer.HecLoadBalancer, HEADER, ["hf01"], strategy="random")
+
+
+class TestDataFrameToHec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(["2024-01-01 00:00:01.5", "2024-01-02 00:00:00.0", "2024-01-03 00:00:00.0"]),
+                "cpu_usage": [4.25, np.nan, 1.0],
+                "cpu_count": [4, 4, 8],
+                "hostname": ["server.jfk100.example.com", "server/2", "server3"],
+                "env": ["prod", "prod", "dev"],
+            }
+        )
+
+    def test_matches_hec_format(self) -> None:
+        encoded = [
+            event
+            for batch in dataframe.iter_dataframe_hec(
+                self.df, "timestamp", "sample.com", "source", "source_type", metrics=["cpu_usage", "cpu_count"], batch_rows=2
+            )
+            for event in batch
+        ]
+        for row, event in zip(self.df.to_dict("records"), encoded):
+            row["time"] = row.pop("timestamp").timestamp()
+            row["cpu_usage"] = None if pd.isna(row["cpu_usage"]) else row["cpu_usage"]
+            expected = splunk.splunk_hec_format(
+                "sample.com", "source", "source_type", metrics_list=["cpu_usage", "cpu_count"], **row
+            )
+            self.assertEqual(json.loads(event), expected)
+            self.assertEqual(list(json.loads(event)["fields"]), list(expected["fields"]))
+        self.assertRaises(ValueError, next, dataframe.iter_dataframe_hec(self.df, None, "h", "s", "st", metrics=["nope"]))
+
+    def test_stream_to_client(self) -> None:
+        with splunk.SplunkHecClient(HEADER) as client:
+            with mock.patch.object(client.session, "post", return_value=mock_response()) as post:
+                report = dataframe.dataframe_to_hec(
+                    self.df[["env"]], None, "sample.com", "source", "source_type", client, batch_rows=2, chunk_size=1
+                )
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual([entry["chunk"] for entry in report], [0, 1, 2])
+        self.assertEqual(json.loads(post.call_args.kwargs["data"])["event"], {"env": "dev"})
@@ -0,0 +1,121 @@
+# pylint: disable=missing-function-docstring,missing-class-docstring
+"""Test Utilities Table."""
+
+from dataclasses import dataclass, field
+from typing import Optional
+import unittest
+
+import numpy as np
+
+from pytoolkit.static import NONETYPE
+from pytoolkit.utilities import BaseMonitor, SlottedMonitor, slotted_dataclass
+from pytoolkit.utilities import table as monitor_table
+from pytoolkit.utilities.table import MonitorTable
+
+
+@dataclass
+class Sample(BaseMonitor):
+    host: str
+    latency: float
+    count: int = 0
+    up: bool = True
+    site: Optional[str] = NONETYPE
+    tags: list[str] = field(default_factory=list)
+
+
+@slotted_dataclass
+class SlottedSample(SlottedMonitor):
+    host: str
+    latency: float
+    label: str = field(default="", init=False)
+
+    def __post_init__(self) -> None:
+        self.label = f"{self.host}:{self.latency}"
+
+
+class TestMonitorTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = MonitorTable(Sample, capacity=1)
+        self.table.extend(
+            [
+                {"host": "a", "latency": 1.5, "extra": 1, "tags": ["p", "q"]},
+                Sample("b", 200.0, 3, False, "dfw"),
+            ]
+        )
+        self.table.append({"host": "c", "latency": 300, "site": "ord"})
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.dtypes["latency"], np.float64)
+        self.assertEqual(self.table.dtypes["count"], np.int64)
+        self.assertEqual(self.table.dtypes["up"], np.bool_)
+        self.assertEqual(self.table.dtypes["site"], object)
+        np.testing.assert_array_equal(self.table.column("count"), [0, 3, 0])
+        with self.assertRaises(ValueError):
+            self.table.column("count")[0] = 1
+        self.assertEqual(self.table.column("tags")[0], ["p", "q"])
+
+    def test_records(self):
+        self.assertEqual(self.table[1], Sample("b", 200.0, 3, False, "dfw"))
+        self.assertIsInstance(self.table[-1].count, int)
+        self.assertEqual([record.host for record in self.table], ["a", "b", "c"])
+        self.assertIs(self.table[0].site, NONETYPE)
+        with self.assertRaises(IndexError):
+            self.table[3]  # pylint: disable=pointless-statement
+        with self.assertRaises(TypeError):
+            self.table.append({"latency": 1.0})
+
+    def test_mismatched_types(self):
+        records = [
+            {"host": "d", "latency": None, "count": 1.7, "up": None},
+            {"host": "e", "latency": 2.0, "count": None, "up": "false"},
+            {"host": "f", "latency": 3.0, "count": True, "up": 1},
+        ]
+        self.table.extend(records)
+        for name in ("latency", "count", "up"):
+            self.assertEqual(self.table.dtypes[name], object)
+        expected = [Sample.create_from_dict(record) for record in records]
+        self.assertEqual(list(self.table)[3:], expected)
+        self.assertIs(self.table[5].count, True)
+        self.assertEqual(self.table[1], Sample("b", 200.0, 3, False, "dfw"))
+        self.assertIsInstance(self.table[1].count, int)
+        self.assertEqual(self.table.filter(self.table.column("host") == "e").dtypes["up"], object)
+        big = MonitorTable(Sample, [{"host": "a", "latency": 1.0, "count": 2**70}])
+        self.assertEqual(big[0].count, 2**70)
+
+    def test_filter(self):
+        slow = self.table.filter(self.table.column("latency") > 100)
+        self.assertEqual([record.host for record in slow], ["b", "c"])
+        self.assertEqual(len(slow.filter(lambda table: table.column("up"))), 1)
+        slow.append({"host": "d", "latency": 500.0})
+        self.assertEqual(len(slow), 3)
+        self.assertEqual(len(self.table), 3)
+        with self.assertRaises(ValueError):
+            self.table.filter(np.array([True]))
+
+    def test_pandas(self):
+        frame = self.table.to_pandas()
+        self.assertEqual(list(frame.columns), list(self.table.columns))
+        self.assertTrue(np.shares_memory(frame["latency"].to_numpy(), self.table.column("latency")))
+        self.assertIsNone(frame["site"][0])
+        self.assertEqual(frame["latency"].mean(), (1.5 + 200 + 300) / 3)
+
+    def test_post_init(self):
+        table = MonitorTable(SlottedSample, [{"host": "a", "latency": 1.0}])
+        self.assertEqual(table.column("label")[0], "a:1.0")
+        self.assertEqual(table[0].label, "a:1.0")
+
+    @unittest.skipIf(monitor_table.pa is None, "pyarrow not installed")
+    def test_arrow(self):
+        arrow = self.table.to_arrow()
+        self.assertEqual(arrow.num_rows, 3)
+        self.assertEqual(arrow.column("site").to_pylist(), [None, "dfw", "ord"])
+
+    @unittest.skipIf(monitor_table.pa is not None, "pyarrow installed")
+    def test_arrow_missing(self):
+        with self.assertRaises(ImportError):
+            self.table.to_arrow()
+
+
+if __name__ == "__main__":
+    unittest.main()
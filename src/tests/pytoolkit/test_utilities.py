@@ -1,23 +1,34 @@
 # pylint: disable=missing-function-docstring,missing-class-docstring
 """Test Utilities to Import."""
+import dataclasses
+import pickle
 import re
 import unittest
 from unittest import mock
 from unittest.mock import mock_open
-from typing import Any, Optional, Union, Hashable
+from typing import TYPE_CHECKING, Any, List, Optional, Union, Hashable
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from pytoolkit.utilities import (
     nested_dict,
     flatten_dict,
     flatten_dictionary,
+    flatten_json,
+    flatten_records,
+    iter_flatten,
     BaseMonitor,
+    SlottedMonitor,
+    slotted_dataclass,
     set_bool,
     extract_matches,
+    compile_patterns,
+    nested_dataclass,
 )
 from pytoolkit.static import NONETYPE
 
+import pandas as pd
+
 test_nest_dict: dict[str, Union[str, dict[str, str]]] = {
     "key1": "value",
     "key2": "value2",
@@ -44,6 +55,85 @@ class TestDataClass(BaseMonitor):
     novalue: Optional[str] = NONETYPE
 
 
+@dataclass
+class DefaultsDataClass(TestDataClass):
+    tags: list[str] = field(default_factory=list)
+    count: int = field(default=0, init=False)
+
+
+@slotted_dataclass
+class SlottedDataClass(SlottedMonitor):
+    sample: str
+    integer: int
+    novalue: Optional[str] = NONETYPE
+    tags: list[str] = field(default_factory=list)
+
+
+@slotted_dataclass(order=True)
+class SlottedChildDataClass(SlottedDataClass):
+    extra: int = 0
+
+
+@slotted_dataclass
+class SlottedSuperDataClass(SlottedDataClass):
+    label: str = ""
+
+    def to_dict(self, extend: bool = True) -> dict[str, Any]:
+        return {**super().to_dict(extend), "kind": "super"}
+
+    @property
+    def title(self) -> str:
+        return super().__repr__()
+
+    @classmethod
+    def build(cls, **kwargs: Any) -> "SlottedSuperDataClass":
+        return super().create_from_kwargs(**kwargs)
+
+
+@dataclass
+class PortDataClass:
+    name: str
+
+
+@dataclass
+class DeviceDataClass:
+    host: str
+    ports: list[PortDataClass]
+
+
+@dataclass
+class NodeDataClass:
+    value: int
+    children: List["NodeDataClass"]
+
+
+@nested_dataclass
+class SiteDataClass:
+    name: str
+    devices: list[DeviceDataClass]
+    primary: Optional[DeviceDataClass] = None
+    by_name: Optional[dict[str, DeviceDataClass]] = None
+    pair: tuple[PortDataClass, ...] = ()
+    tree: Optional[NodeDataClass] = None
+    child: Optional["ChildDataClass"] = None
+
+
+@nested_dataclass
+class ChildDataClass:
+    name: str
+    site: Optional[SiteDataClass] = None
+
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+
+@nested_dataclass
+class PriceDataClass:
+    amount: "Decimal"
+    port: Optional[PortDataClass] = None
+
+
 test_search_list = ["one two three", "four five six", "one three two"]
 
 
@@ -65,6 +155,32 @@ class TestDictionaries(unittest.TestCase):
             self.assertIsInstance(v, str)
             self.assertIsNot(v, dict)
 
+    def test_flat_deep(self) -> None:
+        deep: dict[str, Any] = {"value": 1}
+        for _ in range(5000):
+            deep = {"k": deep, "leaf": 0}
+        converted = flatten_dict(deep)
+        self.assertEqual(len(converted), 5001)
+        self.assertEqual(converted[".".join(["k"] * 5000 + ["value"])], 1)
+        nested = nested_dict(converted)
+        for _ in range(5000):
+            self.assertEqual(nested["leaf"], 0)
+            nested = nested["k"]
+        self.assertEqual(nested, {"value": 1})
+
+    def test_iter_flatten(self) -> None:
+        pairs = iter_flatten({"a": {"b": 1, "c": {"d": 2}}, "e": 3})
+        self.assertEqual(next(pairs), ("a.b", 1))
+        self.assertEqual(list(pairs), [("a.c.d", 2), ("e", 3)])
+        self.assertEqual(
+            list(iter_flatten({"a": {"b": 1}}, extended_label=False)), [("b", 1)]
+        )
+        self.assertEqual(
+            list(iter_flatten({"a": {"b": {"c": 1}}}, skip_item=["b"])), [("b.c", 1)]
+        )
+        self.assertEqual(flatten_dict(test_nest_dict), test_flat_dict)
+        self.assertEqual(nested_dict(test_flat_dict), test_nest_dict)
+
     def test_flat_pd(self) -> None:
         print("Running testing pandas json normalization.")
         converted: dict[Hashable, Any] = flatten_dictionary(test_nest_dict)
@@ -72,6 +188,25 @@ class TestDictionaries(unittest.TestCase):
             self.assertIsInstance(v, str, f"Value is {v}")
             self.assertIsNot(v, dict)
 
+    def test_flat_json(self) -> None:
+        shapes: list[dict[Any, Any]] = [
+            test_nest_dict,
+            {"x": {"y": {"z": 1}}, "a": 2, "l": [{"k": {"v": 1}}]},
+            {"a.b": 1, "a": {"b": 2}, "empty": {}},
+            {1: {2: 3}, 5: None},
+        ]
+        for shape in shapes:
+            expected = flatten_dictionary(shape)
+            converted = flatten_json(shape)
+            self.assertEqual(converted, expected)
+            self.assertEqual(list(converted), list(expected))
+        self.assertEqual(flatten_json({"a": {"b": 1}}, sep="_"), {"a_b": 1})
+        self.assertEqual(flatten_json({"empty": {}}), {})
+        self.assertEqual(
+            flatten_records([test_nest_dict, {"a": {"b": 1}}]),
+            [test_flat_dict, {"a.b": 1}],
+        )
+
     def test_dataclass(self) -> None:
         print("Running tests against BaseMonitor Dataclass")
         base_dc = TestDataClass.create_from_dict(test_dataclass)
@@ -80,6 +215,108 @@ class TestDictionaries(unittest.TestCase):
         self.assertIs(base_dc_opt.integer, 100)
         self.assertNotIn("novalue", base_dc.to_dict().keys())
 
+    def test_dataclass_constructor(self) -> None:
+        records = [
+            {**test_dataclass_opt, "extra": 1},
+            {**test_dataclass, "tags": ["a"], "count": 5},
+        ]
+        created = DefaultsDataClass.create_many(records)
+        self.assertEqual(
+            created,
+            [
+                DefaultsDataClass("sample_text", 100, "emptyvalue"),
+                DefaultsDataClass("sample_text", 100, tags=["a"]),
+            ],
+        )
+        self.assertIsNot(
+            DefaultsDataClass.create_from_dict(test_dataclass).tags,
+            DefaultsDataClass.create_from_dict(test_dataclass).tags,
+        )
+        self.assertEqual(
+            DefaultsDataClass.create_from_kwargs(sample="s", integer=1, tags=["b"]).tags,
+            ["b"],
+        )
+        # the subclass gets its own constructor and field set
+        self.assertIsInstance(TestDataClass.create_from_dict(records[1]), TestDataClass)
+        self.assertNotIn("tags", TestDataClass.monitor_fields())
+        self.assertNotIn("count", DefaultsDataClass.monitor_fields())
+        self.assertIsNot(
+            TestDataClass.monitor_constructor(), DefaultsDataClass.monitor_constructor()
+        )
+        with self.assertRaises(TypeError):
+            TestDataClass.create_from_dict({"sample": "missing integer"})
+
+    def test_slotted_dataclass(self) -> None:
+        slotted = SlottedDataClass.create_from_dict(test_dataclass)
+        self.assertFalse(hasattr(slotted, "__dict__"))
+        self.assertIsInstance(slotted, BaseMonitor)
+        self.assertEqual(slotted.to_dict(), {"sample": "sample_text", "integer": 100, "tags": []})
+        self.assertIs(slotted.to_dict(extend=False)["novalue"], NONETYPE)
+        with self.assertRaises(AttributeError):
+            slotted.unknown = 1  # type: ignore  # pylint: disable=attribute-defined-outside-init
+        child = SlottedChildDataClass.create_from_dict({**test_dataclass_opt, "extra": 2})
+        self.assertEqual(SlottedChildDataClass.__slots__, ("extra",))
+        self.assertFalse(hasattr(child, "__dict__"))
+        self.assertEqual(child.to_dict()["extra"], 2)
+        self.assertEqual(pickle.loads(pickle.dumps(child)), child)
+        self.assertEqual(dataclasses.replace(child, extra=3).extra, 3)
+        self.assertLess(child, dataclasses.replace(child, extra=3))
+        # zero argument super() refers to the rebuilt class
+        rebuilt = SlottedSuperDataClass.build(sample="s", integer=1, label="x")
+        self.assertIsInstance(rebuilt, SlottedSuperDataClass)
+        self.assertEqual(rebuilt.to_dict()["kind"], "super")
+        self.assertEqual(rebuilt.to_dict()["label"], "x")
+        self.assertEqual(rebuilt.title, SlottedDataClass.__repr__(rebuilt))
+        # regular subclasses keep their instance dictionary
+        self.assertTrue(hasattr(TestDataClass.create_from_dict(test_dataclass), "__dict__"))
+
+    def test_nested_dataclass(self) -> None:
+        device = {"host": "a", "ports": [{"name": "e0"}]}
+        [site] = SiteDataClass.from_dicts(
+            [
+                {
+                    "name": "dfw",
+                    "devices": [device],
+                    "primary": device,
+                    "by_name": {"a": device},
+                    "pair": ({"name": "e1"},),
+                    "tree": {"value": 1, "children": [{"value": 2, "children": []}]},
+                    "child": {"name": "c", "site": {"name": "ord", "devices": []}},
+                }
+            ]
+        )
+        expected = DeviceDataClass("a", [PortDataClass("e0")])
+        self.assertEqual(site.devices, [expected])
+        self.assertEqual(site.primary, expected)
+        self.assertEqual(site.by_name, {"a": expected})
+        self.assertEqual(site.pair, (PortDataClass("e1"),))
+        self.assertEqual(site.tree.children[0], NodeDataClass(2, []))  # type: ignore
+        self.assertEqual(site.child.site.name, "ord")  # type: ignore
+        # positional values and existing instances are handled too
+        positional = SiteDataClass("iad", [device, expected])
+        self.assertEqual(positional.devices, [expected, expected])
+        self.assertIsNone(positional.primary)
+
+    def test_nested_dataclass_unresolved(self) -> None:
+        price = PriceDataClass(amount=1, port={"name": "e0"})
+        self.assertEqual(price, PriceDataClass(1, PortDataClass("e0")))
+
+        @dataclass
+        class Local:
+            y: int
+
+        @nested_dataclass
+        class Site:
+            dev: "PortDataClass"
+            loc: "Local"
+
+        site = Site(dev={"name": "e0"}, loc={"y": 2})
+        self.assertEqual(site.dev, PortDataClass("e0"))
+        self.assertEqual(site.loc, {"y": 2})
+        with mock.patch("pytoolkit.utilities._field_hints") as field_hints:
+            Site(dev={"name": "e1"}, loc={"y": 3})
+        field_hints.assert_not_called()
+
     @mock.patch("builtins.open", mock_open(read_data="data"))
     @mock.patch("pathlib.Path.exists")
     def test_set_bool(self, patched_isfile) -> None:
@@ -102,3 +339,35 @@ class TestDictionaries(unittest.TestCase):
         )
         self.assertTrue(len(results.matches), 2)
         self.assertTrue(len(results.no_match), 1)
+
+    def test_extract_single_pass(self):
+        calls: list[str] = []
+
+        def condition(item: str) -> list[bool]:
+            calls.append(item)
+            return [item.startswith("one")]
+
+        results = extract_matches(test_search_list, condition)
+        self.assertEqual(results.matches, ["one two three", "one three two"])
+        self.assertEqual(calls, test_search_list)
+        with self.assertRaises(ValueError):
+            extract_matches(test_search_list)
+
+    def test_extract_patterns(self):
+        results = extract_matches([*test_search_list, None], patterns=[r"^four", r"two$"])
+        self.assertEqual(results.matches, ["four five six", "one three two"])
+        self.assertEqual(results.no_match, ["one two three", None])
+        literal = extract_matches(["a.b", "axb"], patterns=["a.b"], literal=True)
+        self.assertEqual(literal.matches, ["a.b"])
+        self.assertEqual(compile_patterns(["ab", "abc"], literal=True).pattern, "(?:abc)|(?:ab)")
+        self.assertEqual(
+            extract_matches(["ONE"], patterns="one", flags=re.IGNORECASE).matches, ["ONE"]
+        )
+
+    def test_extract_series(self):
+        series = pd.Series([*test_search_list, None])
+        results = extract_matches(series, patterns=[r"five", r"two$"])
+        self.assertEqual(results.matches.tolist(), ["four five six", "one three two"])
+        self.assertEqual(results.no_match.index.tolist(), [0, 3])
+        results = extract_matches(series.dropna(), lambda item: [item.endswith("three")])
+        self.assertEqual(results.matches.tolist(), ["one two three"])
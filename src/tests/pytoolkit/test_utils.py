@@ -151,6 +151,11 @@ class TestStringMethods(unittest.TestCase):
         self.assertEqual(new_dict['password'], '[MASKED]')
         self.assertNotEqual(new_dict['password'],SANTIZE_DATA['password'])
 
+    def test_reexports(self):
+        from pytoolkit import utilities  # pylint: disable=import-outside-toplevel
+        self.assertIs(utils.flatten_dictionary, utilities.flatten_dictionary)
+        self.assertIs(utils.nested_dict, utilities.nested_dict)
+
     def test_verify_list(self):
         test_str = 'one,two,three'
         test_lst = ['one',2,'three']